@@ -31,8 +31,23 @@ VIEWPORT = {
 
 # Screenshot & Video Settings
 SCREENSHOT_ON_FAILURE = os.getenv("SCREENSHOT_ON_FAILURE", "true").lower() == "true"
+# Capture policies: off | on-failure | on-retry | always
+# (Playwright names such as retain-on-failure are accepted too)
+SCREENSHOT_ON = os.getenv("SCREENSHOT_ON", "on-failure" if SCREENSHOT_ON_FAILURE else "off")
+HTML_ON = os.getenv("HTML_ON", "on-failure")
 VIDEO_ON = os.getenv("VIDEO_ON", "retain-on-failure")
 TRACE_ON = os.getenv("TRACE_ON", "retain-on-failure")
+# Trace granularity: tracing starts once per context and each test records a
+# chunk, written only when the trace policy keeps it
+TRACE_SCREENSHOTS = os.getenv("TRACE_SCREENSHOTS", "true").lower() == "true"
+TRACE_SNAPSHOTS = os.getenv("TRACE_SNAPSHOTS", "true").lower() == "true"
+TRACE_SOURCES = os.getenv("TRACE_SOURCES", "true").lower() == "true"
+
+# Step timing (utils/timing.py): per-test breakdown of page actions, waits,
+# fixtures and artifact capture in Allure and TIMINGS_PATH
+TIMINGS = os.getenv("TIMINGS", "true").lower() == "true"
+TIMINGS_PATH = os.getenv("TIMINGS_PATH", "test-results/timings.json")
+TIMINGS_TOP = int(os.getenv("TIMINGS_TOP", "15"))
 
 # Playwright launch options for local execution
 LOCAL_BROWSER_OPTIONS = {
@@ -54,6 +69,78 @@ CONTEXT_OPTIONS = {
     ) else None
 }
 
+# Context strategy: 'fresh' creates a context per test, 'pool' reuses
+# pre-warmed contexts per worker and resets them between tests
+CONTEXT_MODE = os.getenv("CONTEXT_MODE", "fresh").lower()
+CONTEXT_POOL_SIZE = int(os.getenv("CONTEXT_POOL_SIZE", "2"))
+
+# Async page objects (pages/aio): pages driven at once per worker by
+# utils/async_runner.py
+ASYNC_CONCURRENCY = int(os.getenv("ASYNC_CONCURRENCY", "4"))
+
+# D365 busy detection: 'poll' checks indicators every tick, 'event' uses an
+# injected observer that reports busy/idle transitions
+D365_BUSY_MODE = os.getenv("D365_BUSY_MODE", "poll").lower()
+
+# Authenticated session cache: refresh the storage state this many seconds
+# before it expires; files without a readable expiry are refreshed after max age
+D365_SESSION_PATH = os.getenv("D365_SESSION_PATH", "storage_state/d365_session.json")
+SESSION_REFRESH_MARGIN = int(os.getenv("SESSION_REFRESH_MARGIN", "300"))
+SESSION_MAX_AGE = int(os.getenv("SESSION_MAX_AGE", "28800"))
+
+# D365 OData data factory (utils/d365_odata.py)
+D365_ODATA_URL = os.getenv("D365_ODATA_URL", D365_BASE_URL or "https://fourhands-test.sandbox.operations.dynamics.com")
+D365_COMPANY = os.getenv("D365_COMPANY", "fh").lower()
+D365_ODATA_TIMEOUT = float(os.getenv("D365_ODATA_TIMEOUT", "60"))
+D365_CUSTOMER_GROUP = os.getenv("D365_CUSTOMER_GROUP", "DOM")
+# Existing customer used by order tests when OData cannot create one
+D365_DEFAULT_CUSTOMER = os.getenv("D365_DEFAULT_CUSTOMER", "100001")
+
+# D365 navigation: open forms by ?mi= deep link using the learned menu item
+# cache (utils/d365_navigation.py); 'false' always clicks through the menu
+D365_DEEP_LINKS = os.getenv("D365_DEEP_LINKS", "true").lower() == "true"
+D365_NAV_CACHE_PATH = os.getenv("D365_NAV_CACHE_PATH", ".d365_nav_cache.json")
+
+# FourHands storefront
+FH_BASE_URL = os.getenv("FH_BASE_URL", "https://fh-test-fourhandscom.azurewebsites.net")
+# Cart cleanup: 'ui' clicks Remove on each line, 'api' clears through the
+# storefront cart endpoints (UI loop as fallback). The endpoint paths below
+# are not confirmed against the storefront yet, so 'api' is opt-in
+FH_CART_CLEANUP = os.getenv("FH_CART_CLEANUP", "ui").lower()
+FH_CART_API_PATH = os.getenv("FH_CART_API_PATH", "/api/cart")
+FH_SAVED_FOR_LATER_API_PATH = os.getenv("FH_SAVED_FOR_LATER_API_PATH", "/api/cart/saved-for-later")
+FH_ADDRESS_API_PATH = os.getenv("FH_ADDRESS_API_PATH", "/api/cart/addresses")
+FH_CART_PAGE_PATH = os.getenv("FH_CART_PAGE_PATH", "/cart")
+# Test data setup: 'ui' goes through PDP and cart pages, 'api' seeds cart/saved
+# items through the storefront endpoints (UI flow as fallback); opt-in like cleanup
+FH_DATA_SETUP = os.getenv("FH_DATA_SETUP", "ui").lower()
+# Request routing profile for FH contexts: 'off' | 'trackers' | 'lean'
+# (see utils/routing.py); suites that never look at imagery opt into 'lean'
+# with @pytest.mark.routing("lean"), @pytest.mark.routing("off") opts out
+FH_ROUTING_PROFILE = os.getenv("FH_ROUTING_PROFILE", "trackers").lower()
+# HAR record/replay: 'off' | 'record' | 'replay' (see utils/har.py)
+FH_HAR_MODE = os.getenv("FH_HAR_MODE", "off").lower()
+FH_HAR_DIR = os.getenv("FH_HAR_DIR", "tests/fh/har")
+# Replay matching: any of url, query, method, body (all four = Playwright matching)
+FH_HAR_MATCH = os.getenv("FH_HAR_MATCH", "url,query,method,body")
+FH_HAR_IGNORE_PARAMS = os.getenv("FH_HAR_IGNORE_PARAMS", "")
+# Requests missing from the HAR: 'abort' or 'fallback' (live network)
+FH_HAR_NOT_FOUND = os.getenv("FH_HAR_NOT_FOUND", "abort").lower()
+FH_HAR_URL_FILTER = os.getenv("FH_HAR_URL_FILTER", "")
+# Tests without a recorded HAR in replay mode: 'skip' or 'fail' (CI, so a
+# missing HAR cannot pass the build silently)
+FH_HAR_MISSING = os.getenv("FH_HAR_MISSING", "skip").lower()
+# Account pool: accounts listed in FH_ACCOUNTS_FILE (see
+# configs/fh_accounts.example.json) are leased exclusively per 'worker' or
+# per 'test', each with its own storage state; without the file every test
+# shares storage_state/fh_auth.json
+FH_ACCOUNTS_FILE = os.getenv("FH_ACCOUNTS_FILE", "configs/fh_accounts.json")
+FH_ACCOUNT_STATE_DIR = os.getenv("FH_ACCOUNT_STATE_DIR", "storage_state/fh_accounts")
+FH_ACCOUNT_LEASE = os.getenv("FH_ACCOUNT_LEASE", "worker").lower()
+FH_ACCOUNT_LEASE_TIMEOUT = int(os.getenv("FH_ACCOUNT_LEASE_TIMEOUT", "900"))
+# A lease not refreshed for this long is treated as left over by a crashed worker
+FH_ACCOUNT_LEASE_STALE = int(os.getenv("FH_ACCOUNT_LEASE_STALE", "1800"))
+
 # Test settings
 RETRY_FAILURES = int(os.getenv("RETRY_FAILURES", "1"))
 PARALLEL_WORKERS = int(os.getenv("PARALLEL_WORKERS", "1"))
@@ -65,8 +152,13 @@ def get_browser_launch_options():
 
 
 def get_context_options():
-    """Returns browser context options."""
-    return CONTEXT_OPTIONS
+    """Returns a copy of browser context options (safe for callers to modify)."""
+    return dict(CONTEXT_OPTIONS)
+
+
+def get_context_mode():
+    """Returns the context strategy ('fresh' or 'pool')."""
+    return CONTEXT_MODE if CONTEXT_MODE in ("fresh", "pool") else "fresh"
 
 
 def get_storage_state_path():
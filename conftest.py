@@ -6,14 +6,15 @@ import pytest
 import allure
 from playwright.sync_api import Browser, BrowserContext, Page, Playwright
 from pathlib import Path
-from typing import Generator
+from typing import Generator, Optional
 import os
-from datetime import datetime
 
 from configs.playwright_config import (
     get_browser_launch_options,
     get_context_options,
     get_storage_state_path,
+    get_context_mode,
+    CONTEXT_POOL_SIZE,
     D365_BASE_URL,
     HEADED,
     TIMEOUT
@@ -24,6 +25,16 @@ from configs.browserstack_config import (
     get_browserstack_context_options
 )
 from utils.env import get_env
+from utils.context_pool import ContextPool, open_context, close_context
+from utils.capture import get_capture_policy, is_retry
+from utils.artifact_writer import get_artifact_writer
+from utils.routing import get_route_size_cache
+from utils.timing import get_step_timer
+from utils.lazy import is_pending
+from utils.async_runner import AsyncBrowserRunner, get_async_runner
+
+# Duration history and --lpt xdist scheduling; per-step timings
+pytest_plugins = ["conftest_durations", "conftest_timings"]
 
 
 def pytest_configure(config):
@@ -52,6 +63,12 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "fourhands: mark test as FourHands webapp test"
     )
+    config.addinivalue_line(
+        "markers", "routing(profile): request routing profile for FH contexts ('off' loads all assets)"
+    )
+    config.addinivalue_line(
+        "markers", "har(flow): share one recorded HAR between tests of a page-object flow"
+    )
 
 
 @pytest.fixture(scope="session")
@@ -62,18 +79,11 @@ def browser_type_launch_args():
 
 @pytest.fixture(scope="session")
 def browser_context_args():
-    """Provide browser context arguments with video recording."""
+    """Provide browser context arguments (video is added per test by capture policy)."""
     if is_browserstack_enabled():
         return get_browserstack_context_options()
     
-    # Enhanced context options with video recording for Allure
-    context_options = get_context_options()
-    
-    # Add video recording
-    context_options['record_video_dir'] = 'test-results/videos'
-    context_options['record_video_size'] = {"width": 1920, "height": 1080}
-    
-    return context_options
+    return get_context_options()
 
 
 @pytest.fixture(scope="session")
@@ -101,23 +111,49 @@ def playwright_browser(playwright: Playwright) -> Generator[Browser, None, None]
         browser.close()
 
 
+@pytest.fixture(scope="session")
+def context_pool(playwright_browser: Browser, pytestconfig) -> Generator[Optional[ContextPool], None, None]:
+    """
+    Provide the worker's context pool, or None in 'fresh' mode.
+    
+    Session scope is per xdist worker, so each worker warms its own contexts.
+    """
+    mode = pytestconfig.getoption("--context-mode") or get_context_mode()
+    if mode != "pool":
+        yield None
+        return
+    
+    pool = ContextPool(playwright_browser, size=CONTEXT_POOL_SIZE)
+    yield pool
+    pool.close()
+
+
 @pytest.fixture
-def context(playwright_browser: Browser, browser_context_args) -> Generator[BrowserContext, None, None]:
+def context(
+    request,
+    playwright_browser: Browser,
+    browser_context_args,
+    context_pool: Optional[ContextPool]
+) -> Generator[BrowserContext, None, None]:
     """Provide browser context with storage state if available."""
-    context = playwright_browser.new_context(**browser_context_args)
+    policy = get_capture_policy()
+    context_options = dict(browser_context_args)
+    if not is_browserstack_enabled():
+        context_options.update(policy.video_options(is_retry(request.node)))
+    
+    pool_key = "default-video" if context_options.get("record_video_dir") else "default"
+    context = open_context(playwright_browser, context_pool, pool_key, context_options)
     context.set_default_timeout(TIMEOUT)
     
-    # Enable tracing for debugging
-    context.tracing.start(screenshots=True, snapshots=True, sources=True)
+    # Enable tracing when the capture policy may keep it
+    tracing = policy.start_trace(context, request.node)
     
     yield context
     
-    # Save trace
-    trace_path = f"test-results/traces/trace-{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
-    Path("test-results/traces").mkdir(parents=True, exist_ok=True)
-    context.tracing.stop(path=trace_path)
+    if tracing:
+        policy.finish_trace(context, request.node)
     
-    context.close()
+    close_context(context, context_pool)
 
 
 @pytest.fixture
@@ -145,33 +181,33 @@ def storage_state_path() -> Path:
 
 @pytest.fixture
 def authenticated_context(
+    request,
     playwright_browser: Browser,
-    storage_state_path: Path
+    storage_state_path: Path,
+    context_pool: Optional[ContextPool]
 ) -> Generator[BrowserContext, None, None]:
     """Provide authenticated context using storage state."""
     if not storage_state_path.exists():
         pytest.skip(f"Storage state not found at {storage_state_path}. Run auth setup first.")
     
+    policy = get_capture_policy()
     context_options = get_context_options()
     
-    # Add video recording
-    context_options['record_video_dir'] = 'test-results/videos'
-    context_options['record_video_size'] = {"width": 1920, "height": 1080}
+    # Add video recording when the capture policy may keep it
+    context_options.update(policy.video_options(is_retry(request.node)))
     
-    context = playwright_browser.new_context(**context_options)
+    pool_key = "authenticated-video" if context_options.get("record_video_dir") else "authenticated"
+    context = open_context(playwright_browser, context_pool, pool_key, context_options)
     context.set_default_timeout(TIMEOUT)
     
-    # Enable tracing
-    context.tracing.start(screenshots=True, snapshots=True, sources=True)
+    tracing = policy.start_trace(context, request.node)
     
     yield context
     
-    # Save trace
-    trace_path = f"test-results/traces/trace-{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
-    Path("test-results/traces").mkdir(parents=True, exist_ok=True)
-    context.tracing.stop(path=trace_path)
+    if tracing:
+        policy.finish_trace(context, request.node)
     
-    context.close()
+    close_context(context, context_pool)
 
 
 @pytest.fixture
@@ -182,14 +218,29 @@ def authenticated_page(authenticated_context: BrowserContext) -> Generator[Page,
     page.close()
 
 
+@pytest.fixture(scope="session")
+def async_runner() -> Generator[AsyncBrowserRunner, None, None]:
+    """
+    Provide the worker's async browser runner for pages/aio flows.
+    
+    The browser is launched on the first run() call, so requesting the
+    fixture costs nothing for tests that skip before using it.
+    """
+    runner = get_async_runner()
+    yield runner
+    runner.close()
+
+
 # Enhanced Allure reporting hooks
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
-    """Attach screenshots, videos, and traces on failure AND success."""
+    """Attach screenshots, HTML, and videos according to the capture policy."""
     outcome = yield
     rep = outcome.get_result()
     
-    # Add attachments for both passed and failed tests
+    # Expose phase reports to fixtures (trace/video teardown decisions)
+    setattr(item, f"rep_{rep.when}", rep)
+    
     if call.when == "call":
         # Get any page fixture (check multiple possible names)
         page = None
@@ -205,49 +256,61 @@ def pytest_runtest_makereport(item, call):
                 page = item.funcargs[fixture_name]
                 break
         
+        # A lazy page the test never touched has nothing to capture
+        if is_pending(page):
+            page = None
+        
         if page:
+            policy = get_capture_policy()
+            timer = get_step_timer()
+            failed = rep.failed
+            retrying = is_retry(item)
+            
             try:
-                # Always attach screenshot (for both pass and fail)
-                screenshot = page.screenshot(full_page=True)
-                allure.attach(
-                    screenshot,
-                    name=f"Screenshot - {rep.nodeid.split('::')[-1]}",
-                    attachment_type=allure.attachment_type.PNG
-                )
+                if policy.keeps("screenshot", failed, retrying):
+                    with timer.measure("artifact", "screenshot"):
+                        screenshot = page.screenshot(full_page=True)
+                    allure.attach(
+                        screenshot,
+                        name=f"Screenshot - {rep.nodeid.split('::')[-1]}",
+                        attachment_type=allure.attachment_type.PNG
+                    )
                 
-                # Attach page HTML
-                html_content = page.content()
-                allure.attach(
-                    html_content,
-                    name="Page HTML",
-                    attachment_type=allure.attachment_type.HTML
-                )
+                if policy.keeps("html", failed, retrying):
+                    with timer.measure("artifact", "html"):
+                        html_content = page.content()
+                    allure.attach(
+                        html_content,
+                        name="Page HTML",
+                        attachment_type=allure.attachment_type.HTML
+                    )
                 
-                # Attach current URL
-                allure.attach(
-                    page.url,
-                    name="Page URL",
-                    attachment_type=allure.attachment_type.TEXT
-                )
+                if failed or policy.keeps("screenshot", failed, retrying):
+                    # Attach current URL (no browser round-trip)
+                    allure.attach(
+                        page.url,
+                        name="Page URL",
+                        attachment_type=allure.attachment_type.TEXT
+                    )
                 
-                # Attach video if available
+                # Attach or discard video
                 try:
-                    video_path = page.video.path() if page.video else None
-                    if video_path:
-                        # Close page to finalize video
-                        page.context.close()
-                        
-                        # Wait a moment for video to be written
-                        import time
-                        time.sleep(1)
+                    video = page.video
+                    if video:
+                        # Close page to finalize video (keeps pooled contexts alive)
+                        with timer.measure("artifact", "video finalize"):
+                            page.close()
                         
-                        if os.path.exists(video_path):
-                            with open(video_path, 'rb') as video_file:
-                                allure.attach(
-                                    video_file.read(),
-                                    name="Test Video",
-                                    attachment_type=allure.attachment_type.WEBM
-                                )
+                        if policy.keeps("video", failed, retrying):
+                            # Finalized and linked into allure results off-thread
+                            get_artifact_writer().submit_file(
+                                item.config,
+                                video.path(),
+                                name="Test Video",
+                                attachment_type=allure.attachment_type.WEBM
+                            )
+                        else:
+                            video.delete()
                 except Exception as video_error:
                     print(f"Could not attach video: {video_error}")
                 
@@ -255,6 +318,12 @@ def pytest_runtest_makereport(item, call):
                 print(f"Could not attach media to Allure: {e}")
 
 
+def pytest_sessionfinish(session, exitstatus):
+    """Flush queued artifacts before Allure results are consumed."""
+    get_artifact_writer().close()
+    get_route_size_cache().save()
+
+
 # Pytest command line options
 def pytest_addoption(parser):
     """Add custom command line options."""
@@ -265,6 +334,13 @@ def pytest_addoption(parser):
         default=False,
         help="Run tests on BrowserStack Automate"
     )
+    parser.addoption(
+        "--context-mode",
+        action="store",
+        default=None,
+        choices=["fresh", "pool"],
+        help="Browser context strategy: fresh context per test or per-worker pool (default: CONTEXT_MODE env)"
+    )
 
 
 @pytest.fixture(autouse=True)
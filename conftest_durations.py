@@ -0,0 +1,79 @@
+"""
+Pytest plugin recording per-test durations and balancing xdist workers
+Use --lpt with -n to hand out the longest tests first
+"""
+
+import pytest
+from collections import defaultdict
+
+from utils.duration_history import DurationHistory, DEFAULT_HISTORY_PATH
+
+
+class DurationRecorder:
+    """Sums setup/call/teardown durations per test and merges them into the history"""
+
+    def __init__(self, history_path: str):
+        self.history_path = history_path
+        self.measurements = defaultdict(float)
+        self.ran = set()
+
+    def pytest_runtest_logreport(self, report):
+        """Accumulate phase durations (on the controller these arrive from all workers)"""
+        self.measurements[report.nodeid] += report.duration
+        if report.when == "call":
+            self.ran.add(report.nodeid)
+
+    def pytest_sessionfinish(self, session):
+        """Merge this run's durations into the history file"""
+        # Skipped tests never reached the call phase and would look instantaneous
+        ran = {nodeid: d for nodeid, d in self.measurements.items() if nodeid in self.ran}
+        if not ran:
+            return
+
+        history = DurationHistory(self.history_path)
+        history.update(ran)
+        history.save()
+
+
+def pytest_addoption(parser):
+    """Register duration history options"""
+    group = parser.getgroup("duration history")
+    group.addoption(
+        "--duration-history",
+        action="store",
+        default=DEFAULT_HISTORY_PATH,
+        help="Per-test duration history file (default: DURATION_HISTORY env or .pytest_durations.json)"
+    )
+    group.addoption(
+        "--no-duration-history",
+        action="store_true",
+        default=False,
+        help="Do not update the duration history after the run"
+    )
+    group.addoption(
+        "--lpt",
+        action="store_true",
+        default=False,
+        help="With -n: schedule longest tests first using the duration history"
+    )
+
+
+def pytest_configure(config):
+    """Record durations on the controller (or in a run without xdist)"""
+    if hasattr(config, "workerinput") or config.getoption("--no-duration-history"):
+        return
+    config.pluginmanager.register(
+        DurationRecorder(config.getoption("--duration-history")), "duration_recorder"
+    )
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    """Use longest-processing-time-first scheduling with --lpt"""
+    if not config.getoption("--lpt"):
+        return None
+
+    from utils.lpt_scheduler import LPTScheduling
+
+    history = DurationHistory(config.getoption("--duration-history"))
+    return LPTScheduling(config, log, history=history)
@@ -0,0 +1,131 @@
+"""
+Pytest plugin timing page actions, waits, fixtures and artifact capture
+Each test gets an Allure "Step timings" attachment; TIMINGS_PATH collects all tests
+"""
+
+import json
+import pytest
+import allure
+from pathlib import Path
+
+from configs.playwright_config import TIMINGS, TIMINGS_PATH, TIMINGS_TOP
+from utils.timing import get_step_timer, step_dict, write_timings
+
+# Fixtures faster than this are timed (their time counts) but not listed
+MIN_FIXTURE_SECONDS = 0.005
+
+
+class TimingPlugin:
+    """Opens a TestTimings per test and writes the run's timings file"""
+
+    def __init__(self, config, path: str):
+        self.timer = get_step_timer()
+        self.path = Path(path)
+        self.worker = getattr(config, "workerinput", {}).get("workerid")
+        self.payload = None
+        self._teardown_starts = {}
+        if self.worker is None:
+            # Parts left behind by an interrupted run would be merged again
+            for part in self._parts():
+                part.unlink(missing_ok=True)
+
+    def _parts(self):
+        return self.path.parent.glob(f"{self.path.stem}.gw*{self.path.suffix}")
+
+    @pytest.hookimpl(hookwrapper=True, tryfirst=True)
+    def pytest_runtest_setup(self, item):
+        """Start timing before any fixture is set up"""
+        self.timer.start_test(item.nodeid)
+        yield
+
+    @pytest.hookimpl(hookwrapper=True, tryfirst=True)
+    def pytest_runtest_teardown(self, item):
+        """Finish timing after every fixture is torn down and attach the breakdown"""
+        yield
+        timings = self.timer.finish_test()
+        if timings is None or not timings.records:
+            return
+        try:
+            allure.attach(timings.report(), name="Step timings", attachment_type=allure.attachment_type.TEXT)
+        except Exception as e:
+            print(f"Could not attach step timings: {e}")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        """Time fixture setup; a finalizer added now runs right before the fixture's teardown"""
+        start = self.timer.begin()
+        outcome = yield
+        self.timer.end(
+            start, "fixture", f"{fixturedef.argname} setup", fixturedef.scope,
+            failed=outcome.excinfo is not None, min_seconds=MIN_FIXTURE_SECONDS
+        )
+        key = (fixturedef.argname, id(fixturedef))
+        fixturedef.addfinalizer(lambda: self._teardown_starts.setdefault(key, self.timer.begin()))
+
+    def pytest_fixture_post_finalizer(self, fixturedef, request):
+        """Runs after the fixture's teardown code"""
+        start = self._teardown_starts.pop((fixturedef.argname, id(fixturedef)), None)
+        if start is not None:
+            self.timer.end(
+                start, "fixture", f"{fixturedef.argname} teardown", fixturedef.scope,
+                min_seconds=MIN_FIXTURE_SECONDS
+            )
+
+    def pytest_sessionfinish(self, session):
+        """Workers write a part; the controller merges parts into TIMINGS_PATH"""
+        tests = [t.to_dict() for t in self.timer.finished]
+        session_steps = [step_dict(s) for s in self.timer.session_records]
+
+        if self.worker is not None:
+            part = self.path.with_name(f"{self.path.stem}.{self.worker}{self.path.suffix}")
+            write_timings(part, tests, session_steps)
+            return
+
+        for part in sorted(self._parts()):
+            try:
+                data = json.loads(part.read_text())
+                tests += data["tests"]
+                session_steps += data["session_steps"]
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️ Skipping timings part {part}: {e}")
+            part.unlink(missing_ok=True)
+
+        if tests:
+            self.payload = write_timings(self.path, tests, session_steps)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        """Print the slowest operations of the run"""
+        if not self.payload or not self.payload["operations"]:
+            return
+        terminalreporter.write_sep("-", f"slowest operations (self time, top {TIMINGS_TOP})")
+        for op in self.payload["operations"][:TIMINGS_TOP]:
+            terminalreporter.write_line(
+                f"{op['total']:9.2f}s total {op['count']:5d}x  mean {op['mean']:6.2f}s  "
+                f"max {op['max']:6.2f}s  {op['category']}/{op['name']}"
+            )
+        terminalreporter.write_line(f"Step timings written to {self.path}")
+
+
+def pytest_addoption(parser):
+    """Register step timing options"""
+    group = parser.getgroup("step timings")
+    group.addoption(
+        "--timings-path",
+        action="store",
+        default=TIMINGS_PATH,
+        help="Per-test step timings file (default: TIMINGS_PATH env or test-results/timings.json)"
+    )
+    group.addoption(
+        "--no-timings",
+        action="store_true",
+        default=False,
+        help="Do not time page actions, waits, fixtures and artifact capture"
+    )
+
+
+def pytest_configure(config):
+    """Enable step timing unless disabled by TIMINGS=false or --no-timings"""
+    timer = get_step_timer()
+    timer.enabled = TIMINGS and not config.getoption("--no-timings")
+    if timer.enabled:
+        config.pluginmanager.register(TimingPlugin(config, config.getoption("--timings-path")), "timing_plugin")
@@ -0,0 +1,12 @@
+"""
+Async twins of the page objects (playwright.async_api).
+
+Selectors come from pages/page_selectors.py, shared with the sync layer.
+Use these to drive several pages from one worker concurrently, e.g.
+asyncio.gather over a list of PDPs, through utils/async_runner.py.
+"""
+from pages.aio.base_page import AsyncBasePage
+from pages.aio.fh_cart_page import AsyncFourHandsCartPage
+from pages.aio.fh_product_detail_page import AsyncFourHandsProductDetailPage
+from pages.aio.d365 import AsyncD365BasePage
+from pages.aio.d365.sales_order_page import AsyncD365SalesOrderPage
@@ -0,0 +1,175 @@
+"""
+Async base page: the BasePage API on playwright.async_api.
+"""
+from typing import Dict, Optional
+from playwright.async_api import Page, FrameLocator, expect
+
+from utils.waits import WaitConditions
+from utils.snapshot import Field, SNAPSHOT_JS, schema_spec, finish_snapshot
+
+
+class AsyncBasePage:
+    """Async counterpart of pages.base_page.BasePage."""
+
+    def __init__(self, page: Page, timeout: int = 30000):
+        """
+        Initialize async base page.
+
+        Args:
+            page: playwright.async_api Page
+            timeout: Default timeout in milliseconds
+        """
+        self.page = page
+        self.timeout = timeout
+
+    async def assert_loaded(self) -> None:
+        """
+        Assert that the page is loaded.
+        Must be implemented by subclasses.
+        """
+        raise NotImplementedError("Subclasses must implement assert_loaded()")
+
+    async def navigate(self, url: str) -> None:
+        """
+        Navigate to a URL.
+
+        Args:
+            url: URL to navigate to
+        """
+        await self.page.goto(url, timeout=self.timeout, wait_until="domcontentloaded")
+
+    async def wait_for_element_visible(self, selector: str, frame: Optional[FrameLocator] = None) -> None:
+        """
+        Wait for element to be visible.
+
+        Args:
+            selector: Element selector
+            frame: Optional frame to search in
+        """
+        context = frame if frame else self.page
+        await context.locator(selector).first.wait_for(state="visible", timeout=self.timeout)
+
+    async def wait_for_loading_done(self, frame: Optional[FrameLocator] = None) -> None:
+        """Wait until loading masks and spinners are gone (WaitConditions selectors)."""
+        context = frame if frame else self.page
+        for selector in (WaitConditions.LOADING_MASK, WaitConditions.LOADING_SPINNER):
+            indicator = context.locator(selector)
+            try:
+                if await indicator.count() > 0:
+                    await indicator.first.wait_for(state="hidden", timeout=self.timeout)
+            except Exception:
+                # Indicator never appeared or went away mid-check
+                pass
+
+    async def click_element(
+        self,
+        selector: str,
+        frame: Optional[FrameLocator] = None,
+        wait_after: bool = True
+    ) -> None:
+        """
+        Click an element with optional waiting.
+
+        Args:
+            selector: Element selector
+            frame: Optional frame containing the element
+            wait_after: Whether to wait for loading after click
+        """
+        context = frame if frame else self.page
+        element = context.locator(selector).first
+        await element.wait_for(state="visible", timeout=self.timeout)
+        await element.click()
+
+        if wait_after:
+            await self.wait_for_loading_done(frame)
+
+    async def fill_input(
+        self,
+        selector: str,
+        value: str,
+        frame: Optional[FrameLocator] = None,
+        clear_first: bool = True
+    ) -> None:
+        """
+        Fill an input field.
+
+        Args:
+            selector: Input selector
+            value: Value to fill
+            frame: Optional frame containing the input
+            clear_first: Whether to clear existing value first
+        """
+        context = frame if frame else self.page
+        element = context.locator(selector).first
+        await element.wait_for(state="visible", timeout=self.timeout)
+
+        if clear_first:
+            await element.clear()
+
+        await element.fill(value)
+
+    async def get_text(self, selector: str, frame: Optional[FrameLocator] = None) -> str:
+        """
+        Get text content of an element.
+
+        Args:
+            selector: Element selector
+            frame: Optional frame containing the element
+
+        Returns:
+            str: Element text content
+        """
+        context = frame if frame else self.page
+        element = context.locator(selector).first
+        await element.wait_for(state="visible", timeout=self.timeout)
+        return await element.inner_text()
+
+    async def is_visible(self, selector: str, frame: Optional[FrameLocator] = None) -> bool:
+        """
+        Check if element is visible.
+
+        Args:
+            selector: Element selector
+            frame: Optional frame containing the element
+
+        Returns:
+            bool: True if visible, False otherwise
+        """
+        context = frame if frame else self.page
+        try:
+            return await context.locator(selector).first.is_visible()
+        except Exception:
+            return False
+
+    async def assert_element_visible(self, selector: str, frame: Optional[FrameLocator] = None) -> None:
+        """
+        Assert that element is visible.
+
+        Args:
+            selector: Element selector
+            frame: Optional frame containing the element
+        """
+        context = frame if frame else self.page
+        await expect(context.locator(selector).first).to_be_visible(timeout=self.timeout)
+
+    async def snapshot(self, schema: Dict[str, Field]) -> dict:
+        """
+        Read several fields of the page state in one round-trip (see BasePage.snapshot).
+
+        Args:
+            schema: Field name -> Field
+
+        Returns:
+            dict: Field name -> extracted value
+        """
+        raw = await self.page.evaluate(SNAPSHOT_JS, schema_spec(schema))
+        return finish_snapshot(schema, raw)
+
+    def get_current_url(self) -> str:
+        """
+        Get current page URL.
+
+        Returns:
+            str: Current URL
+        """
+        return self.page.url
@@ -0,0 +1,41 @@
+"""
+Async D365 Base Page - Parent class for the async D365 page objects.
+"""
+from playwright.async_api import Page
+from utils.d365_waits import AsyncBusyWatcher
+from utils.d365_navigation import AsyncD365Navigator
+
+
+class AsyncD365BasePage:
+    """Async counterpart of pages.d365.D365BasePage."""
+
+    def __init__(self, page: Page):
+        """
+        Initialize async D365 base page.
+
+        Args:
+            page: playwright.async_api Page
+        """
+        self.page = page
+        self.guard = AsyncBusyWatcher(page)
+        self.navigator = AsyncD365Navigator(page, self.guard)
+
+    async def navigate_to(self, url: str):
+        """Navigate to URL and wait until idle."""
+        await self.page.goto(url)
+        await self.guard.wait_until_idle()
+
+    async def click_and_wait(self, selector: str):
+        """Click element and wait for D365 to be idle."""
+        await self.page.locator(selector).click()
+        await self.guard.wait_until_idle()
+
+    async def fill_and_wait(self, selector: str, text: str):
+        """Fill input and wait for D365 to be idle."""
+        await self.page.locator(selector).fill(text)
+        await self.guard.wait_until_idle()
+
+    async def select_and_wait(self, selector: str):
+        """Select element and wait for D365 to be idle."""
+        await self.page.locator(selector).click()
+        await self.guard.wait_until_idle()
@@ -0,0 +1,54 @@
+"""
+Async D365 Sales Order Page Object.
+"""
+from pages.aio.d365 import AsyncD365BasePage
+from pages.page_selectors import D365SalesOrderSelectors
+
+
+class AsyncD365SalesOrderPage(D365SalesOrderSelectors, AsyncD365BasePage):
+    """Async counterpart of D365SalesOrderPage (navigation and order header)."""
+
+    async def navigate_to_sales_orders(self):
+        """Navigate to All Sales Orders page (deep link when the menu item is cached)."""
+        print("📍 Navigating to Sales Orders...")
+        await self.navigator.go(
+            "all_sales_orders",
+            click_path=self._click_to_sales_orders,
+            is_open=lambda: self.page.get_by_text(self.all_sales_orders_text).first.is_visible()
+        )
+        print("✅ Successfully navigated to Sales Orders")
+
+    async def _click_to_sales_orders(self):
+        """Reach All Sales Orders through the navigation pane."""
+        await self.page.get_by_label(self.nav_expand_label).click()
+        await self.guard.wait_until_idle()
+
+        await self.page.get_by_label(self.modules_label).click()
+        await self.guard.wait_until_idle()
+
+        await self.page.get_by_role("treeitem", name=self.accounts_receivable_name).click()
+        await self.guard.wait_until_idle()
+
+        await self.page.get_by_text(self.all_sales_orders_text).click()
+        await self.guard.wait_until_idle()
+
+    async def click_new_sales_order(self):
+        """Click the New button to create sales order."""
+        print("➕ Creating new sales order...")
+        await self.page.get_by_role("button", name=self.new_button_name).click()
+        await self.guard.wait_until_idle()
+
+    async def select_customer(self, customer_account: str = "100001"):
+        """
+        Select customer account.
+
+        Args:
+            customer_account: Customer account number (default: 100001)
+        """
+        print(f"👤 Selecting customer: {customer_account}")
+        await self.page.locator(self.customer_account_input).fill(customer_account)
+        await self.page.locator(f"{self.customer_account_id} div").nth(1).click()
+        await self.guard.wait_until_idle()
+        await self.page.get_by_role("gridcell", name=customer_account).get_by_label("Customer account").first.click()
+        await self.guard.wait_until_idle()
+        print(f"✅ Customer {customer_account} selected")
@@ -0,0 +1,64 @@
+"""
+Async FourHands Cart Page object.
+"""
+from configs.playwright_config import FH_BASE_URL, FH_CART_PAGE_PATH
+from pages.aio.base_page import AsyncBasePage
+from pages.fh_cart_page import CartSnapshot
+from pages.page_selectors import CartSelectors
+
+
+class AsyncFourHandsCartPage(CartSelectors, AsyncBasePage):
+    """Async counterpart of FourHandsCartPage (read-side: loading and verifying the cart)."""
+
+    async def assert_loaded(self) -> None:
+        """Assert that cart page is loaded."""
+        await self.wait_for_element_visible(self.shopping_cart_title)
+
+    async def open(self, base_url: str = FH_BASE_URL) -> None:
+        """
+        Open the cart page and wait until it is loaded.
+
+        Args:
+            base_url: Storefront origin
+        """
+        await self.navigate(f"{base_url.rstrip('/')}{FH_CART_PAGE_PATH}")
+        await self.assert_loaded()
+
+    async def snapshot_cart(self) -> CartSnapshot:
+        """
+        Read items, prices, totals and saved items in one round-trip.
+
+        Returns:
+            CartSnapshot: Current cart page state
+        """
+        return CartSnapshot(**await self.snapshot(self.cart_schema))
+
+    async def get_cart_item_count(self) -> int:
+        """
+        Get number of items in cart.
+
+        Returns:
+            int: Number of products in cart
+        """
+        return await self.page.locator(self.cart_products).count()
+
+    async def get_saved_for_later_count(self) -> int:
+        """
+        Get number of items in Saved for Later.
+
+        Returns:
+            int: Number of saved items
+        """
+        return await self.page.locator(self.saved_for_later_items).count()
+
+    async def verify_product_in_cart(self, product_id: str) -> bool:
+        """
+        Check if specific product is in cart.
+
+        Args:
+            product_id: Product ID to check
+
+        Returns:
+            bool: True if product is in cart
+        """
+        return await self.is_visible(f"{self.cart_product_ids}[text()='{product_id}']")
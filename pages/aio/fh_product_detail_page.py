@@ -0,0 +1,78 @@
+"""
+Async FourHands Product Detail Page (PDP) object.
+"""
+from urllib.parse import urlparse
+
+from configs.playwright_config import FH_BASE_URL
+from pages.aio.base_page import AsyncBasePage
+from pages.page_selectors import ProductDetailSelectors
+
+
+class AsyncFourHandsProductDetailPage(ProductDetailSelectors, AsyncBasePage):
+    """Async counterpart of FourHandsProductDetailPage, for checking several PDPs concurrently."""
+
+    async def assert_loaded(self) -> None:
+        """Assert that PDP is loaded."""
+        await self.wait_for_element_visible(self.product_title)
+        await self.wait_for_element_visible(self.add_to_cart_button)
+
+    async def navigate_to_product(self, product_id: str) -> None:
+        """
+        Navigate directly to a product detail page.
+
+        Args:
+            product_id: Product SKU/ID
+        """
+        parsed = urlparse(self.page.url)
+        if parsed.scheme in ("http", "https"):
+            base_url = f"{parsed.scheme}://{parsed.netloc}"
+        else:
+            base_url = FH_BASE_URL.rstrip("/")
+        await self.navigate(f"{base_url}/product/{product_id}")
+        await self.assert_loaded()
+
+    async def click_add_to_cart(self) -> None:
+        """Click Add to Cart button."""
+        await self.click_element(self.add_to_cart_button)
+
+    async def get_product_title(self) -> str:
+        """
+        Get product title.
+
+        Returns:
+            str: Product title
+        """
+        return await self.get_text(self.product_title)
+
+    async def get_product_price(self) -> str:
+        """
+        Get product price.
+
+        Returns:
+            str: Product price
+        """
+        return await self.get_text(self.product_price)
+
+    async def get_availability_message(self) -> str:
+        """
+        Get availability/ATP message.
+
+        Returns:
+            str: Availability message
+        """
+        try:
+            return await self.get_text(self.availability_message)
+        except Exception:
+            return "N/A"
+
+    async def is_add_to_cart_enabled(self) -> bool:
+        """
+        Check if Add to Cart button is enabled.
+
+        Returns:
+            bool: True if enabled, False otherwise
+        """
+        try:
+            return await self.page.locator(self.add_to_cart_button).first.is_enabled()
+        except Exception:
+            return False
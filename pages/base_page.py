@@ -1,9 +1,11 @@
 """
 Base page class providing shared functionality for all page objects.
 """
-from typing import Optional
+from typing import Dict, Optional
 from playwright.sync_api import Page, FrameLocator, expect
 from utils.waits import WaitConditions
+from utils.timing import timed
+from utils.snapshot import Field, SNAPSHOT_JS, schema_spec, finish_snapshot
 
 
 class BasePage:
@@ -28,6 +30,7 @@ class BasePage:
         """
         raise NotImplementedError("Subclasses must implement assert_loaded()")
     
+    @timed("page")
     def navigate(self, url: str) -> None:
         """
         Navigate to a URL.
@@ -37,6 +40,7 @@ class BasePage:
         """
         self.page.goto(url, timeout=self.timeout, wait_until="domcontentloaded")
     
+    @timed("page")
     def wait_for_element_visible(
         self, 
         selector: str, 
@@ -52,6 +56,7 @@ class BasePage:
         context = frame if frame else self.page
         context.locator(selector).first.wait_for(state="visible", timeout=self.timeout)
     
+    @timed("page")
     def click_element(
         self, 
         selector: str, 
@@ -75,6 +80,7 @@ class BasePage:
             self.waits.wait_for_no_loading_mask(frame)
             self.waits.wait_for_no_spinner(frame)
     
+    @timed("page")
     def fill_input(
         self, 
         selector: str, 
@@ -183,6 +189,22 @@ class BasePage:
         element = context.locator(selector).first
         expect(element).to_contain_text(expected_text, timeout=self.timeout)
     
+    @timed("page")
+    def snapshot(self, schema: Dict[str, Field]) -> dict:
+        """
+        Read several fields of the page state in one round-trip.
+        
+        Does not wait; take it once the page has settled.
+        
+        Args:
+            schema: Field name -> Field (selector, extractor, conversion)
+            
+        Returns:
+            dict: Field name -> extracted value
+        """
+        raw = self.page.evaluate(SNAPSHOT_JS, schema_spec(schema))
+        return finish_snapshot(schema, raw)
+    
     def take_screenshot(self, name: str) -> bytes:
         """
         Take a screenshot.
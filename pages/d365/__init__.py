@@ -3,6 +3,7 @@ D365 Base Page - Parent class for all D365 page objects.
 """
 from playwright.sync_api import Page
 from utils.d365_waits import BusyWatcher
+from utils.d365_navigation import D365Navigator
 
 
 class D365BasePage:
@@ -17,6 +18,7 @@ class D365BasePage:
         """
         self.page = page
         self.guard = BusyWatcher(page)
+        self.navigator = D365Navigator(page, self.guard)
     
     def navigate_to(self, url: str):
         """Navigate to URL and wait until idle."""
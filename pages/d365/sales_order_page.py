@@ -3,38 +3,28 @@ D365 Sales Order Page Object - Using Playwright Codegen selectors
 """
 from playwright.sync_api import Page
 from pages.d365 import D365BasePage
+from pages.page_selectors import D365SalesOrderSelectors
 
 
-class D365SalesOrderPage(D365BasePage):
-    """Page object for D365 Sales Order functionality."""
+class D365SalesOrderPage(D365SalesOrderSelectors, D365BasePage):
+    """Page object for D365 Sales Order functionality (selectors in pages/page_selectors.py)."""
     
     def __init__(self, page: Page):
         """Initialize Sales Order page."""
         super().__init__(page)
-        
-        # Navigation labels (use with get_by_label)
-        self.nav_expand_label = "Expand the navigation pane"
-        self.modules_label = "Modules"
-        
-        # Treeitem names (use with get_by_role)
-        self.accounts_receivable_name = "Accounts receivable"
-        
-        # Text labels (use with get_by_text)
-        self.all_sales_orders_text = "All sales orders"
-        
-        # Button names (use with get_by_role)
-        self.new_button_name = "New"
-        self.ok_button_name = "OK"
-        
-        # Form field IDs (use with locator)
-        self.customer_account_id = "#SalesCreateOrder_5_SalesTable_CustAccount"
-        self.delivery_mode_id = "#SalesCreateOrder_5_SalesTable_DlvMode"
-        self.item_number_id = "#SalesLine_ItemId_2023_0_0"
     
     def navigate_to_sales_orders(self):
-        """Navigate to All Sales Orders page."""
+        """Navigate to All Sales Orders page (deep link when the menu item is cached)."""
         print("📍 Navigating to Sales Orders...")
-        
+        self.navigator.go(
+            "all_sales_orders",
+            click_path=self._click_to_sales_orders,
+            is_open=lambda: self.page.get_by_text(self.all_sales_orders_text).first.is_visible()
+        )
+        print("✅ Successfully navigated to Sales Orders")
+    
+    def _click_to_sales_orders(self):
+        """Reach All Sales Orders through the navigation pane."""
         # Expand navigation pane
         self.page.get_by_label(self.nav_expand_label).click()
         self.guard.wait_until_idle()
@@ -50,8 +40,6 @@ class D365SalesOrderPage(D365BasePage):
         # Click All Sales Orders
         self.page.get_by_text(self.all_sales_orders_text).click()
         self.guard.wait_until_idle()
-        
-        print("✅ Successfully navigated to Sales Orders")
     
     def click_new_sales_order(self):
         """Click the New button to create sales order."""
@@ -69,6 +57,9 @@ class D365SalesOrderPage(D365BasePage):
         """
         print(f"👤 Selecting customer: {customer_account}")
         
+        # Typing the account filters the lookup, so new (factory) customers are listed
+        self.page.locator(self.customer_account_input).fill(customer_account)
+        
         # Click customer account dropdown
         self.page.locator(f"{self.customer_account_id} div").nth(1).click()
         self.guard.wait_until_idle()
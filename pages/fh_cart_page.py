@@ -1,39 +1,54 @@
 """
 FourHands Cart Page object - Enhanced with Save for Later functionality.
 """
-from typing import List
-from playwright.sync_api import Page
+from dataclasses import dataclass
+from typing import List, Optional
+from playwright.sync_api import Page, Error as PlaywrightError
 from pages.base_page import BasePage
+from configs.playwright_config import FH_CART_CLEANUP, FH_HAR_MODE
+from utils.fh_api import FourHandsCartApi, FourHandsApiError
+from pages.page_selectors import CartSelectors
+from utils.snapshot import parse_price
 
 
-class FourHandsCartPage(BasePage):
-    """Page object for FourHands Cart page."""
+@dataclass
+class CartSnapshot:
+    """Cart page state read in one round-trip (FourHandsCartPage.snapshot_cart)."""
+    loaded: bool
+    empty_message: bool
+    item_count: int
+    product_ids: List[str]
+    item_prices: List[Optional[float]]
+    subtotal: Optional[str]
+    total: Optional[str]
+    saved_section: bool
+    saved_count: int
+    saved_empty_message: bool
+    
+    def has_product(self, product_id: str) -> bool:
+        """Check if a product ID is listed on the page."""
+        return product_id in self.product_ids
+    
+    @property
+    def saved_for_later_empty(self) -> bool:
+        """Saved for Later shows its empty message or has no items."""
+        return self.saved_empty_message or self.saved_count == 0
+    
+    @property
+    def subtotal_amount(self) -> Optional[float]:
+        return parse_price(self.subtotal)
+    
+    @property
+    def total_amount(self) -> Optional[float]:
+        return parse_price(self.total)
+
+
+class FourHandsCartPage(CartSelectors, BasePage):
+    """Page object for FourHands Cart page (selectors in pages/page_selectors.py)."""
     
     def __init__(self, page: Page, timeout: int = 30000):
         """Initialize FourHands Cart page."""
         super().__init__(page, timeout)
-        
-        # Main cart selectors
-        self.shopping_cart_title = "//h1[text()='Shopping Cart']"
-        self.proceed_to_checkout_button = "//button[text()='Proceed to Checkout']"
-        self.cart_empty_text = "//div[@class='text-body-xl mb-f10 text-neutral-50']"
-        self.cart_products = "//img[contains(@src,'cloudfront.net/image/')]"
-        self.cart_item_prices = "//div[@class='text-f-base-2xl md:w-[6.5em] md:min-w-min md:text-right']"
-        self.summary_subtotal = "//div[@class='flex items-center justify-between']//span[contains(text(), '$')]"
-        self.summary_total = "//div[@class='text-f-lg-3xl']"
-        
-        # Cart action buttons
-        self.remove_button = "//button[@type='button'][normalize-space()='Remove']"
-        self.save_for_later_button = "//button[text()='Save for Later']"
-        
-        # Saved for Later selectors
-        self.saved_for_later_section = "//div[contains(@class, 'saved-for-later') or .//h2[contains(text(), 'Saved for Later')]]"
-        self.saved_for_later_title = "//h2[contains(text(), 'Saved for Later')]"
-        self.saved_for_later_empty_message = "//p[contains(text(), 'No saved items') or contains(text(), 'saved for later is empty')]"
-        self.saved_for_later_items = "//div[contains(@class, 'saved-item')]"
-        self.move_to_cart_button = "//button[text()='Move to Cart']"
-        self.move_all_to_cart_button = "//button[text()='Move All to Cart']"
-        self.remove_from_saved_button = "//button[contains(text(), 'Remove')]"
     
     def assert_loaded(self) -> None:
         """Assert that cart page is loaded."""
@@ -48,15 +63,19 @@ class FourHandsCartPage(BasePage):
     def remove_all_products(self) -> None:
         """Remove all products from cart."""
         print("🗑️ Removing all products from cart...")
+        self._clear_via_api("cart")
+        
+        # UI loop clears whatever the API did not (or everything when it is unavailable)
+        remove_buttons = self.page.locator(self.remove_button)
         while True:
-            remove_buttons = self.page.locator(self.remove_button).all()
+            count = remove_buttons.count()
             
-            if not remove_buttons or len(remove_buttons) == 0:
+            if count == 0:
                 break
             
-            # Click first remove button
-            remove_buttons[0].click()
-            self.page.wait_for_timeout(1000)
+            # Click first remove button and wait for the line to disappear
+            remove_buttons.first.click()
+            self.waits.wait_for_count_change(self.remove_button, count)
         print("✅ Cart cleared")
     
     def get_cart_item_count(self) -> int:
@@ -68,6 +87,15 @@ class FourHandsCartPage(BasePage):
         """
         return self.page.locator(self.cart_products).count()
     
+    def snapshot_cart(self) -> CartSnapshot:
+        """
+        Read items, prices, totals and saved items in one round-trip.
+        
+        Returns:
+            CartSnapshot: Current cart page state
+        """
+        return CartSnapshot(**self.snapshot(self.cart_schema))
+    
     def is_cart_empty(self) -> bool:
         """Check if cart is empty."""
         return self.is_visible(self.cart_empty_text)
@@ -78,44 +106,84 @@ class FourHandsCartPage(BasePage):
         
         Args:
             product_id: Product ID to check
-            
+        
         Returns:
             bool: True if product is in cart
         """
-        product_selector = f"//div[contains(@class,'truncate')]//span[text()='{product_id}']"
+        product_selector = f"{self.cart_product_ids}[text()='{product_id}']"
         return self.is_visible(product_selector)
     
+    def _clear_via_api(self, collection: str) -> bool:
+        """
+        Clear the cart or Saved for Later through the storefront API.
+        
+        Reloads the page when lines were removed so the UI reflects the
+        new state. Failures are reported and left to the UI fallback.
+        
+        Args:
+            collection: 'cart' or 'saved_for_later'
+        
+        Returns:
+            bool: True if the collection was cleared through the API
+        """
+        # API calls bypass HAR record/replay, so recorded flows clean up through the UI
+        if FH_CART_CLEANUP != "api" or FH_HAR_MODE != "off":
+            return False
+        
+        api = FourHandsCartApi.for_page(self.page)
+        get_ids, clear = {
+            "cart": (api.get_cart_line_ids, api.clear_cart),
+            "saved_for_later": (api.get_saved_for_later_ids, api.clear_saved_for_later),
+        }[collection]
+        try:
+            if not get_ids():
+                return True
+            removed = clear()
+        except (FourHandsApiError, PlaywrightError) as e:
+            print(f"⚠️ API cleanup of {collection} failed, using UI: {e}")
+            return False
+        
+        self.page.reload(wait_until="domcontentloaded")
+        print(f"⚡ Removed {removed} {collection} line(s) via API")
+        return True
+    
     # ==================== Save for Later Actions ====================
     
     def click_save_for_later_from_cart(self) -> None:
         """Click 'Save for Later' button on first cart item."""
         print("💾 Saving item for later...")
+        count = self.page.locator(self.save_for_later_button).count()
         self.click_element(self.save_for_later_button)
-        self.page.wait_for_timeout(1500)  # Wait for animation
+        # Cart line leaves the cart list once the item is saved
+        self.waits.wait_for_count_change(self.save_for_later_button, count)
     
     def click_move_to_cart_from_saved(self) -> None:
         """Click 'Move to Cart' button on first saved item."""
         print("🛒 Moving saved item to cart...")
+        count = self.page.locator(self.move_to_cart_button).count()
         self.click_element(self.move_to_cart_button)
-        self.page.wait_for_timeout(1500)
+        self.waits.wait_for_count_change(self.move_to_cart_button, count)
     
     def click_move_all_to_cart(self) -> None:
         """Click 'Move All to Cart' button."""
         print("🛒 Moving all saved items to cart...")
         self.click_element(self.move_all_to_cart_button)
-        self.page.wait_for_timeout(2000)
+        self.waits.wait_for_count(self.move_to_cart_button, 0)
     
     def remove_all_saved_for_later(self) -> None:
         """Remove all items from Saved for Later."""
         print("🗑️ Removing all saved items...")
+        self._clear_via_api("saved_for_later")
+        
+        remove_buttons = self.page.locator(self.remove_from_saved_button)
         while True:
-            remove_buttons = self.page.locator(self.remove_from_saved_button).all()
+            count = remove_buttons.count()
             
-            if not remove_buttons or len(remove_buttons) == 0:
+            if count == 0:
                 break
             
-            remove_buttons[0].click()
-            self.page.wait_for_timeout(1000)
+            remove_buttons.first.click()
+            self.waits.wait_for_count_change(self.remove_from_saved_button, count)
         print("✅ Saved items cleared")
     
     def get_saved_for_later_count(self) -> int:
@@ -135,10 +203,9 @@ class FourHandsCartPage(BasePage):
             bool: True if Saved for Later has items
         """
         # Wait for section to appear
-        self.page.wait_for_timeout(1000)
-        
-        # Check if Saved for Later section is visible
-        if not self.is_visible(self.saved_for_later_section):
+        try:
+            self.wait_for_element_visible(self.saved_for_later_section)
+        except Exception:
             return False
         
         # Check if it has items
@@ -152,11 +219,8 @@ class FourHandsCartPage(BasePage):
         Returns:
             bool: True if empty
         """
-        # Check for empty message or zero items
-        has_empty_message = self.is_visible(self.saved_for_later_empty_message)
-        item_count = self.get_saved_for_later_count()
-        
-        return has_empty_message or item_count == 0
+        # Empty message or zero items, read together
+        return self.snapshot_cart().saved_for_later_empty
     
     # ==================== Cart Summary ====================
     
@@ -0,0 +1,166 @@
+"""
+FourHands cart test data setup.
+
+Puts the cart into a known state before a test through the storefront API,
+so tests start on the page under test instead of clicking through search,
+PDP and add-to-cart. Every API step is checked against the cart page
+(snapshot_cart) before it counts; the UI flow is the fallback when the API
+is unavailable or the page does not show the seeded state (and the only
+path under HAR record/replay, which API calls bypass).
+"""
+from typing import Callable, Iterable
+from urllib.parse import urlparse
+from playwright.sync_api import Page, Error as PlaywrightError
+from pages.fh_cart_page import CartSnapshot, FourHandsCartPage
+from pages.fh_product_detail_page import FourHandsProductDetailPage
+from pages.fh_top_navigation_page import FourHandsTopNavigationPage
+from configs.playwright_config import FH_BASE_URL, FH_CART_PAGE_PATH, FH_DATA_SETUP, FH_HAR_MODE
+from utils.fh_api import FourHandsCartApi, FourHandsApiError
+
+
+class FourHandsCartSetup:
+    """
+    Seeds cart and Saved for Later state for a test.
+
+    Usage:
+        setup = FourHandsCartSetup(page)
+        setup.reset()
+        setup.add_to_cart(["108422-001"])
+        cart = setup.open_cart()
+    """
+
+    def __init__(self, page: Page, api: FourHandsCartApi = None):
+        """
+        Initialize the setup helper.
+
+        Args:
+            page: Authenticated FourHands page
+            api: Cart API (defaults to one bound to the page's context)
+        """
+        self.page = page
+        self.api = api or FourHandsCartApi(page.context.request, base_url=self._base_url())
+        self.use_api = FH_DATA_SETUP == "api" and FH_HAR_MODE == "off"
+
+    def _base_url(self) -> str:
+        """Origin of the current page, or the configured storefront."""
+        parsed = urlparse(self.page.url)
+        if parsed.scheme in ("http", "https"):
+            return f"{parsed.scheme}://{parsed.netloc}"
+        return FH_BASE_URL.rstrip("/")
+
+    def _api_call(self, description: str, call, seeded: Callable[[CartSnapshot], bool]) -> bool:
+        """
+        Run an API setup step and check the cart page shows its result.
+
+        Args:
+            description: Step description for messages
+            call: API call doing the setup
+            seeded: Check of the cart page state after the call
+
+        Returns:
+            bool: True if the step ran and the cart page shows the seeded state;
+                False when it failed (the caller falls back to the UI)
+        """
+        if not self.use_api:
+            return False
+        try:
+            call()
+        except (FourHandsApiError, PlaywrightError) as e:
+            print(f"⚠️ API setup '{description}' failed, using UI: {e}")
+            return False
+
+        snapshot = self.open_cart().snapshot_cart()
+        if not seeded(snapshot):
+            print(f"⚠️ API setup '{description}' not reflected on the cart page, using UI "
+                  f"(cart: {snapshot.product_ids}, saved: {snapshot.saved_count})")
+            return False
+        print(f"⚡ {description} via API")
+        return True
+
+    def _clear_via_api(self) -> None:
+        """Clear both collections (each raises if anything is left)."""
+        self.api.clear_cart()
+        self.api.clear_saved_for_later()
+
+    # ==================== Setup Steps ====================
+
+    def reset(self) -> None:
+        """Empty the cart and Saved for Later."""
+        if self._api_call("Cleared cart and saved items", self._clear_via_api,
+                          lambda cart: cart.item_count == 0 and cart.saved_for_later_empty):
+            return
+
+        nav = FourHandsTopNavigationPage(self.page)
+        if nav.cart_bucket_check() == "cart":
+            cart = self.open_cart()
+            cart.remove_all_products()
+            cart.remove_all_saved_for_later()
+
+    def add_to_cart(self, skus: Iterable[str]) -> None:
+        """
+        Put products into the cart.
+
+        Args:
+            skus: Product SKUs
+        """
+        skus = list(skus)
+        if self._api_call(f"Added {len(skus)} product(s) to cart", lambda: self.api.add_products(skus),
+                          lambda cart: all(cart.has_product(sku) for sku in skus)):
+            return
+        self._add_to_cart_via_ui(skus)
+
+    def _add_to_cart_via_ui(self, skus: Iterable[str]) -> None:
+        """Add products through PDP and the Add to Cart button."""
+        pdp = FourHandsProductDetailPage(self.page)
+        nav = FourHandsTopNavigationPage(self.page)
+        for sku in skus:
+            pdp.navigate_to_product(sku)
+            nav.click_add_to_cart_button()
+            nav.click_dismiss_cart_banner()
+
+    def save_for_later(self, skus: Iterable[str]) -> None:
+        """
+        Put products into Saved for Later.
+
+        Args:
+            skus: Product SKUs
+        """
+        skus = list(skus)
+        if self._api_call(f"Saved {len(skus)} product(s) for later",
+                          lambda: self.api.seed_saved_for_later(skus),
+                          lambda cart: cart.saved_count >= len(skus)):
+            return
+
+        self._add_to_cart_via_ui(skus)
+        cart = self.open_cart()
+        for _ in skus:
+            cart.click_save_for_later_from_cart()
+
+    def set_shipping_address(self, address: dict) -> None:
+        """
+        Set the cart's shipping address (no UI fallback exists).
+
+        Args:
+            address: Address fields
+
+        Raises:
+            FourHandsApiError: If API setup is off or the storefront rejects the address
+        """
+        if not self.use_api:
+            raise FourHandsApiError("Address setup needs FH_DATA_SETUP=api outside HAR record/replay")
+        self.api.set_address(address, "shipping")
+        print("⚡ Set shipping address via API")
+
+    # ==================== Navigation ====================
+
+    def open_cart(self) -> FourHandsCartPage:
+        """
+        Navigate straight to the cart page.
+
+        Returns:
+            FourHandsCartPage: Loaded cart page
+        """
+        cart = FourHandsCartPage(self.page)
+        self.page.goto(f"{self._base_url()}{FH_CART_PAGE_PATH}", wait_until="domcontentloaded")
+        cart.assert_loaded()
+        return cart
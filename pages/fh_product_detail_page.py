@@ -3,10 +3,15 @@ FourHands Product Detail Page (PDP) object.
 """
 from playwright.sync_api import Page
 from pages.base_page import BasePage
+from pages.page_selectors import ProductDetailSelectors
 
 
-class FourHandsProductDetailPage(BasePage):
-    """Page object for FourHands Product Detail Page."""
+# Stepper updates are client-side; a value that hasn't changed by then is at its limit
+QUANTITY_CHANGE_TIMEOUT = 5000
+
+
+class FourHandsProductDetailPage(ProductDetailSelectors, BasePage):
+    """Page object for FourHands Product Detail Page (selectors in pages/page_selectors.py)."""
     
     def __init__(self, page: Page, timeout: int = 30000):
         """
@@ -17,15 +22,6 @@ class FourHandsProductDetailPage(BasePage):
             timeout: Default timeout in milliseconds
         """
         super().__init__(page, timeout)
-        
-        # Selectors
-        self.add_to_cart_button = "button:has-text('Add to Cart')"
-        self.quantity_input = "//input[@type='number' or contains(@class, 'quantity')]"
-        self.increment_button = "//button[contains(@aria-label, 'Increase') or contains(@class, 'increment')]"
-        self.decrement_button = "//button[contains(@aria-label, 'Decrease') or contains(@class, 'decrement')]"
-        self.product_title = "h1"
-        self.product_price = "text=/\$\d+/"
-        self.availability_message = "//div[contains(@class, 'availability') or contains(text(), 'Available') or contains(text(), 'Arriving')]"
     
     def assert_loaded(self) -> None:
         """Assert that PDP is loaded."""
@@ -66,9 +62,7 @@ class FourHandsProductDetailPage(BasePage):
         Args:
             num_clicks: Number of times to click increment
         """
-        for _ in range(num_clicks):
-            self.click_element(self.increment_button, wait_after=False)
-            self.page.wait_for_timeout(300)  # Small wait between clicks
+        self._click_quantity_button(self.increment_button, num_clicks)
     
     def click_decrement_button(self, num_clicks: int = 1) -> None:
         """
@@ -77,9 +71,27 @@ class FourHandsProductDetailPage(BasePage):
         Args:
             num_clicks: Number of times to click decrement
         """
+        self._click_quantity_button(self.decrement_button, num_clicks)
+    
+    def _click_quantity_button(self, button: str, num_clicks: int) -> None:
+        """
+        Click a quantity stepper button, waiting for the value to update after each click.
+        
+        Args:
+            button: Increment or decrement button selector
+            num_clicks: Number of clicks
+        """
+        quantity = self.page.locator(self.quantity_input).first
         for _ in range(num_clicks):
-            self.click_element(self.decrement_button, wait_after=False)
-            self.page.wait_for_timeout(300)
+            before = quantity.input_value()
+            self.click_element(button, wait_after=False)
+            try:
+                self.waits.wait_for_value_change(
+                    self.quantity_input, before, timeout=QUANTITY_CHANGE_TIMEOUT
+                )
+            except TimeoutError:
+                # Quantity is at its limit - further clicks won't change it
+                break
     
     def set_quantity(self, quantity: int) -> None:
         """
@@ -5,6 +5,22 @@ from playwright.sync_api import Page
 from pages.base_page import BasePage
 
 
+# True once the badge (XPath) shows different text, or the cart banner (XPath)
+# is visible when it was not before the cart action
+_CART_UPDATED_SCRIPT = """
+([badgeXpath, bannerXpath, previous, bannerWasVisible]) => {
+    const first = (xpath) => document.evaluate(
+        xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+    ).singleNodeValue;
+    const badge = first(badgeXpath);
+    if (badge && (badge.textContent || "").trim() !== previous) return true;
+    if (bannerWasVisible) return false;
+    const banner = first(bannerXpath);
+    return !!(banner && banner.getClientRects().length > 0);
+}
+"""
+
+
 class FourHandsTopNavigationPage(BasePage):
     """Page object for FourHands top navigation."""
     
@@ -23,7 +39,7 @@ class FourHandsTopNavigationPage(BasePage):
         self.search_input = "input[placeholder*='Search' i]"
         self.add_to_cart_button = "button:has-text('Add to Cart')"
         self.cart_bucket = "//a[contains(@href, '/cart')]//span[contains(@class, 'cart-count') or @class='badge']"
-        self.cart_banner = "//div[contains(@class, 'cart-banner') or contains(@class, 'notification')]"
+        self.cart_banner = "//div[contains(@class, 'cart-banner')]"
         self.dismiss_banner_button = "//button[contains(@aria-label, 'Close') or contains(@class, 'close')]"
         self.cart_link = "//a[contains(@href, '/cart') or text()='Cart']"
     
@@ -48,13 +64,40 @@ class FourHandsTopNavigationPage(BasePage):
         self.page.locator(self.search_input).first.press("Enter")
     
     def click_add_to_cart_button(self) -> None:
-        """Click Add to Cart button."""
+        """Click Add to Cart button and wait until the cart reflects it."""
+        previous = self._cart_badge_text_now()
+        banner_was_visible = self.is_visible(self.cart_banner)
+        
         self.click_element(self.add_to_cart_button)
+        self.wait_for_cart_updated(previous, banner_was_visible)
+    
+    def wait_for_cart_updated(self, previous_badge_text: str, banner_was_visible: bool = False) -> None:
+        """
+        Wait until the cart badge text changes or the cart banner appears.
+        
+        Both signals are checked inside the page in one round-trip. A banner
+        already showing before the action does not count.
+        
+        Args:
+            previous_badge_text: Badge text before the cart action
+            banner_was_visible: Whether the cart banner was visible before the action
+        """
+        self.waits.wait_for_js_condition(
+            _CART_UPDATED_SCRIPT,
+            arg=[self.cart_bucket, self.cart_banner, previous_badge_text, banner_was_visible]
+        )
     
     def click_cart_bucket(self) -> None:
         """Click cart icon/bucket."""
         self.click_element(self.cart_link)
     
+    def _cart_badge_text_now(self) -> str:
+        """Read the cart badge text without waiting for it to appear."""
+        badge = self.page.locator(self.cart_bucket)
+        if badge.count() == 0:
+            return ""
+        return (badge.first.text_content() or "").strip()
+    
     def get_cart_bucket_text(self) -> str:
         """
         Get cart count from cart bucket.
@@ -82,6 +125,8 @@ class FourHandsTopNavigationPage(BasePage):
         try:
             if self.is_visible(self.cart_banner):
                 self.click_element(self.dismiss_banner_button, wait_after=False)
-                self.page.wait_for_timeout(500)
+                self.page.locator(self.cart_banner).first.wait_for(
+                    state="hidden", timeout=self.timeout
+                )
         except Exception:
             pass  # Banner not present or already dismissed
@@ -0,0 +1,84 @@
+"""
+Selector definitions shared by the sync page objects and their async twins
+(pages/aio). Each page object mixes in its selector class, so a selector is
+defined once and read as self.<name> in both layers.
+"""
+from utils.snapshot import Field, parse_price
+
+
+class CartSelectors:
+    """FourHands cart page."""
+
+    # Main cart selectors
+    shopping_cart_title = "//h1[text()='Shopping Cart']"
+    proceed_to_checkout_button = "//button[text()='Proceed to Checkout']"
+    cart_empty_text = "//div[@class='text-body-xl mb-f10 text-neutral-50']"
+    cart_products = "//img[contains(@src,'cloudfront.net/image/')]"
+    cart_item_prices = "//div[@class='text-f-base-2xl md:w-[6.5em] md:min-w-min md:text-right']"
+    cart_product_ids = "//div[contains(@class,'truncate')]//span"
+    summary_subtotal = "//div[@class='flex items-center justify-between']//span[contains(text(), '$')]"
+    summary_total = "//div[@class='text-f-lg-3xl']"
+
+    # Cart action buttons
+    remove_button = "//button[@type='button'][normalize-space()='Remove']"
+    save_for_later_button = "//button[text()='Save for Later']"
+
+    # Saved for Later selectors
+    saved_for_later_section = "//div[contains(@class, 'saved-for-later') or .//h2[contains(text(), 'Saved for Later')]]"
+    saved_for_later_title = "//h2[contains(text(), 'Saved for Later')]"
+    saved_for_later_empty_message = "//p[contains(text(), 'No saved items') or contains(text(), 'saved for later is empty')]"
+    saved_for_later_items = "//div[contains(@class, 'saved-item')]"
+    move_to_cart_button = "//button[text()='Move to Cart']"
+    move_all_to_cart_button = "//button[text()='Move All to Cart']"
+    remove_from_saved_button = "//button[contains(text(), 'Remove')]"
+
+    # Everything the cart assertions read, fetched by one evaluate (CartSnapshot)
+    cart_schema = {
+        "loaded": Field(shopping_cart_title, "visible"),
+        "empty_message": Field(cart_empty_text, "visible"),
+        "item_count": Field(cart_products, "count"),
+        "product_ids": Field(cart_product_ids, many=True),
+        "item_prices": Field(cart_item_prices, many=True, convert=parse_price),
+        "subtotal": Field(summary_subtotal),
+        "total": Field(summary_total),
+        "saved_section": Field(saved_for_later_section, "visible"),
+        "saved_count": Field(saved_for_later_items, "count"),
+        "saved_empty_message": Field(saved_for_later_empty_message, "visible"),
+    }
+
+
+class ProductDetailSelectors:
+    """FourHands product detail page."""
+
+    add_to_cart_button = "button:has-text('Add to Cart')"
+    quantity_input = "//input[@type='number' or contains(@class, 'quantity')]"
+    increment_button = "//button[contains(@aria-label, 'Increase') or contains(@class, 'increment')]"
+    decrement_button = "//button[contains(@aria-label, 'Decrease') or contains(@class, 'decrement')]"
+    product_title = "h1"
+    product_price = r"text=/\$\d+/"
+    availability_message = "//div[contains(@class, 'availability') or contains(text(), 'Available') or contains(text(), 'Arriving')]"
+
+
+class D365SalesOrderSelectors:
+    """D365 All sales orders list and the new sales order dialog."""
+
+    # Navigation labels (use with get_by_label)
+    nav_expand_label = "Expand the navigation pane"
+    modules_label = "Modules"
+
+    # Treeitem names (use with get_by_role)
+    accounts_receivable_name = "Accounts receivable"
+
+    # Text labels (use with get_by_text)
+    all_sales_orders_text = "All sales orders"
+
+    # Button names (use with get_by_role)
+    new_button_name = "New"
+    ok_button_name = "OK"
+
+    # Form field IDs (use with locator)
+    customer_account_id = "#SalesCreateOrder_5_SalesTable_CustAccount"
+    delivery_mode_id = "#SalesCreateOrder_5_SalesTable_DlvMode"
+    item_number_id = "#SalesLine_ItemId_2023_0_0"
+    customer_account_input = f"{customer_account_id} input"
+    delivery_mode_input = f"{delivery_mode_id} input"
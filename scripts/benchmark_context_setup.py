@@ -0,0 +1,91 @@
+"""
+Benchmark per-test browser context setup: fresh contexts vs the worker pool.
+
+Simulates the fixture lifecycle of one test (context + trace chunk + page, then
+teardown) and reports setup/teardown latency for both CONTEXT_MODE values.
+
+Usage:
+    python scripts/benchmark_context_setup.py
+    python scripts/benchmark_context_setup.py --iterations 50 --storage-state storage_state/fh_auth.json
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from playwright.sync_api import sync_playwright
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from configs.playwright_config import get_browser_launch_options, CONTEXT_POOL_SIZE  # noqa: E402
+from utils.context_pool import ContextPool, open_context, close_context  # noqa: E402
+from utils.capture import ensure_tracing  # noqa: E402
+
+
+def run_lifecycle(browser, pool, options: dict, iterations: int) -> dict:
+    """Run the fixture lifecycle and collect setup/teardown timings in ms."""
+    setup_ms, teardown_ms = [], []
+
+    for _ in range(iterations):
+        start = time.perf_counter()
+        context = open_context(browser, pool, "bench", options)
+        ensure_tracing(context)
+        context.tracing.start_chunk()
+        page = context.new_page()
+        page.set_content("<h1>benchmark</h1>")
+        setup_ms.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        page.close()
+        context.tracing.stop_chunk()
+        close_context(context, pool)
+        teardown_ms.append((time.perf_counter() - start) * 1000)
+
+    return {"setup": setup_ms, "teardown": teardown_ms}
+
+
+def summarize(label: str, timings: dict) -> None:
+    """Print median/p95 for a timing series."""
+    for phase, values in timings.items():
+        ordered = sorted(values)
+        p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+        print(f"  {label:<6} {phase:<9} median={statistics.median(values):8.1f} ms   "
+              f"p95={p95:8.1f} ms   total={sum(values):9.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Context setup latency benchmark")
+    parser.add_argument("--iterations", type=int, default=20, help="Simulated tests per mode")
+    parser.add_argument("--pool-size", type=int, default=CONTEXT_POOL_SIZE, help="Contexts per pool group")
+    parser.add_argument("--storage-state", default=None, help="Optional storage state to load")
+    args = parser.parse_args()
+
+    options = {"viewport": {"width": 1920, "height": 1080}}
+    if args.storage_state:
+        options["storage_state"] = args.storage_state
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(**get_browser_launch_options())
+
+        fresh = run_lifecycle(browser, None, options, args.iterations)
+
+        pool = ContextPool(browser, size=args.pool_size)
+        pooled = run_lifecycle(browser, pool, options, args.iterations)
+        pool.close()
+
+        browser.close()
+
+    print("\n" + "=" * 70)
+    print(f"CONTEXT SETUP BENCHMARK ({args.iterations} simulated tests per mode)")
+    print("=" * 70)
+    summarize("fresh", fresh)
+    summarize("pool", pooled)
+
+    saved = statistics.median(fresh["setup"]) - statistics.median(pooled["setup"])
+    print(f"\n  Median setup saved per test with pool: {saved:.1f} ms")
+    print("=" * 70 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark JUnit parsing: full ElementTree walk vs the streaming parser.
+
+Generates a synthetic JUnit XML (nested testsuites, as produced when xdist
+reports are merged) and compares wall time, peak Python memory and the
+number of results returned.
+
+Usage:
+    python scripts/benchmark_junit_parser.py
+    python scripts/benchmark_junit_parser.py --testcases 100000 --keep
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from xml.sax.saxutils import quoteattr
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.jira_integration import JiraZephyrIntegration  # noqa: E402
+
+
+def generate_junit(path: str, testcases: int, workers: int = 8) -> None:
+    """
+    Write a synthetic JUnit file: one outer suite per xdist worker holding a nested suite.
+
+    Every 10th test fails, every 25th is skipped and every test carries a
+    jira_test_case property like conftest_jira.py writes.
+    """
+    per_worker = testcases // workers
+    with open(path, "w") as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n<testsuites>\n')
+        n = 0
+        for worker in range(workers):
+            count = per_worker if worker < workers - 1 else testcases - n
+            f.write(f'<testsuite name="gw{worker}" tests="{count}">\n')
+            f.write(f'<testsuite name="tests.fh.gw{worker}" tests="{count}">\n')
+            for _ in range(count):
+                n += 1
+                f.write(
+                    f'<testcase classname="tests.fh.test_module_{n % 50}" '
+                    f'name="test_case_{n}" time="{(n % 97) / 10:.3f}">'
+                    f'<properties><property name="jira_test_case" value="FH-T{n}"/></properties>'
+                )
+                if n % 10 == 0:
+                    f.write(f'<failure message={quoteattr("AssertionError: expected cart count " + str(n))}>'
+                            f'Traceback (most recent call last): ...</failure>')
+                elif n % 25 == 0:
+                    f.write('<skipped message="skipped"/>')
+                f.write('</testcase>\n')
+            f.write('</testsuite>\n</testsuite>\n')
+        f.write('</testsuites>\n')
+
+
+def legacy_parse(junit_file: str) -> list:
+    """Previous implementation: full tree, nested suite walk."""
+    root = ET.parse(junit_file).getroot()
+    results = []
+    for testsuite in root.findall('.//testsuite'):
+        for testcase in testsuite.findall('.//testcase'):
+            failure = testcase.find('failure')
+            error = testcase.find('error')
+            skipped = testcase.find('skipped')
+            if failure is not None:
+                status = 'FAIL'
+            elif error is not None:
+                status = 'FAIL'
+            elif skipped is not None:
+                status = 'BLOCKED'
+            else:
+                status = 'PASS'
+            results.append({'test_name': testcase.get('name'), 'status': status})
+    return results
+
+
+def measure(label: str, func) -> None:
+    """Run func twice: once for wall time, once under tracemalloc for peak memory."""
+    start = time.perf_counter()
+    count = func()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<10} {elapsed:7.2f} s   peak={peak / 1024 / 1024:8.1f} MiB   results={count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JUnit parser benchmark")
+    parser.add_argument("--testcases", type=int, default=100000, help="Synthetic testcases")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated XML file")
+    args = parser.parse_args()
+
+    fd, junit_file = tempfile.mkstemp(suffix=".xml", prefix="junit-bench-")
+    os.close(fd)
+
+    try:
+        generate_junit(junit_file, args.testcases)
+        size_mb = os.path.getsize(junit_file) / 1024 / 1024
+
+        integration = JiraZephyrIntegration()
+
+        print("\n" + "=" * 70)
+        print(f"JUNIT PARSER BENCHMARK ({args.testcases} testcases, {size_mb:.1f} MiB)")
+        print("=" * 70)
+        measure("legacy", lambda: len(legacy_parse(junit_file)))
+        measure("streaming", lambda: sum(1 for _ in integration.iter_junit_results(junit_file)))
+        print("=" * 70 + "\n")
+    finally:
+        if args.keep:
+            print(f"XML kept at {junit_file}")
+        else:
+            os.remove(junit_file)
+
+
+if __name__ == "__main__":
+    main()
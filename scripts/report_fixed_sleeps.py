@@ -0,0 +1,138 @@
+"""
+Report fixed sleeps (wait_for_timeout / time.sleep) reached by FourHands tests.
+
+For every test in tests/fh the script sums constant sleeps written directly
+in the test plus the sleeps inside page-object methods it calls (one call =
+one pass through the method; loops are counted once). Comparing against a
+git ref shows how much fixed sleep time a change removed.
+
+Usage:
+    python scripts/report_fixed_sleeps.py
+    python scripts/report_fixed_sleeps.py --base HEAD~1
+"""
+import argparse
+import ast
+import subprocess
+from pathlib import Path
+from typing import Dict, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+PAGES_DIR = "pages"
+TESTS_DIR = "tests/fh"
+
+
+def read_source(path: str, ref: Optional[str]) -> Optional[str]:
+    """Read a file from the working tree or from a git ref."""
+    if ref is None:
+        file_path = PROJECT_ROOT / path
+        return file_path.read_text() if file_path.exists() else None
+    result = subprocess.run(
+        ["git", "show", f"{ref}:{path}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+    return result.stdout if result.returncode == 0 else None
+
+
+def list_files(directory: str, ref: Optional[str]) -> list:
+    """List Python files in a directory of the working tree or a git ref."""
+    if ref is None:
+        return sorted(
+            str(p.relative_to(PROJECT_ROOT)) for p in (PROJECT_ROOT / directory).rglob("*.py")
+        )
+    result = subprocess.run(
+        ["git", "ls-tree", "-r", "--name-only", ref, directory],
+        cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+    return sorted(f for f in result.stdout.splitlines() if f.endswith(".py"))
+
+
+def sleep_ms(node: ast.Call) -> int:
+    """Return the constant sleep duration of a call in ms, or 0."""
+    func = node.func
+    name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", "")
+    if not node.args or not isinstance(node.args[0], ast.Constant):
+        return 0
+    value = node.args[0].value
+    if not isinstance(value, (int, float)):
+        return 0
+    if name == "wait_for_timeout":
+        return int(value)
+    if name == "sleep":
+        return int(value * 1000)
+    return 0
+
+
+def direct_sleeps(func: ast.FunctionDef) -> int:
+    """Sum constant sleeps written directly in a function body."""
+    return sum(sleep_ms(n) for n in ast.walk(func) if isinstance(n, ast.Call))
+
+
+def page_method_sleeps(ref: Optional[str]) -> Dict[str, int]:
+    """Map page-object method name -> fixed sleep ms inside it."""
+    sleeps: Dict[str, int] = {}
+    for path in list_files(PAGES_DIR, ref):
+        source = read_source(path, ref)
+        if not source:
+            continue
+        for node in ast.walk(ast.parse(source)):
+            if isinstance(node, ast.ClassDef):
+                for item in node.body:
+                    if isinstance(item, ast.FunctionDef):
+                        ms = direct_sleeps(item)
+                        if ms:
+                            sleeps[item.name] = max(sleeps.get(item.name, 0), ms)
+    return sleeps
+
+
+def test_sleeps(ref: Optional[str]) -> Dict[str, int]:
+    """Map test node id -> fixed sleep ms reached by the test."""
+    methods = page_method_sleeps(ref)
+    results: Dict[str, int] = {}
+    for path in list_files(TESTS_DIR, ref):
+        source = read_source(path, ref)
+        if not source:
+            continue
+        for node in ast.parse(source).body:
+            if isinstance(node, ast.FunctionDef) and node.name.startswith("test_"):
+                total = 0
+                for call in ast.walk(node):
+                    if not isinstance(call, ast.Call):
+                        continue
+                    total += sleep_ms(call)
+                    if isinstance(call.func, ast.Attribute):
+                        total += methods.get(call.func.attr, 0)
+                results[f"{path}::{node.name}"] = total
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fixed sleep report for tests/fh")
+    parser.add_argument("--base", default=None, help="Git ref to compare against (e.g. HEAD~1)")
+    args = parser.parse_args()
+
+    current = test_sleeps(None)
+    base = test_sleeps(args.base) if args.base else None
+
+    print("\n" + "=" * 90)
+    print("FIXED SLEEPS REACHED BY tests/fh")
+    print("=" * 90)
+
+    for test_id in sorted(current):
+        now = current[test_id]
+        before = base.get(test_id, now) if base is not None else now
+        if now or before:
+            delta = f"  (was {before} ms, -{before - now} ms)" if base is not None and before != now else ""
+            print(f"  {now:>6} ms  {test_id}{delta}")
+
+    total_now = sum(current.values())
+    print("-" * 90)
+    print(f"  Total now: {total_now} ms")
+    if base is not None:
+        total_before = sum(base.get(t, 0) for t in current)
+        print(f"  Total at {args.base}: {total_before} ms")
+        print(f"  Removed: {total_before - total_now} ms per full tests/fh run")
+    print("=" * 90 + "\n")
+
+
+if __name__ == "__main__":
+    main()
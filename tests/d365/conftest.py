@@ -2,8 +2,15 @@
 Conftest for D365 tests with BrowserStack support.
 """
 import pytest
+import allure
+import requests
+from typing import Optional
 from playwright.sync_api import Page, BrowserContext
-from pathlib import Path
+from configs.playwright_config import D365_DEFAULT_CUSTOMER
+from utils.auth_helper import get_d365_session_cache
+from utils.session_cache import SessionCache
+from utils.d365_odata import D365DataFactory, D365ODataClient, D365ODataError
+from utils.d365_navigation import reset_navigation_stats
 import os
 
 
@@ -13,26 +20,36 @@ def is_browserstack():
     return os.getenv("BROWSERSTACK_BUILD_NAME") is not None or os.getenv("BROWSERSTACK_LOCAL") is not None
 
 
+@pytest.fixture(scope="session")
+def d365_session_cache() -> SessionCache:
+    """
+    Provide the D365 session cache.
+    
+    The storage state is logged in once per run (under a file lock, so
+    xdist workers share it) and refreshed before its cookies/tokens expire.
+    """
+    cache = get_d365_session_cache()
+    if not cache.is_valid() and not (os.getenv("D365_USERNAME") and os.getenv("D365_PASSWORD")):
+        print("\n⚠️  No valid D365 session and D365_USERNAME/D365_PASSWORD not set")
+        print("   Set these environment variables to run authenticated tests on BrowserStack")
+    return cache
+
+
 @pytest.fixture
-def d365_authenticated_context(playwright_browser):
+def d365_authenticated_context(playwright_browser, d365_session_cache: SessionCache):
     """
     Provide D365 authenticated context.
     
-    - Locally: Uses storage state (faster)
-    - BrowserStack: Uses programmatic login (works on cloud)
+    Locally and on BrowserStack the context loads the cached session; the
+    cache only logs in when the session is missing or about to expire.
     """
-    storage_path = Path("storage_state/d365_session.json")
+    storage_state = d365_session_cache.ensure(playwright_browser)
     
-    # On BrowserStack, create fresh context (will login programmatically)
-    if is_browserstack():
-        print("\n🌐 Running on BrowserStack - will login programmatically")
-        context = playwright_browser.new_context()
-    # Locally, use storage state if available
-    elif storage_path.exists():
-        print("\n💾 Using local storage state")
-        context = playwright_browser.new_context(storage_state=str(storage_path))
+    if storage_state:
+        print("\n💾 Using cached D365 session")
+        context = playwright_browser.new_context(storage_state=storage_state)
     else:
-        print("\n⚠️  No storage state found - will need to login")
+        print("\n⚠️  No D365 session available - tests will see the login page")
         context = playwright_browser.new_context()
     
     yield context
@@ -40,33 +57,78 @@ def d365_authenticated_context(playwright_browser):
 
 
 @pytest.fixture
-def d365_authenticated_page(d365_authenticated_context):
+def d365_authenticated_page(d365_authenticated_context: BrowserContext) -> Page:
+    """Provide authenticated D365 page."""
+    page = d365_authenticated_context.new_page()
+    yield page
+    page.close()
+
+
+@pytest.fixture
+def d365_data_factory(playwright_browser, d365_session_cache: SessionCache) -> D365DataFactory:
     """
-    Provide authenticated D365 page.
+    Provide the OData data factory; everything it creates is deleted after the test.
     
-    Automatically handles login if needed.
+    Uses the bearer token of the cached D365 session (or D365_ACCESS_TOKEN /
+    client credentials), so preconditions are created without the UI.
     """
-    from utils.auth_helper import D365Auth
+    factory = _open_data_factory(playwright_browser, d365_session_cache)
+    if factory is None:
+        pytest.skip("D365 OData unavailable")
     
-    page = d365_authenticated_context.new_page()
+    yield factory
+    factory.cleanup()
+
+
+@pytest.fixture
+def d365_customer_account(playwright_browser, d365_session_cache: SessionCache) -> str:
+    """
+    Provide a customer account for order tests.
     
-    # On BrowserStack or when no storage state, login programmatically
-    if is_browserstack() or not Path("storage_state/d365_session.json").exists():
-        auth = D365Auth(page)
-        
-        # Get credentials from environment
-        username = os.getenv("D365_USERNAME")
-        password = os.getenv("D365_PASSWORD")
-        
-        if username and password:
-            try:
-                auth.login(username, password)
-            except Exception as e:
-                print(f"⚠️  Login failed: {e}")
-                print("   Tests requiring authentication will be skipped")
-        else:
-            print("⚠️  D365_USERNAME and D365_PASSWORD not set")
-            print("   Set these environment variables to run authenticated tests on BrowserStack")
+    A fresh customer is created via OData (and deleted after the test);
+    without OData access the existing D365_DEFAULT_CUSTOMER is used, so
+    the test still runs. A failing create (missing permission, bad request,
+    network error) falls back the same way.
+    """
+    factory = _open_data_factory(playwright_browser, d365_session_cache)
+    customer_account = None
+    if factory is not None:
+        try:
+            customer_account = factory.create_customer()["CustomerAccount"]
+        except (D365ODataError, requests.RequestException) as e:
+            print(f"\n⚠️  Could not create a D365 customer: {e}")
     
-    yield page
-    page.close()
+    if customer_account is None:
+        print(f"\n⚠️  Using existing customer {D365_DEFAULT_CUSTOMER}")
+        customer_account = D365_DEFAULT_CUSTOMER
+    
+    try:
+        yield customer_account
+    finally:
+        if factory is not None:
+            factory.cleanup()
+
+
+def _open_data_factory(playwright_browser, d365_session_cache: SessionCache) -> Optional[D365DataFactory]:
+    """OData data factory for the cached session, or None when OData is unavailable."""
+    storage_state = d365_session_cache.ensure(playwright_browser)
+    try:
+        client = D365ODataClient.from_env(storage_state=storage_state)
+    except (D365ODataError, requests.RequestException) as e:
+        print(f"\n⚠️  D365 OData unavailable: {e}")
+        return None
+    return D365DataFactory(client)
+
+
+@pytest.fixture(autouse=True)
+def d365_navigation_report(request):
+    """Report deep-link navigations and the time they saved for each test."""
+    reset_navigation_stats()
+    yield
+    stats = reset_navigation_stats()
+    if not (stats.deep_links or stats.menu_clicks):
+        return
+    
+    request.node.user_properties.append(("d365_nav_seconds_saved", round(stats.seconds_saved, 1)))
+    print(f"\n🧭 Navigation: {stats.summary()}")
+    allure.attach("\n".join(stats.events), name="d365-navigation", attachment_type=allure.attachment_type.TEXT)
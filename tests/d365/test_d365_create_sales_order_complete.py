@@ -5,6 +5,7 @@ Based on Playwright Codegen recording
 import pytest
 import allure
 from playwright.sync_api import Page
+from pages.d365.sales_order_page import D365SalesOrderPage
 
 
 pytestmark = [pytest.mark.d365, pytest.mark.e2e]
@@ -14,16 +15,18 @@ pytestmark = [pytest.mark.d365, pytest.mark.e2e]
 @allure.story("Sales Order Creation")
 @allure.title("Create Sales Order - Complete Flow")
 @pytest.mark.e2e
-def test_d365_create_sales_order_complete(d365_authenticated_page: Page):
+def test_d365_create_sales_order_complete(d365_authenticated_page: Page, d365_customer_account: str):
     """
     Test: Create a complete sales order in D365
     
     Steps from Playwright Codegen:
+    0. Setup: create a test customer via OData (deleted afterwards), or use
+       the existing D365_DEFAULT_CUSTOMER when OData is unavailable
     1. Navigate to D365 Dashboard
-    2. Expand navigation pane
-    3. Go to Modules → Accounts Receivable → Orders → All Sales Orders
+    2-3. Open All Sales Orders (deep link once the menu item is cached,
+         otherwise Modules → Accounts Receivable → All Sales Orders)
     4. Click New
-    5. Select Customer: 100001 (Nicole Roby Designs)
+    5. Select the test customer
     6. Select Delivery Mode: TXQA-B2B
     7. Click OK
     8. Select Item (opens item picker)
@@ -35,52 +38,25 @@ def test_d365_create_sales_order_complete(d365_authenticated_page: Page):
     """
     page = d365_authenticated_page
     
+    customer_account = d365_customer_account
+    
     with allure.step("Navigate to D365 Dashboard"):
         print("\n📍 Navigating to D365...")
         page.goto("https://fourhands-test.sandbox.operations.dynamics.com/?cmp=FH&mi=DefaultDashboard")
         page.wait_for_load_state("domcontentloaded")
         page.wait_for_timeout(3000)  # Wait for D365 to settle
     
-    with allure.step("Expand navigation pane"):
-        print("📂 Expanding navigation...")
-        page.get_by_role("button", name="Expand the navigation pane").click()
-        page.wait_for_timeout(1000)
-    
-    with allure.step("Navigate to Modules"):
-        print("🔍 Navigating to Modules...")
-        page.get_by_role("treeitem", name="Modules").click()
-        page.wait_for_timeout(1000)
-    
-    with allure.step("Navigate to Accounts Receivable"):
-        print("💰 Opening Accounts Receivable...")
-        page.get_by_role("treeitem", name="Accounts receivable").click()
-        page.wait_for_timeout(1000)
-    
-    with allure.step("Navigate to Orders"):
-        print("📋 Opening Orders...")
-        page.get_by_role("treeitem", name="Orders").click()
-        page.wait_for_timeout(1000)
-    
     with allure.step("Open All Sales Orders"):
         print("📄 Opening All Sales Orders...")
-        page.get_by_text("All sales orders").click()
-        page.wait_for_load_state("domcontentloaded")
-        page.wait_for_timeout(2000)
+        D365SalesOrderPage(page).navigate_to_sales_orders()
     
     with allure.step("Click New to create order"):
         print("➕ Creating new sales order...")
         page.get_by_role("button", name=" New").click()
         page.wait_for_timeout(2000)
     
-    with allure.step("Select Customer: 100001"):
-        print("👤 Selecting customer...")
-        # Click customer dropdown
-        page.locator("#SalesCreateOrder_5_SalesTable_CustAccount div").nth(1).click()
-        page.wait_for_timeout(1000)
-        
-        # Select customer from grid
-        page.get_by_role("row", name="100001 Nicole Roby Designs").get_by_label("Name", exact=True).click()
-        page.wait_for_timeout(1000)
+    with allure.step(f"Select Customer: {customer_account}"):
+        D365SalesOrderPage(page).select_customer(customer_account)
     
     with allure.step("Select Delivery Mode: TXQA-B2B"):
         print("🚚 Selecting delivery mode...")
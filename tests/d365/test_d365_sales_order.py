@@ -157,19 +157,20 @@ def test_d365_navigate_to_sales_orders(d365_authenticated_page: Page):
 @allure.story("Sales Order Creation")
 @allure.title("Create Sales Order")
 @pytest.mark.e2e
-def test_d365_create_sales_order(d365_authenticated_page: Page):
+def test_d365_create_sales_order(d365_authenticated_page: Page, d365_customer_account: str):
     """
     Test: Create a new sales order in D365
     
     Note: Requires authentication. Skips on BrowserStack.
     
     Steps:
-        1. Navigate to Sales Orders
-        2. Create new order
-        3. Select customer
-        4. Select delivery mode
-        5. Add item
-        6. Cancel order (cleanup)
+        1. Create a test customer (OData; existing customer without OData access)
+        2. Navigate to Sales Orders
+        3. Create new order
+        4. Select customer
+        5. Select delivery mode
+        6. Add item
+        7. Cancel order (cleanup; the customer and any saved order are deleted via OData)
     """
     page = d365_authenticated_page
     
@@ -177,6 +178,8 @@ def test_d365_create_sales_order(d365_authenticated_page: Page):
     if is_browserstack():
         pytest.skip("Skipping authenticated test on BrowserStack")
     
+    customer_account = d365_customer_account
+    
     sales_order_page = D365SalesOrderPage(page)
     
     with allure.step("Navigate to Sales Orders"):
@@ -187,8 +190,8 @@ def test_d365_create_sales_order(d365_authenticated_page: Page):
     with allure.step("Create new sales order"):
         sales_order_page.click_new_sales_order()
     
-    with allure.step("Select customer: 100001"):
-        sales_order_page.select_customer("100001")
+    with allure.step(f"Select customer: {customer_account}"):
+        sales_order_page.select_customer(customer_account)
     
     with allure.step("Select delivery mode: ZEFL-B2B"):
         sales_order_page.select_delivery_mode("ZEFL-B2B")
@@ -1,10 +1,28 @@
 """
 FourHands test fixtures and configuration.
 """
+import os
 import pytest
-from playwright.sync_api import Page, BrowserContext
+import allure
+from contextlib import ExitStack
+from playwright.sync_api import Page, BrowserContext, Error as PlaywrightError
 from pathlib import Path
-from configs.playwright_config import get_context_options
+from configs.playwright_config import (
+    get_context_options,
+    FH_BASE_URL,
+    FH_ACCOUNT_LEASE,
+    FH_CART_CLEANUP,
+    FH_HAR_MODE,
+    FH_HAR_MISSING
+)
+from utils.context_pool import open_context, close_context
+from utils.capture import get_capture_policy, is_retry
+from utils.har import get_har_policy, RECORD, REPLAY
+from pages.fh_cart_setup import FourHandsCartSetup
+from utils.routing import apply_routing, apply_routing_async, remove_routing, get_item_routing_profile, RouteStats
+from utils.lazy import LazyProxy
+from utils.account_pool import Account, AccountLease, AccountPool, get_fh_account_pool, reset_cart
+from utils.fh_api import FourHandsApiError
 
 
 @pytest.fixture
@@ -40,42 +58,250 @@ def fh_storage_state_path() -> Path:
     return Path("storage_state/fh_auth.json")
 
 
+@pytest.fixture(scope="session")
+def fh_account_pool() -> AccountPool:
+    """
+    Provide the FourHands account pool (FH_ACCOUNTS_FILE, else the shared account).
+    
+    Returns:
+        AccountPool: Account pool
+    """
+    return get_fh_account_pool()
+
+
+@pytest.fixture(scope="session")
+def fh_account_lease_scope(fh_account_pool: AccountPool) -> str:
+    """
+    Provide the lease scope: FH_ACCOUNT_LEASE, or 'test' when there are more workers than accounts.
+    
+    Returns:
+        str: 'worker' or 'test'
+    """
+    workers = int(os.getenv("PYTEST_XDIST_WORKER_COUNT", "1"))
+    return fh_account_pool.lease_scope(FH_ACCOUNT_LEASE, workers)
+
+
+@pytest.fixture(scope="session")
+def fh_worker_account(playwright, fh_account_pool: AccountPool) -> AccountLease:
+    """
+    Lease one account for the whole worker (lease scope 'worker').
+    
+    Args:
+        playwright: Playwright instance (cart reset on release)
+        fh_account_pool: Account pool
+    
+    Yields:
+        AccountLease: The worker's lease
+    """
+    lease = fh_account_pool.lease(os.getenv("PYTEST_XDIST_WORKER", "main"))
+    yield lease
+    _release_account(playwright, lease)
+
+
+def _lease_account(request, pool: AccountPool, teardown: ExitStack) -> Account:
+    """
+    Account for this test: the worker's lease, or a lease of its own (lease scope 'test').
+    
+    A per-test lease is released on the context's exit stack, after the
+    context has closed, and the account's cart is reset on release.
+    """
+    if pool.shared:
+        return pool.accounts[0]
+    
+    if request.getfixturevalue("fh_account_lease_scope") == "worker":
+        return request.getfixturevalue("fh_worker_account").account
+    
+    playwright = request.getfixturevalue("playwright")
+    lease = pool.lease(f"{os.getenv('PYTEST_XDIST_WORKER', 'main')} {request.node.name}")
+    teardown.callback(_release_account, playwright, lease)
+    return lease.account
+
+
+def _release_account(playwright, lease: AccountLease) -> None:
+    """
+    Reset the leased account's cart (storefront API) and free the account.
+    
+    A failed reset errors the teardown, so a dirty cart handed to the next
+    lessee shows up in the report instead of in a confusing test failure.
+    """
+    try:
+        # API calls bypass HAR replay
+        if FH_CART_CLEANUP == "api" and FH_HAR_MODE == "off":
+            if reset_cart(playwright, lease.account):
+                print(f"🧹 Cart of FH account {lease.account.name} reset")
+    except (FourHandsApiError, PlaywrightError) as e:
+        pytest.fail(f"Cart reset for FH account {lease.account.name} failed: {e}")
+    finally:
+        lease.release()
+
+
 @pytest.fixture
-def fh_authenticated_context(playwright_browser, fh_storage_state_path) -> BrowserContext:
+def fh_authenticated_context(request) -> BrowserContext:
     """
     Provide authenticated FourHands context.
     
+    The context is a lazy proxy: the browser, context pool and context
+    (with routing, HAR, tracing and video) are set up on first use, so
+    tests that never touch it cost nothing.
+    
+    The account (and its storage state) is leased from the account pool,
+    so parallel workers never share a cart.
+    
     Args:
-        playwright_browser: Browser instance from conftest
-        fh_storage_state_path: Path to auth storage
+        request: pytest request (capture policy needs the test outcome)
         
     Yields:
         BrowserContext: Authenticated context
     """
-    if not fh_storage_state_path.exists():
-        pytest.skip(f"FH auth not found at {fh_storage_state_path}. Run scripts/save_fh_auth.py")
+    with ExitStack() as teardown:
+        yield LazyProxy(
+            lambda: _open_fh_context(request, teardown),
+            "fh_authenticated_context"
+        )
+
+
+def _open_fh_context(request, teardown: ExitStack) -> BrowserContext:
+    """Open the FH context and register its teardown on the fixture's exit stack."""
+    har = get_har_policy()
+    
+    # Leased only now, so untouched tests hold no account
+    pool = request.getfixturevalue("fh_account_pool")
+    account = _lease_account(request, pool, teardown)
+    request.node.user_properties.append(("fh_account", account.name))
+    
+    # Replayed traffic needs no live session
+    if not pool.has_session(account) and har.mode != REPLAY:
+        pytest.skip(f"FH auth not found at {account.storage_state}. Run scripts/save_fh_auth.py")
+    
+    policy = get_capture_policy()
+    context_options = get_context_options()
+    
+    # Add video recording when the capture policy may keep it
+    context_options.update(policy.video_options(is_retry(request.node)))
+    
+    # Requested only now, so untouched tests never launch the browser; the HAR
+    # is written when the context closes, so recording bypasses the pool
+    playwright_browser = request.getfixturevalue("playwright_browser")
+    context_pool = None if har.mode == RECORD else request.getfixturevalue("context_pool")
+    
+    storage_state = pool.storage_state(account, playwright_browser)
+    if storage_state:
+        context_options['storage_state'] = storage_state
+    elif har.mode != REPLAY:
+        pytest.skip(f"No FH session for account {account.name}")
+    
+    # Pooled contexts keep their storage state, so each account has its own group
+    pool_key = f"fh-{account.name}"
+    if context_options.get("record_video_dir"):
+        pool_key += "-video"
+    context = open_context(playwright_browser, context_pool, pool_key, context_options)
+    
+    route_stats = apply_routing(context, get_item_routing_profile(request.node))
+    
+    # Registered after routing so the HAR takes precedence over profile routes
+    try:
+        replayer = har.attach(context, request.node)
+    except FileNotFoundError as e:
+        close_context(context, context_pool)
+        if FH_HAR_MISSING == "fail":
+            pytest.fail(str(e))
+        pytest.skip(str(e))
+    
+    tracing = policy.start_trace(context, request.node)
+    
+    def close() -> None:
+        if tracing:
+            policy.finish_trace(context, request.node, prefix="fh-trace")
+        
+        remove_routing(context, route_stats)
+        _report_routing(request.node, route_stats)
+        if replayer is not None:
+            print(f"📼 HAR {replayer.stats.summary()}")
+            for miss in replayer.stats.misses[:5]:
+                print(f"   not in HAR: {miss}")
+        close_context(context, context_pool)
+        har.finish(request.node)
+    
+    teardown.callback(close)
+    return context
+
+
+@pytest.fixture
+def fh_async_context(request, async_runner):
+    """
+    Provide an authenticated FourHands context on the async runner's browser.
+    
+    For pages/aio flows: the account comes from the FH account pool and the
+    test's routing profile and HAR policy apply, as for fh_authenticated_context.
+    Use the context only inside coroutines passed to async_runner.run().
+    """
+    with ExitStack() as teardown:
+        yield _open_fh_async_context(request, async_runner, teardown)
+
+
+def _open_fh_async_context(request, async_runner, teardown: ExitStack):
+    """Open the async FH context and register its teardown on the fixture's exit stack."""
+    har = get_har_policy()
+    
+    pool = request.getfixturevalue("fh_account_pool")
+    account = _lease_account(request, pool, teardown)
+    request.node.user_properties.append(("fh_account", account.name))
+    
+    # Replayed traffic needs no live session
+    if not pool.has_session(account) and har.mode != REPLAY:
+        pytest.skip(f"FH auth not found at {account.storage_state}. Run scripts/save_fh_auth.py")
     
     context_options = get_context_options()
-    context_options['storage_state'] = str(fh_storage_state_path)
     
-    # Add video recording
-    context_options['record_video_dir'] = 'test-results/videos'
-    context_options['record_video_size'] = {"width": 1920, "height": 1080}
+    # A login (when the session is stale) runs on the sync browser
+    storage_state = pool.storage_state(account, request.getfixturevalue("playwright_browser"))
+    if storage_state:
+        context_options['storage_state'] = storage_state
+    elif har.mode != REPLAY:
+        pytest.skip(f"No FH session for account {account.name}")
     
-    context = playwright_browser.new_context(**context_options)
+    async def open_context(browser):
+        context = await browser.new_context(**context_options)
+        route_stats = await apply_routing_async(context, get_item_routing_profile(request.node))
+        # Registered after routing so the HAR takes precedence over profile routes
+        try:
+            replayer = await har.attach_async(context, request.node)
+        except FileNotFoundError:
+            await context.close()
+            raise
+        return context, route_stats, replayer
     
-    # Enable tracing
-    context.tracing.start(screenshots=True, snapshots=True, sources=True)
+    try:
+        context, route_stats, replayer = async_runner.run(open_context, timeout=60)
+    except FileNotFoundError as e:
+        if FH_HAR_MISSING == "fail":
+            pytest.fail(str(e))
+        pytest.skip(str(e))
     
-    yield context
+    def close() -> None:
+        _report_routing(request.node, route_stats)
+        if replayer is not None:
+            print(f"📼 HAR {replayer.stats.summary()}")
+            for miss in replayer.stats.misses[:5]:
+                print(f"   not in HAR: {miss}")
+        # Not pooled: closing drops the routes and writes a recorded HAR
+        async_runner.run(lambda browser: context.close(), timeout=60)
+        har.finish(request.node)
     
-    # Save trace
-    from datetime import datetime
-    trace_path = f"test-results/traces/fh-trace-{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
-    Path("test-results/traces").mkdir(parents=True, exist_ok=True)
-    context.tracing.stop(path=trace_path)
+    teardown.callback(close)
+    return context
+
+
+def _report_routing(item, stats: RouteStats) -> None:
+    """Report what the routing profile saved for this test."""
+    if not stats.requests_saved:
+        return
     
-    context.close()
+    item.user_properties.append(("routing_requests_saved", stats.requests_saved))
+    item.user_properties.append(("routing_bytes_saved", stats.bytes_saved))
+    item.user_properties.append(("routing_bytes_estimated", stats.bytes_estimated))
+    print(f"🚫 Routing {stats.summary()}")
+    allure.attach(stats.summary(), name="routing", attachment_type=allure.attachment_type.TEXT)
 
 
 @pytest.fixture
@@ -83,17 +309,36 @@ def fh_authenticated_page(fh_authenticated_context: BrowserContext) -> Page:
     """
     Provide authenticated FourHands page.
     
+    Lazy like the context: the page is opened and navigated to the
+    storefront the first time the test uses it.
+    
     Args:
         fh_authenticated_context: Authenticated context
-        
+    
     Yields:
         Page: Authenticated page
     """
-    page = fh_authenticated_context.new_page()
-    
-    # Navigate to FourHands
-    page.goto("https://fh-test-fourhandscom.azurewebsites.net/")
+    def open_page() -> Page:
+        page = fh_authenticated_context.new_page()
+        teardown.callback(page.close)
+        
+        # Navigate to FourHands
+        page.goto(FH_BASE_URL)
+        return page
     
-    yield page
+    with ExitStack() as teardown:
+        yield LazyProxy(open_page, "fh_authenticated_page")
+
+
+@pytest.fixture
+def fh_cart_setup(fh_authenticated_page: Page) -> FourHandsCartSetup:
+    """
+    Provide cart data setup (storefront API, UI fallback) for the authenticated page.
     
-    page.close()
+    Args:
+        fh_authenticated_page: Authenticated page
+        
+    Returns:
+        FourHandsCartSetup: Setup helper bound to the page's context
+    """
+    return FourHandsCartSetup(fh_authenticated_page)
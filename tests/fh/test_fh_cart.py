@@ -15,21 +15,26 @@ from pages.fh_home_page import FourHandsHomePage
 from pages.fh_product_detail_page import FourHandsProductDetailPage
 from pages.fh_cart_page import FourHandsCartPage
 from pages.fh_top_navigation_page import FourHandsTopNavigationPage
+from utils.routing import apply_routing, remove_routing, get_item_routing_profile
 
 
 load_dotenv()
 
+pytestmark = [pytest.mark.cart, pytest.mark.routing("lean")]
+
 
 @pytest.fixture
-def fh_authenticated_page(page: Page):
-    """Provide authenticated FourHands page."""
+def fh_authenticated_page(page: Page, request):
+    """Provide authenticated FourHands page (with the test's routing profile)."""
     from pathlib import Path
     storage_path = Path("storage_state/fh_session.json")
     
     if not storage_path.exists():
         pytest.skip("FourHands storage state not found. Run auth test first.")
     
-    return page
+    route_stats = apply_routing(page.context, get_item_routing_profile(request.node))
+    yield page
+    remove_routing(page.context, route_stats)
 
 
 @pytest.fixture
@@ -110,7 +115,6 @@ def test_cart_remove_product(fh_authenticated_page: Page, fh_base_url: str, fh_t
     
     # Add to cart
     nav.click_add_to_cart_button()
-    page.wait_for_timeout(2000)
     nav.click_dismiss_cart_banner()
     
     # Go to cart
@@ -153,7 +157,6 @@ def test_cart_proceed_to_checkout(fh_authenticated_page: Page, fh_base_url: str,
     
     # Add to cart
     nav.click_add_to_cart_button()
-    page.wait_for_timeout(2000)
     nav.click_dismiss_cart_banner()
     
     # Go to cart
@@ -204,7 +207,6 @@ def test_cart_save_for_later(fh_authenticated_page: Page, fh_base_url: str, fh_t
     nav.enter_search_item(fh_test_product)
     home_page.click_searched_item(fh_test_product)
     nav.click_add_to_cart_button()
-    page.wait_for_timeout(2000)
     nav.click_dismiss_cart_banner()
     
     # Go to cart
@@ -242,7 +244,6 @@ def test_cart_summary_section(fh_authenticated_page: Page, fh_base_url: str, fh_
     nav.enter_search_item(fh_test_product)
     home_page.click_searched_item(fh_test_product)
     nav.click_add_to_cart_button()
-    page.wait_for_timeout(2000)
     nav.click_dismiss_cart_banner()
     
     # Go to cart
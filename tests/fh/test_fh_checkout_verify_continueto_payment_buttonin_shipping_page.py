@@ -8,7 +8,7 @@ import pytest
 import allure
 from playwright.sync_api import Page
 
-pytestmark = [pytest.mark.fourhands, pytest.mark.checkout]
+pytestmark = [pytest.mark.fourhands, pytest.mark.checkout, pytest.mark.routing("lean")]
 
 
 @allure.feature("Checkout")
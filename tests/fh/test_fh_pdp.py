@@ -96,7 +96,6 @@ def test_pdp_add_product_to_cart(fh_authenticated_page: Page, fh_base_url: str,
     
     # Add to cart
     nav.click_add_to_cart_button()
-    page.wait_for_timeout(2000)
     
     # Dismiss cart banner if present
     nav.click_dismiss_cart_banner()
@@ -156,7 +155,6 @@ def test_pdp_increment_product_quantity(fh_authenticated_page: Page, fh_base_url
     
     # Add to cart
     nav.click_add_to_cart_button()
-    page.wait_for_timeout(2000)
     nav.click_dismiss_cart_banner()
     
     # Verify cart count
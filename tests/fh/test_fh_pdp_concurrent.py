@@ -0,0 +1,43 @@
+"""
+FourHands PDP checks across several products at once (async page objects).
+
+Usage:
+    pytest tests/fh/test_fh_pdp_concurrent.py -m fourhands -s
+    ASYNC_CONCURRENCY=2 pytest tests/fh/test_fh_pdp_concurrent.py
+"""
+import pytest
+
+from pages.aio import AsyncFourHandsProductDetailPage
+from utils.async_runner import gather_limited
+
+
+@pytest.mark.fourhands
+@pytest.mark.smoke
+def test_pdp_products_load_concurrently(async_runner, fh_async_context, fh_test_products: list):
+    """
+    Open every test product's PDP in one context and check title and Add to Cart.
+    
+    Pages load concurrently, so the test takes about as long as the slowest PDP.
+    """
+    async def check_products(browser):
+        async def check(product_id: str) -> dict:
+            pdp = AsyncFourHandsProductDetailPage(await fh_async_context.new_page())
+            try:
+                await pdp.navigate_to_product(product_id)
+                return {
+                    "product_id": product_id,
+                    "title": await pdp.get_product_title(),
+                    "add_to_cart_enabled": await pdp.is_add_to_cart_enabled(),
+                }
+            finally:
+                await pdp.page.close()
+        
+        return await gather_limited(check(product_id) for product_id in fh_test_products)
+    
+    results = async_runner.run(check_products, timeout=300)
+    
+    for result in results:
+        print(f"📦 {result['product_id']}: {result['title']} (add to cart enabled: {result['add_to_cart_enabled']})")
+        assert result["title"], f"Product {result['product_id']} has no title"
+    
+    print(f"✅ {len(results)} PDPs checked concurrently")
@@ -0,0 +1 @@
+"""Unit tests that need no browser or live environment (local stub servers only)."""
@@ -0,0 +1,214 @@
+"""
+Local mock of the D365 F&O OData entities used by utils/d365_odata.py.
+
+Serves CustomersV3, SalesOrderHeadersV2 and SalesOrderLines in memory with
+number sequences, bearer token checks, simple $filter support and the
+referential rules the factory relies on (lines need an order, orders need
+a customer, a customer with orders cannot be deleted).
+"""
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+
+_ENTITY_PATH = re.compile(r"^/data/(?P<entity>\w+)(?:\((?P<key>[^)]*)\))?$")
+_KEY_PART = re.compile(r"(\w+)=(?:'((?:[^']|'')*)'|([\w.-]+))")
+_FILTER_EQ = re.compile(r"(\w+) eq '((?:[^']|'')*)'")
+
+KEYS = {
+    "CustomersV3": ("dataAreaId", "CustomerAccount"),
+    "SalesOrderHeadersV2": ("dataAreaId", "SalesOrderNumber"),
+    "SalesOrderLines": ("dataAreaId", "SalesOrderNumber", "LineCreationSequenceNumber"),
+}
+
+
+class MockODataServer:
+    """
+    In-process D365 OData mock.
+
+    Usage:
+        with MockODataServer(token="secret") as server:
+            client = D365ODataClient(server.url, "secret")
+            ...
+            assert not server.records["CustomersV3"]
+    """
+
+    def __init__(self, token: str = "test-token"):
+        """
+        Initialize the mock.
+
+        Args:
+            token: Bearer token the mock accepts
+        """
+        self.token = token
+        self.records: Dict[str, Dict[Tuple, dict]] = {entity: {} for entity in KEYS}
+        self.requests: List[str] = []
+        self._sequences: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running mock."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockODataServer":
+        """Start serving on a free local port."""
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "MockODataServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def _next(self, sequence: str, fmt: str) -> str:
+        self._sequences[sequence] = self._sequences.get(sequence, 0) + 1
+        return fmt.format(self._sequences[sequence])
+
+    @staticmethod
+    def _key_of(entity: str, record: dict) -> Tuple:
+        return tuple(str(record.get(field)).lower() if field == "dataAreaId" else str(record.get(field))
+                     for field in KEYS[entity])
+
+    @staticmethod
+    def _parse_key(entity: str, raw: str) -> Tuple:
+        parts = {name: (quoted.replace("''", "'") if quoted is not None and number == "" else number)
+                 for name, quoted, number in _KEY_PART.findall(unquote(raw))}
+        return tuple(parts.get(field, "").lower() if field == "dataAreaId" else parts.get(field, "")
+                     for field in KEYS[entity])
+
+    def _orders_of(self, company: str, customer: str) -> List[dict]:
+        return [o for o in self.records["SalesOrderHeadersV2"].values()
+                if o["dataAreaId"] == company and o.get("OrderingCustomerAccountNumber") == customer]
+
+    def _create(self, entity: str, body: dict) -> Tuple[int, dict]:
+        """Insert a record, assigning number sequences like D365 does."""
+        record = dict(body)
+        record["dataAreaId"] = str(record.get("dataAreaId", "")).lower()
+        company = record["dataAreaId"]
+
+        if entity == "CustomersV3":
+            record.setdefault("CustomerAccount", self._next("cust", "C{:06d}"))
+        elif entity == "SalesOrderHeadersV2":
+            customer = record.get("OrderingCustomerAccountNumber")
+            if self._key_of("CustomersV3", {"dataAreaId": company, "CustomerAccount": customer}) \
+                    not in self.records["CustomersV3"]:
+                return 400, _error(f"Customer account {customer} does not exist.")
+            record.setdefault("SalesOrderNumber", self._next("so", "SO-{:06d}"))
+        elif entity == "SalesOrderLines":
+            order_key = self._key_of("SalesOrderHeadersV2", record)
+            if order_key not in self.records["SalesOrderHeadersV2"]:
+                return 400, _error(f"Sales order {record.get('SalesOrderNumber')} does not exist.")
+            record["LineCreationSequenceNumber"] = int(self._next(f"line:{order_key}", "{}"))
+
+        key = self._key_of(entity, record)
+        if key in self.records[entity]:
+            return 400, _error(f"Record {key} already exists.")
+        self.records[entity][key] = record
+        return 201, record
+
+    def _delete(self, entity: str, key: Tuple) -> Tuple[int, Optional[dict]]:
+        """Delete a record with D365's delete actions (cascade lines, restrict customers)."""
+        record = self.records[entity].get(key)
+        if record is None:
+            return 404, _error("Not found")
+        if entity == "CustomersV3" and self._orders_of(record["dataAreaId"], record["CustomerAccount"]):
+            return 400, _error(f"Customer {record['CustomerAccount']} has open sales orders.")
+        if entity == "SalesOrderHeadersV2":
+            lines = self.records["SalesOrderLines"]
+            for line_key in [k for k, line in lines.items() if k[:2] == key]:
+                del lines[line_key]
+        del self.records[entity][key]
+        return 204, None
+
+    def _query(self, entity: str, query: str) -> List[dict]:
+        """Apply the eq comparisons of a $filter (joined with 'and')."""
+        raw_filter = parse_qs(query).get("$filter", [""])[0]
+        conditions = [(field, value.replace("''", "'")) for field, value in _FILTER_EQ.findall(raw_filter)]
+        return [r for r in self.records[entity].values()
+                if all(str(r.get(field, "")).lower() == value.lower() if field == "dataAreaId"
+                       else str(r.get(field, "")) == value for field, value in conditions)]
+
+    def _dispatch(self, method: str, path: str, body) -> Tuple[int, Optional[dict]]:
+        """Route a request, returning status and JSON body."""
+        parts = urlsplit(path)
+        match = _ENTITY_PATH.match(parts.path)
+        if not match or match.group("entity") not in KEYS:
+            return 404, _error("Resource not found for the segment")
+        entity, raw_key = match.group("entity"), match.group("key")
+
+        with self._lock:
+            if raw_key is None:
+                if method == "GET":
+                    return 200, {"value": self._query(entity, parts.query)}
+                if method == "POST":
+                    return self._create(entity, body or {})
+                return 405, _error("Method not allowed")
+
+            key = self._parse_key(entity, raw_key)
+            record = self.records[entity].get(key)
+            if method == "GET":
+                return (200, record) if record else (404, _error("Not found"))
+            if method == "PATCH":
+                if record is None:
+                    return 404, _error("Not found")
+                record.update(body or {})
+                return 204, None
+            if method == "DELETE":
+                return self._delete(entity, key)
+            return 405, _error("Method not allowed")
+
+    def _handler(self):
+        """Build the request handler class bound to this mock."""
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _handle(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"null") if length else None
+                with mock._lock:
+                    mock.requests.append(f"{self.command} {self.path}")
+
+                if self.headers.get("Authorization") != f"Bearer {mock.token}":
+                    self._reply(401, _error("Unauthorized"))
+                    return
+
+                self._reply(*mock._dispatch(self.command, self.path, body))
+
+            do_GET = do_POST = do_PATCH = do_DELETE = _handle
+
+            def _reply(self, status: int, payload):
+                data = json.dumps(payload).encode() if payload is not None else b""
+                self.send_response(status)
+                if data:
+                    self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def _error(message: str) -> dict:
+    """OData error payload."""
+    return {"error": {"code": "", "message": message}}
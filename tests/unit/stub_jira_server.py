@@ -0,0 +1,221 @@
+"""
+Local stub of the Jira/Zephyr REST endpoints used by utils/jira_integration.py.
+
+Runs an in-process HTTP server so upload behaviour and throughput can be
+measured offline. Latency, rate limiting and bulk support are configurable.
+"""
+import gzip
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Set
+
+
+_BULK_PATH = re.compile(r"^/rest/atm/1\.0/testrun/(?P<cycle>[^/]+)/testresults$")
+_SINGLE_PATH = re.compile(r"^/rest/atm/1\.0/testrun/(?P<cycle>[^/]+)/testcase/(?P<key>[^/]+)/testresult$")
+_COMMENT_PATH = re.compile(r"^/rest/api/2/issue/(?P<key>[^/]+)/comment$")
+_JQL_LABELS = re.compile(r"labels in \((?P<labels>[^)]*)\)")
+
+
+class StubJiraServer:
+    """
+    In-process Jira/Zephyr stub.
+
+    Usage:
+        with StubJiraServer(latency=0.01, rate_limit_every=10) as server:
+            uploader = ZephyrResultUploader(requests.Session(), server.url)
+            ...
+            assert len(server.results) == 100
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        bulk_supported: bool = True,
+        rate_limit_every: int = 0,
+        retry_after: str = "0",
+        server_error_every: int = 0,
+        unknown_keys: Optional[Set[str]] = None,
+        bulk_create_supported: bool = True
+    ):
+        """
+        Initialize the stub.
+
+        Args:
+            latency: Seconds each request takes
+            bulk_supported: Serve the bulk testresults endpoint (404 otherwise)
+            rate_limit_every: Answer every Nth request with 429 (0 disables)
+            retry_after: Retry-After header sent with 429 responses
+            server_error_every: Answer every Nth request with 503 (0 disables)
+            unknown_keys: Test case keys rejected with 400
+            bulk_create_supported: Serve the bulk issue create endpoint (404 otherwise)
+        """
+        self.latency = latency
+        self.bulk_supported = bulk_supported
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.server_error_every = server_error_every
+        self.unknown_keys = unknown_keys or set()
+        self.bulk_create_supported = bulk_create_supported
+
+        self.results: Dict[str, dict] = {}
+        self.requests: List[str] = []
+        self.throttled = 0
+        self.gzipped = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.issues: Dict[str, dict] = {}
+        self.comments: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running stub."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubJiraServer":
+        """Start serving on a free local port."""
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "StubJiraServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def _next_failure(self) -> Optional[int]:
+        """Record the request and decide whether it gets an injected failure."""
+        with self._lock:
+            count = len(self.requests)
+            if self.rate_limit_every and count % self.rate_limit_every == 0:
+                self.throttled += 1
+                return 429
+            if self.server_error_every and count % self.server_error_every == 0:
+                return 503
+        return None
+
+    def _handle_post(self, path: str, body) -> (int, dict):
+        """Route a POST request, returning status and JSON body."""
+        bulk = _BULK_PATH.match(path)
+        if bulk:
+            if not self.bulk_supported:
+                return 404, {"message": "Not found"}
+            keys = [item.get("testCaseKey") for item in body]
+            unknown = [k for k in keys if k in self.unknown_keys]
+            if unknown:
+                return 400, {"errorMessages": [f"Unknown test case {k}" for k in unknown]}
+            with self._lock:
+                for item in body:
+                    self.results[item["testCaseKey"]] = item
+            return 201, [{"id": i} for i in range(len(body))]
+
+        single = _SINGLE_PATH.match(path)
+        if single:
+            key = single.group("key")
+            if key in self.unknown_keys:
+                return 400, {"errorMessages": [f"Unknown test case {key}"]}
+            with self._lock:
+                self.results[key] = body
+            return 201, {"id": 1}
+
+        if path == "/rest/api/2/search":
+            match = _JQL_LABELS.search(body.get("jql", ""))
+            labels = {label.strip() for label in match.group("labels").split(",")} if match else set()
+            with self._lock:
+                issues = [
+                    {"key": key, "fields": {"labels": issue["labels"]}}
+                    for key, issue in self.issues.items()
+                    if issue["status"] != "Done" and labels & set(issue["labels"])
+                ]
+            return 200, {"issues": issues, "total": len(issues)}
+
+        if path == "/rest/api/2/issue/bulk":
+            if not self.bulk_create_supported:
+                return 404, {"message": "Not found"}
+            return 201, {"issues": [self.add_issue(update["fields"]) for update in body["issueUpdates"]],
+                         "errors": []}
+
+        if path == "/rest/api/2/issue":
+            return 201, self.add_issue(body["fields"])
+
+        comment = _COMMENT_PATH.match(path)
+        if comment:
+            key = comment.group("key")
+            if key not in self.issues:
+                return 404, {"errorMessages": ["Issue does not exist"]}
+            with self._lock:
+                self.comments.setdefault(key, []).append(body["body"])
+            return 201, {"id": "1"}
+
+        return 404, {"message": "Not found"}
+
+    def add_issue(self, fields: dict, status: str = "Open") -> dict:
+        """Create an issue in the stub (also used by tests to seed existing defects)."""
+        with self._lock:
+            key = f"{fields.get('project', {}).get('key', 'QA')}-{len(self.issues) + 1}"
+            self.issues[key] = {"labels": list(fields.get("labels", [])), "status": status, "fields": fields}
+        return {"key": key, "id": key}
+
+    def _handler(self):
+        """Build the request handler class bound to this stub."""
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                raw = self.rfile.read(length)
+                with stub._lock:
+                    stub.requests.append(f"POST {self.path}")
+                    if self.headers.get("Content-Encoding") == "gzip":
+                        stub.gzipped += 1
+                        raw = gzip.decompress(raw)
+                    stub.in_flight += 1
+                    stub.peak_in_flight = max(stub.peak_in_flight, stub.in_flight)
+                body = json.loads(raw or b"null")
+
+                try:
+                    if stub.latency:
+                        time.sleep(stub.latency)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+                failure = stub._next_failure()
+                if failure:
+                    self._reply(failure, {"message": "injected"},
+                                {"Retry-After": stub.retry_after} if failure == 429 else {})
+                    return
+
+                status, payload = stub._handle_post(self.path, body)
+                self._reply(status, payload)
+
+            def _reply(self, status: int, payload, headers: Optional[dict] = None):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,106 @@
+"""
+FourHands account pool leasing tests (lock files only, no browser).
+"""
+import json
+import time
+import pytest
+
+from utils.account_pool import Account, AccountPool, load_accounts
+from utils.file_lock import FileLockTimeout
+
+
+def make_pool(tmp_path, count: int = 2, **kwargs) -> AccountPool:
+    """Pool of `count` accounts with locks under tmp_path."""
+    accounts = [Account(f"buyer{i}", tmp_path / f"buyer{i}.json") for i in range(1, count + 1)]
+    kwargs.setdefault("lease_timeout", 0.3)
+    kwargs.setdefault("poll_interval", 0.05)
+    return AccountPool(accounts, lock_dir=tmp_path / "leases", **kwargs)
+
+
+def test_concurrent_leases_get_different_accounts(tmp_path):
+    pool = make_pool(tmp_path)
+    
+    with pool.lease("gw0") as first, pool.lease("gw1") as second:
+        assert first.account.name != second.account.name
+
+
+def test_lease_waits_until_an_account_is_released(tmp_path):
+    pool = make_pool(tmp_path, count=1)
+    
+    lease = pool.lease("gw0")
+    with pytest.raises(FileLockTimeout):
+        pool.lease("gw1")
+    
+    lease.release()
+    with pool.lease("gw1") as again:
+        assert again.account.name == "buyer1"
+
+
+def test_stale_lease_of_crashed_worker_is_reclaimed(tmp_path):
+    pool = make_pool(tmp_path, count=1, stale_after=0)
+    
+    pool.lease("gw0")  # never released
+    with pool.lease("gw1") as lease:
+        assert lease.account.name == "buyer1"
+
+
+def test_shared_account_is_not_locked(tmp_path):
+    pool = make_pool(tmp_path, count=1, shared=True)
+    
+    with pool.lease("gw0") as first, pool.lease("gw1") as second:
+        assert first.account is second.account
+    assert not (tmp_path / "leases").exists()
+
+
+def test_load_accounts_reads_passwords_from_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv("FH_PASSWORD", "shared-secret")
+    monkeypatch.setenv("FH_PASSWORD_BUYER1", "buyer1-secret")
+    accounts_file = tmp_path / "fh_accounts.json"
+    accounts_file.write_text(json.dumps([
+        {"name": "buyer1", "username": "buyer1@example.com", "password_env": "FH_PASSWORD_BUYER1"},
+        {"name": "buyer2", "username": "buyer2@example.com"},
+    ]))
+    
+    accounts = load_accounts(accounts_file, state_dir=tmp_path / "states")
+    
+    assert [a.password for a in accounts] == ["buyer1-secret", "shared-secret"]
+    assert accounts[1].storage_state == tmp_path / "states" / "buyer2.json"
+    assert all(a.can_login for a in accounts)
+
+
+def test_load_accounts_rejects_duplicate_names(tmp_path):
+    accounts_file = tmp_path / "fh_accounts.json"
+    accounts_file.write_text(json.dumps([{"name": "buyer1"}, {"name": "buyer1"}]))
+    
+    with pytest.raises(ValueError, match="buyer1"):
+        load_accounts(accounts_file)
+
+
+def test_release_keeps_lock_reclaimed_by_another_worker(tmp_path):
+    pool = make_pool(tmp_path, count=1, stale_after=0)
+    
+    crashed = pool.lease("gw0")
+    reclaimed = pool.lease("gw1")
+    crashed.release()
+    
+    assert reclaimed.lock.owned()
+    with pytest.raises(FileLockTimeout):
+        make_pool(tmp_path, count=1).lease("gw2")
+    reclaimed.release()
+
+
+def test_heartbeat_keeps_long_lease_from_turning_stale(tmp_path):
+    pool = make_pool(tmp_path, count=1, stale_after=1.5)
+    
+    with pool.lease("gw0"):
+        time.sleep(2)
+        with pytest.raises(FileLockTimeout):
+            pool.lease("gw1")
+
+
+def test_more_workers_than_accounts_falls_back_to_per_test_leases(tmp_path):
+    pool = make_pool(tmp_path, count=2)
+    
+    assert pool.lease_scope("worker", workers=2) == "worker"
+    assert pool.lease_scope("worker", workers=3) == "test"
+    assert pool.lease_scope("test", workers=1) == "test"
@@ -0,0 +1,70 @@
+"""
+Allure artifact writer tests (fake Allure listener, no browser needed).
+"""
+from types import SimpleNamespace
+
+from utils import artifact_writer
+from utils.artifact_writer import ArtifactWriter
+
+
+class FakeLogger:
+    """Stands in for allure-commons' reporter and its private _attach."""
+
+    def __init__(self):
+        self.reserved = []
+
+    def _attach(self, uuid, name=None, attachment_type=None, extension=None, parent_uuid=None):
+        file_name = f"{uuid}-attachment.webm"
+        self.reserved.append((name, file_name))
+        return file_name
+
+
+def make_config(report_dir, logger) -> SimpleNamespace:
+    listener = SimpleNamespace(allure_logger=logger)
+    return SimpleNamespace(
+        option=SimpleNamespace(allure_report_dir=str(report_dir)),
+        pluginmanager=SimpleNamespace(get_plugin=lambda name: listener),
+    )
+
+
+def make_video(tmp_path):
+    video = tmp_path / "video.webm"
+    video.write_bytes(b"webm" * 10)
+    return video
+
+
+def test_reserved_attachment_is_written_off_thread(tmp_path):
+    logger = FakeLogger()
+    video = make_video(tmp_path)
+    writer = ArtifactWriter(settle_seconds=0.05, finalize_timeout=5)
+
+    assert writer.submit_file(make_config(tmp_path / "allure", logger), str(video), "Test Video", "video/webm")
+    writer.close()
+
+    (name, file_name), = logger.reserved
+    assert name == "Test Video"
+    assert (tmp_path / "allure" / file_name).read_bytes() == video.read_bytes()
+    assert writer.written == 1
+
+
+def test_missing_private_attach_falls_back_to_public_attach(tmp_path, monkeypatch):
+    attached = []
+    monkeypatch.setattr(artifact_writer.allure.attach, "file",
+                        lambda source, name=None, attachment_type=None: attached.append((source, name)))
+    video = make_video(tmp_path)
+    writer = ArtifactWriter(settle_seconds=0.05, finalize_timeout=5)
+
+    assert writer.submit_file(make_config(tmp_path / "allure", object()), str(video), "Test Video", "video/webm")
+
+    assert attached == [(str(video), "Test Video")]
+    assert writer.written == 1
+    assert not (tmp_path / "allure").exists()
+
+
+def test_no_allure_listener_attaches_nothing(tmp_path):
+    config = SimpleNamespace(
+        option=SimpleNamespace(allure_report_dir=None),
+        pluginmanager=SimpleNamespace(get_plugin=lambda name: None),
+    )
+
+    assert not ArtifactWriter().submit_file(config, str(make_video(tmp_path)), "Test Video", "video/webm")
@@ -0,0 +1,126 @@
+"""
+D365 OData data factory tests against the local mock server.
+"""
+import json
+import time
+
+import pytest
+
+from utils.d365_odata import (
+    CUSTOMERS,
+    SALES_ORDER_HEADERS,
+    SALES_ORDER_LINES,
+    D365DataFactory,
+    D365ODataClient,
+    D365ODataError,
+    access_token_from_state,
+)
+from tests.unit.mock_odata_server import MockODataServer
+
+
+def make_client(server: MockODataServer, token: str = "test-token") -> D365ODataClient:
+    return D365ODataClient(server.url, token, company="FH")
+
+
+def test_creates_customer_and_order_then_cleans_up():
+    with MockODataServer() as server:
+        with D365DataFactory(make_client(server)) as factory:
+            customer = factory.create_customer()
+            order = factory.create_sales_order(
+                customer["CustomerAccount"], lines=[("000022-", 1), ("108422-001", 2)], delivery_mode="ZEFL-B2B"
+            )
+
+            assert customer["CustomerAccount"] == "C000001"
+            assert customer["OrganizationName"].startswith("QA Customer")
+            assert order["SalesOrderNumber"] == "SO-000001"
+            assert [line["LineCreationSequenceNumber"] for line in order["lines"]] == [1, 2]
+            assert len(server.records[SALES_ORDER_LINES]) == 2
+            assert all(r["dataAreaId"] == "fh" for r in server.records[CUSTOMERS].values())
+
+        assert not server.records[CUSTOMERS]
+        assert not server.records[SALES_ORDER_HEADERS]
+        assert not server.records[SALES_ORDER_LINES]
+
+
+def test_cleanup_removes_orders_created_outside_the_factory():
+    with MockODataServer() as server:
+        client = make_client(server)
+        factory = D365DataFactory(client)
+        account = factory.create_customer()["CustomerAccount"]
+
+        # Order created by the UI under test
+        client.create(SALES_ORDER_HEADERS, {"OrderingCustomerAccountNumber": account})
+
+        assert factory.adopt_sales_orders(account) == ["SO-000001"]
+        assert factory.adopt_sales_orders(account) == []
+        client.create(SALES_ORDER_HEADERS, {"OrderingCustomerAccountNumber": account})
+        summary = factory.cleanup()
+
+        assert summary == {"deleted": 3, "failed": 0}
+        assert not server.records[CUSTOMERS]
+        assert not server.records[SALES_ORDER_HEADERS]
+
+
+def test_cleanup_reports_failures_and_continues():
+    with MockODataServer() as server:
+        client = make_client(server)
+        factory = D365DataFactory(client)
+        account = factory.create_customer()["CustomerAccount"]
+        factory.create_customer()
+        # Untracked order keeps the first customer from being deleted
+        client.create(SALES_ORDER_HEADERS, {"OrderingCustomerAccountNumber": account})
+
+        summary = factory.cleanup(adopt_orders=False)
+
+        assert summary == {"deleted": 1, "failed": 1}
+        assert not factory.created
+
+
+def test_query_and_get_use_company_scoped_keys():
+    with MockODataServer() as server:
+        client = make_client(server)
+        client.create(CUSTOMERS, {"CustomerAccount": "O'Brien", "OrganizationName": "Quoted"})
+        client.create(CUSTOMERS, {"CustomerAccount": "C2", "OrganizationName": "Other"})
+
+        assert client.get(CUSTOMERS, {"CustomerAccount": "O'Brien"})["OrganizationName"] == "Quoted"
+        assert client.get(CUSTOMERS, {"CustomerAccount": "missing"}) is None
+        assert [c["CustomerAccount"] for c in client.query(CUSTOMERS, "OrganizationName eq 'Other'")] == ["C2"]
+        assert client.delete(CUSTOMERS, {"CustomerAccount": "C2"}) is True
+        assert client.delete(CUSTOMERS, {"CustomerAccount": "C2"}) is False
+
+
+def test_errors_carry_status_and_message():
+    with MockODataServer() as server:
+        with pytest.raises(D365ODataError) as unauthorized:
+            make_client(server, token="wrong").query(CUSTOMERS)
+        with pytest.raises(D365ODataError) as invalid:
+            D365DataFactory(make_client(server)).create_sales_order("NOPE")
+
+    assert unauthorized.value.status == 401
+    assert invalid.value.status == 400
+    assert "NOPE does not exist" in str(invalid.value)
+
+
+def test_token_from_storage_state_prefers_unexpired_d365_token(tmp_path):
+    now = time.time()
+
+    def token(secret: str, target: str, expires: float) -> dict:
+        value = {"credentialType": "AccessToken", "secret": secret, "target": target, "expiresOn": str(int(expires))}
+        return {"name": secret, "value": json.dumps(value)}
+
+    state = {"origins": [{"origin": "https://login.microsoftonline.com", "localStorage": [
+        token("graph", "https://graph.microsoft.com/.default", now + 3600),
+        token("expired", "https://fh.operations.dynamics.com/.default", now - 10),
+        token("d365", "https://fh.operations.dynamics.com/.default", now + 1800),
+    ]}]}
+
+    assert access_token_from_state(state, "https://fh.operations.dynamics.com") == "d365"
+    assert access_token_from_state({"origins": []}, "https://fh.operations.dynamics.com") is None
+
+    with MockODataServer(token="local") as server:
+        state["origins"][0]["localStorage"].append(token("local", f"{server.url}/.default", now + 600))
+        path = tmp_path / "state.json"
+        path.write_text(json.dumps(state))
+
+        client = D365ODataClient.from_env(base_url=server.url, storage_state=path)
+        assert client.query(CUSTOMERS) == []
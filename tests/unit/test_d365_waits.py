@@ -0,0 +1,83 @@
+"""
+Busy watcher tests with fake pages (no browser needed).
+"""
+import asyncio
+
+import pytest
+from playwright.sync_api import Error as PlaywrightError
+
+from utils.d365_waits import AsyncBusyWatcher, BusyWatcher
+
+
+class FakeLocator:
+    def __init__(self, page):
+        self.page = page
+
+    @property
+    def first(self):
+        return self
+
+    def is_visible(self):
+        return self.page.visible
+
+
+class FakeAsyncLocator(FakeLocator):
+    async def is_visible(self):
+        return self.page.visible
+
+
+class FakePage:
+    """Sync page whose busy detector answers from a list of results."""
+
+    def __init__(self, busy=(), closed: bool = False):
+        self.busy = list(busy)
+        self.closed = closed
+        self.visible = False
+
+    def on(self, event, handler):
+        pass
+
+    def is_closed(self):
+        return self.closed
+
+    def evaluate(self, script, arg=None):
+        if self.closed:
+            raise PlaywrightError("Target page, context or browser has been closed")
+        return self.busy.pop(0) if self.busy else False
+
+    def locator(self, selector):
+        return FakeLocator(self)
+
+
+class FakeAsyncPage(FakePage):
+    async def evaluate(self, script, arg=None):
+        return FakePage.evaluate(self, script, arg)
+
+    def locator(self, selector):
+        return FakeAsyncLocator(self)
+
+
+def test_sync_watcher_waits_until_idle():
+    page = FakePage(busy=[True, True, False])
+    BusyWatcher(page, mode="poll", quiet_window=0.01).wait_until_idle(timeout=5)
+
+    assert page.busy == []
+
+
+def test_async_watcher_is_not_a_busy_watcher():
+    # Its checks are coroutines, so BusyWatcher callers must never receive one
+    assert not issubclass(AsyncBusyWatcher, BusyWatcher)
+
+
+def test_async_watcher_waits_until_idle():
+    page = FakeAsyncPage(busy=[True, False])
+    asyncio.run(AsyncBusyWatcher(page, quiet_window=0.01).wait_until_idle(timeout=5))
+
+    assert page.busy == []
+
+
+def test_async_watcher_fails_fast_on_closed_page():
+    watcher = AsyncBusyWatcher(FakeAsyncPage(closed=True), quiet_window=0.01)
+
+    with pytest.raises(PlaywrightError):
+        asyncio.run(watcher.wait_until_idle(timeout=30))
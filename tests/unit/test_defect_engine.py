@@ -0,0 +1,115 @@
+"""
+Defect engine tests against the local stub server.
+"""
+import requests
+
+from utils.jira_integration import (
+    DefectEngine,
+    normalize_error_signature,
+    signature_label,
+)
+from tests.unit.stub_jira_server import StubJiraServer
+
+
+def failure(test_name: str, message: str) -> dict:
+    """Parsed FAIL result like iter_junit_results yields."""
+    return {'test_name': test_name, 'status': 'FAIL', 'message': message, 'jira_key': None}
+
+
+def make_engine(server: StubJiraServer) -> DefectEngine:
+    return DefectEngine(requests.Session(), server.url, 'QA')
+
+
+def test_signature_ignores_volatile_details():
+    a = normalize_error_signature("TimeoutError: Timeout 30000ms exceeded waiting for 0x7f3a\nstack...")
+    b = normalize_error_signature("TimeoutError: Timeout 15000ms exceeded waiting for 0x1b2c\nother")
+    c = normalize_error_signature("AssertionError: cart count mismatch")
+
+    assert a == b
+    assert signature_label(a) == signature_label(b)
+    assert signature_label(a) != signature_label(c)
+
+
+def test_groups_failures_into_one_defect_per_signature():
+    failures = [failure(f"test_{n}", f"Timeout {n}ms exceeded") for n in range(40)]
+    failures.append(failure("test_cart", "AssertionError: cart count mismatch"))
+
+    with StubJiraServer() as server:
+        summary = make_engine(server).process(failures, 'FH-C1', '101')
+        searches = [r for r in server.requests if r.endswith('/rest/api/2/search')]
+        bulk_creates = [r for r in server.requests if r.endswith('/rest/api/2/issue/bulk')]
+
+    assert summary == {'failures': 41, 'signatures': 2, 'created': 2, 'commented': 0, 'errors': 0}
+    assert len(server.issues) == 2
+    assert len(searches) == 1
+    assert len(bulk_creates) == 1
+
+
+def test_comments_on_open_defect_instead_of_duplicating():
+    message = "AssertionError: cart count mismatch"
+    label = signature_label(normalize_error_signature(message))
+
+    with StubJiraServer() as server:
+        existing = server.add_issue({'project': {'key': 'QA'}, 'labels': ['automated-test', label]})['key']
+        summary = make_engine(server).process(
+            [failure("test_a", message), failure("test_b", message)], 'FH-C1', '102'
+        )
+
+    assert summary['created'] == 0
+    assert summary['commented'] == 1
+    assert len(server.issues) == 1
+    assert "test_a" in server.comments[existing][0]
+
+
+def test_closed_defect_is_not_reused():
+    message = "AssertionError: cart count mismatch"
+    label = signature_label(normalize_error_signature(message))
+
+    with StubJiraServer() as server:
+        server.add_issue({'project': {'key': 'QA'}, 'labels': [label]}, status='Done')
+        summary = make_engine(server).process([failure("test_a", message)], 'FH-C1', '103')
+
+    assert summary['created'] == 1
+    assert len(server.issues) == 2
+
+
+def test_falls_back_to_single_create_without_bulk_endpoint():
+    with StubJiraServer(bulk_create_supported=False) as server:
+        summary = make_engine(server).process(
+            [failure("test_a", "Error A"), failure("test_b", "Error B")], 'FH-C1', '104'
+        )
+
+    assert summary['created'] == 2
+    assert len(server.issues) == 2
+
+
+class FlakyBulkSession(requests.Session):
+    """Session whose first bulk create times out and second gets an HTML gateway error."""
+
+    def __init__(self):
+        super().__init__()
+        self.bulk_calls = 0
+
+    def post(self, url, **kwargs):
+        if url.endswith('/rest/api/2/issue/bulk'):
+            self.bulk_calls += 1
+            if self.bulk_calls == 1:
+                raise requests.exceptions.ReadTimeout("read timed out")
+            if self.bulk_calls == 2:
+                response = requests.Response()
+                response.status_code = 502
+                response._content = b"<html><body>Bad Gateway</body></html>"
+                return response
+        return super().post(url, **kwargs)
+
+
+def test_failed_bulk_batches_are_counted_and_remaining_batches_run():
+    failures = [failure(f"test_{n}", f"Error {n}") for n in "ABC"]
+
+    with StubJiraServer() as server:
+        engine = DefectEngine(FlakyBulkSession(), server.url, 'QA', batch_size=1)
+        summary = engine.process(failures, 'FH-C1', '105')
+
+    assert summary['created'] == 1
+    assert summary['errors'] == 2
+    assert len(server.issues) == 1
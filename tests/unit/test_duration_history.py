@@ -0,0 +1,55 @@
+"""
+Duration history tests (no browser needed).
+"""
+from pathlib import Path
+
+import pytest
+
+from utils.duration_history import DurationHistory
+
+
+@pytest.fixture
+def history(tmp_path) -> DurationHistory:
+    return DurationHistory(tmp_path / "durations.json", smoothing=0.5)
+
+
+def test_update_blends_measurements_into_history(history):
+    history.update({"tests/a.py::test_x": 10.0, "tests/a.py::test_y": 2.0})
+    history.update({"tests/a.py::test_x": 20.0})
+
+    assert history.durations["tests/a.py::test_x"] == 15.0
+    assert history.durations["tests/a.py::test_y"] == 2.0
+
+
+def test_history_survives_save_and_load(history, tmp_path):
+    history.update({"tests/a.py::test_x": 3.0})
+    history.save()
+
+    assert DurationHistory(tmp_path / "durations.json").durations == {"tests/a.py::test_x": 3.0}
+
+
+def test_estimate_uses_own_then_sibling_then_default(history):
+    history.update({
+        "tests/a.py::test_x[1]": 4.0,
+        "tests/a.py::test_x[2]": 8.0,
+        "tests/a.py::test_y": 30.0,
+    })
+
+    assert history.estimate("tests/a.py::test_y") == 30.0
+    # Unknown parametrization: mean of its known siblings
+    assert history.estimate("tests/a.py::test_x[3]") == 6.0
+    # Unknown test: median of the history, unless a default is given
+    assert history.estimate("tests/b.py::test_z") == 8.0
+    assert history.estimate("tests/b.py::test_z", default=1.5) == 1.5
+
+
+def test_empty_history_estimates_one_second(history):
+    assert history.estimate("tests/a.py::test_x") == 1.0
+
+
+def test_import_junit_records_finished_tests(history):
+    junit = Path(__file__).parent / "data" / "junit_nested.xml"
+
+    # Skipped tests are left out, and no Jira settings are needed to parse the report
+    assert history.import_junit(str(junit)) == 3
+    assert history.durations["tests/fh/test_fh_cart.py::test_add_to_cart"] == 2.5
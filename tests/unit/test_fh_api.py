@@ -0,0 +1,72 @@
+"""
+Storefront cart API tests with a fake request context (no browser needed).
+"""
+import pytest
+
+from utils.fh_api import FourHandsCartApi, FourHandsApiError
+
+
+class FakeResponse:
+    """Just the APIResponse members FourHandsCartApi reads."""
+
+    def __init__(self, status: int = 200, payload=None):
+        self.status = status
+        self.status_text = "OK" if status < 400 else "Error"
+        self.payload = payload
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    def json(self):
+        return self.payload
+
+
+class FakeStorefront:
+    """Request context serving an in-memory cart; ignore_writes drops adds and deletes."""
+
+    def __init__(self, lines=(), ignore_writes: bool = False):
+        self.lines = list(lines)
+        self.ignore_writes = ignore_writes
+
+    def get(self, url, timeout=None):
+        return FakeResponse(payload={"lineItems": [{"id": line} for line in self.lines]})
+
+    def fetch(self, url, method="GET", data=None, timeout=None):
+        if not self.ignore_writes:
+            self.lines.append(f"line-{data['sku']}")
+        return FakeResponse(201)
+
+    def delete(self, url, timeout=None):
+        if url.endswith("/api/cart"):
+            return FakeResponse(405)
+        if not self.ignore_writes:
+            self.lines.remove(url.rsplit("/", 1)[-1])
+        return FakeResponse(204)
+
+
+def make_api(storefront: FakeStorefront) -> FourHandsCartApi:
+    return FourHandsCartApi(storefront, base_url="https://fh.test")
+
+
+def test_add_products_returns_new_lines():
+    storefront = FakeStorefront(lines=["line-old"])
+
+    assert make_api(storefront).add_products(["A", "B"]) == ["line-A", "line-B"]
+
+
+def test_add_fails_when_cart_reads_back_unchanged():
+    with pytest.raises(FourHandsApiError, match="unchanged"):
+        make_api(FakeStorefront(ignore_writes=True)).add_products(["A"])
+
+
+def test_clear_cart_removes_lines_one_by_one():
+    storefront = FakeStorefront(lines=["line-1", "line-2"])
+
+    assert make_api(storefront).clear_cart() == 2
+    assert storefront.lines == []
+
+
+def test_clear_fails_when_lines_are_left():
+    with pytest.raises(FourHandsApiError, match="2 line"):
+        make_api(FakeStorefront(lines=["line-1", "line-2"], ignore_writes=True)).clear_cart()
@@ -0,0 +1,43 @@
+"""
+File lock tests (no browser needed).
+"""
+import os
+import time
+
+from utils import file_lock
+from utils.file_lock import FileLock
+
+
+def make_stale(path, token: str = "crashed") -> None:
+    path.write_text(token)
+    old = time.time() - 3600
+    os.utime(path, (old, old))
+
+
+def test_stale_lock_file_is_removed(tmp_path):
+    path = tmp_path / "a.lock"
+    make_stale(path)
+
+    with FileLock(path, timeout=1, stale_after=60) as lock:
+        assert lock.owned()
+    assert not path.exists()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_lock_taken_over_during_stale_check_is_put_back(tmp_path, monkeypatch):
+    path = tmp_path / "a.lock"
+    make_stale(path)
+    rename = os.rename
+
+    def taken_over_then_rename(src, dst):
+        # Another waiter removed the stale file and created its own lock
+        os.unlink(src)
+        with open(src, "w") as f:
+            f.write("other-waiter")
+        rename(src, dst)
+
+    monkeypatch.setattr(file_lock.os, "rename", taken_over_then_rename)
+    FileLock(path, stale_after=60)._remove_if_stale()
+
+    assert path.read_text() == "other-waiter"
+    assert [p.name for p in tmp_path.iterdir()] == ["a.lock"]
@@ -0,0 +1,44 @@
+"""
+JUnit result parsing tests against a nested (merged xdist) report.
+"""
+from pathlib import Path
+
+from utils.jira_integration import iter_junit_results
+
+
+JUNIT_NESTED = Path(__file__).parent / "data" / "junit_nested.xml"
+
+
+def read_results() -> list:
+    return list(iter_junit_results(str(JUNIT_NESTED)))
+
+
+def test_nested_suites_yield_each_testcase_once():
+    results = read_results()
+    names = [result['test_name'] for result in results]
+
+    assert len(names) == len(set(names)) == 4
+    assert names == ['test_add_to_cart', 'test_save_for_later', 'test_create_order_QA-7', 'test_without_key']
+
+
+def test_results_are_keyed_by_testcase_properties():
+    results = {result['test_name']: result for result in read_results()}
+
+    assert results['test_add_to_cart']['jira_key'] == 'FH-T101'
+    assert results['test_add_to_cart']['jira_issue'] == 'FH-12'
+    assert results['test_save_for_later']['jira_key'] == 'FH-T102'
+    assert results['test_save_for_later']['jira_issue'] is None
+    # Without the property the key falls back to the test name
+    assert results['test_create_order_QA-7']['jira_key'] == 'QA-7'
+    assert results['test_without_key']['jira_key'] is None
+
+
+def test_status_message_and_duration():
+    results = {result['test_name']: result for result in read_results()}
+
+    assert results['test_add_to_cart']['status'] == 'PASS'
+    assert results['test_add_to_cart']['duration'] == 2.5
+    assert results['test_save_for_later']['status'] == 'FAIL'
+    assert results['test_save_for_later']['message'] == 'AssertionError: saved count mismatch'
+    assert results['test_create_order_QA-7']['status'] == 'BLOCKED'
+    assert results['test_create_order_QA-7']['duration'] == 0.0
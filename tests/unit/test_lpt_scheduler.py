@@ -0,0 +1,73 @@
+"""
+LPT xdist scheduler tests with fake workers (no browser or xdist run needed).
+"""
+from types import SimpleNamespace
+
+from utils.duration_history import DurationHistory
+from utils.lpt_scheduler import LPTScheduling
+
+
+COLLECTION = [
+    "tests/fh/test_pdp.py::test_short",
+    "tests/d365/test_order.py::test_e2e",
+    "tests/fh/test_cart.py::test_medium",
+    "tests/fh/test_cart.py::test_new",
+]
+
+
+class FakeConfig:
+    """Just the options LoadScheduling reads."""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+
+    def getvalue(self, name):
+        return [f"{self.workers}*popen"] if name == "tx" else None
+
+    def getoption(self, name):
+        return None
+
+
+class FakeNode:
+    """Worker controller that records the test indices it is sent."""
+
+    def __init__(self, name: str):
+        self.gateway = SimpleNamespace(id=name)
+        self.sent = []
+        self.shutting_down = False
+
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+def make_scheduler(tmp_path, workers: int):
+    history = DurationHistory(tmp_path / "durations.json")
+    history.update({COLLECTION[0]: 1.0, COLLECTION[1]: 120.0, COLLECTION[2]: 10.0})
+
+    scheduler = LPTScheduling(FakeConfig(workers), history=history)
+    nodes = [FakeNode(f"gw{n}") for n in range(workers)]
+    for node in nodes:
+        scheduler.add_node(node)
+        scheduler.add_node_collection(node, COLLECTION)
+    return scheduler, nodes
+
+
+def test_pending_is_ordered_longest_first(tmp_path):
+    scheduler, nodes = make_scheduler(tmp_path, workers=1)
+    scheduler.schedule()
+
+    # The unknown test is estimated at the median (10s) and keeps its collection order after test_medium
+    sent = [COLLECTION[i] for i in nodes[0].sent + scheduler.pending]
+    assert sent == [COLLECTION[1], COLLECTION[2], COLLECTION[3], COLLECTION[0]]
+
+
+def test_longest_tests_start_on_different_workers(tmp_path):
+    scheduler, nodes = make_scheduler(tmp_path, workers=2)
+    scheduler.schedule()
+
+    assert [COLLECTION[i] for i in nodes[0].sent] == [COLLECTION[1], COLLECTION[3]]
+    assert [COLLECTION[i] for i in nodes[1].sent] == [COLLECTION[2], COLLECTION[0]]
+    assert scheduler.pending == []
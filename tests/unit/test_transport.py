@@ -0,0 +1,71 @@
+"""
+Jira/Zephyr transport layer tests against the local stub server.
+"""
+import pytest
+import requests
+
+from utils.jira_integration import JiraZephyrIntegration, TransportConfig, create_session
+from tests.unit.stub_jira_server import StubJiraServer
+
+
+RESULT_PATH = "/rest/atm/1.0/testrun/FH-C1/testcase/FH-T1/testresult"
+
+
+def make_session(**overrides) -> requests.Session:
+    """Session with fast backoff for tests."""
+    config = TransportConfig(backoff_factor=0, **overrides)
+    return create_session(config, {'Content-Type': 'application/json'})
+
+
+def test_default_timeout_applies_to_hung_requests():
+    with StubJiraServer(latency=1.0) as server:
+        session = make_session(read_timeout=0.1, max_retries=0)
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            session.post(server.url + RESULT_PATH, json={"status": "Pass"})
+
+
+def test_rate_limited_post_is_retried():
+    with StubJiraServer(rate_limit_every=2) as server:
+        session = make_session()
+        responses = [session.post(server.url + RESULT_PATH, json={"status": "Pass"}) for _ in range(3)]
+
+    assert all(r.status_code == 201 for r in responses)
+    assert server.throttled > 0
+
+
+def test_server_error_on_post_is_not_replayed():
+    with StubJiraServer(server_error_every=1) as server:
+        response = make_session().post(server.url + RESULT_PATH, json={"status": "Pass"})
+
+    assert response.status_code == 503
+    assert len(server.requests) == 1
+
+
+def test_gzip_request_bodies():
+    with StubJiraServer() as server:
+        session = make_session(gzip_requests=True, gzip_min_bytes=10)
+        response = session.post(server.url + RESULT_PATH, json={"status": "Pass", "comment": "x" * 100})
+
+    assert response.status_code == 201
+    assert server.gzipped == 1
+    assert server.results["FH-T1"]["comment"] == "x" * 100
+
+
+def test_update_test_results_uses_transport(tmp_path, monkeypatch):
+    junit = tmp_path / "results.xml"
+    junit.write_text(
+        '<testsuites><testsuite name="s">'
+        '<testcase classname="tests.fh" name="test_a"><properties>'
+        '<property name="jira_test_case" value="FH-T1"/></properties></testcase>'
+        '<testcase classname="tests.fh" name="test_b"><properties>'
+        '<property name="jira_test_case" value="FH-T2"/></properties>'
+        '<failure message="boom"/></testcase>'
+        '</testsuite></testsuites>'
+    )
+
+    with StubJiraServer() as server:
+        monkeypatch.setenv("JIRA_BASE_URL", server.url)
+        JiraZephyrIntegration().update_test_results("FH-C1", str(junit))
+
+    assert server.results["FH-T1"]["status"] == "Pass"
+    assert server.results["FH-T2"]["status"] == "Fail"
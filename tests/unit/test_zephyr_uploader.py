@@ -0,0 +1,117 @@
+"""
+Zephyr result uploader tests against the local stub server.
+
+Run with -s to see the throughput numbers.
+"""
+import time
+import pytest
+import requests
+
+from utils.jira_integration import ZephyrResultUploader
+from tests.unit.stub_jira_server import StubJiraServer
+
+
+def make_results(count: int) -> list:
+    """Build parsed results like iter_junit_results yields."""
+    return [
+        {
+            'test_name': f'test_case_{n}',
+            'classname': 'tests.fh.test_cart',
+            'status': 'FAIL' if n % 10 == 0 else 'PASS',
+            'duration': 1.5,
+            'message': 'AssertionError' if n % 10 == 0 else '',
+            'jira_key': f'FH-T{n}'
+        }
+        for n in range(1, count + 1)
+    ]
+
+
+def make_uploader(server: StubJiraServer, **kwargs) -> ZephyrResultUploader:
+    """Uploader pointed at the stub, with fast backoff."""
+    kwargs.setdefault('backoff_factor', 0.01)
+    return ZephyrResultUploader(requests.Session(), server.url, **kwargs)
+
+
+def test_bulk_upload_sends_batches():
+    with StubJiraServer() as server:
+        summary = make_uploader(server, batch_size=25).upload('FH-C1', make_results(100))
+
+    assert summary['mode'] == 'bulk'
+    assert summary['uploaded'] == 100
+    assert summary['requests'] == 4
+    assert server.results['FH-T10']['status'] == 'Fail'
+    assert server.results['FH-T11']['executionTime'] == 1500
+
+
+def test_falls_back_to_single_requests_without_bulk_endpoint():
+    with StubJiraServer(bulk_supported=False) as server:
+        summary = make_uploader(server, batch_size=25).upload('FH-C1', make_results(30))
+
+    assert summary['mode'] == 'single'
+    assert summary['uploaded'] == 30
+    assert len(server.results) == 30
+
+
+def test_rejected_batch_keeps_valid_results():
+    with StubJiraServer(unknown_keys={'FH-T3'}) as server:
+        summary = make_uploader(server, batch_size=10).upload('FH-C1', make_results(10))
+
+    assert summary['uploaded'] == 9
+    assert summary['failed'] == 1
+    assert 'FH-T3' not in server.results
+
+
+def test_retries_rate_limited_and_server_errors():
+    with StubJiraServer(bulk_supported=False, rate_limit_every=5, server_error_every=11) as server:
+        summary = make_uploader(server, max_workers=4, max_retries=10).upload('FH-C1', make_results(40))
+
+    assert summary['uploaded'] == 40
+    assert summary['retries'] > 0
+    assert server.throttled > 0
+
+
+def test_honours_retry_after():
+    with StubJiraServer(bulk_supported=False, rate_limit_every=2, retry_after="0.2") as server:
+        start = time.perf_counter()
+        summary = make_uploader(server, max_workers=1, backoff_factor=0).upload('FH-C1', make_results(1))
+        elapsed = time.perf_counter() - start
+
+    assert summary['uploaded'] == 1
+    assert summary['retries'] == 1
+    assert elapsed >= 0.2
+
+
+def test_skips_results_without_jira_key():
+    results = make_results(3)
+    results[1]['jira_key'] = None
+
+    with StubJiraServer() as server:
+        summary = make_uploader(server).upload('FH-C1', results)
+
+    assert summary['uploaded'] == 2
+    assert summary['failed'] == 0
+
+
+@pytest.mark.slow
+def test_concurrent_upload_throughput():
+    """Per-test uploads with 10 ms server latency: thread pool vs serial."""
+    results = make_results(100)
+
+    with StubJiraServer(latency=0.01, bulk_supported=False) as server:
+        serial = make_uploader(server, max_workers=1, batch_size=1).upload('FH-C1', results)
+        serial_peak = server.peak_in_flight
+    with StubJiraServer(latency=0.01, bulk_supported=False) as server:
+        concurrent = make_uploader(server, max_workers=8, batch_size=1).upload('FH-C1', results)
+        concurrent_peak = server.peak_in_flight
+    with StubJiraServer(latency=0.01) as server:
+        bulk = make_uploader(server, max_workers=8, batch_size=50).upload('FH-C1', results)
+
+    for label, summary in (("serial", serial), ("concurrent", concurrent), ("bulk", bulk)):
+        print(f"\n  {label:<10} {summary['elapsed']:.2f}s  "
+              f"{summary['uploaded'] / summary['elapsed']:8.0f} results/s  {summary['requests']} requests")
+
+    assert serial['uploaded'] == concurrent['uploaded'] == bulk['uploaded'] == 100
+    # Wall-clock times are only printed; the server-side overlap is what proves concurrency
+    assert serial_peak == 1
+    assert concurrent_peak > 1
+    assert bulk['requests'] == 2
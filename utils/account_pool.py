@@ -0,0 +1,327 @@
+"""
+Leased FourHands test accounts for parallel cart and checkout tests.
+
+Every account has one cart, so tests running at the same time must not
+share an account. The pool lists N accounts (FH_ACCOUNTS_FILE); lease()
+hands one out exclusively across pytest-xdist workers through a lock file
+per account, and release() frees it again. Each account has its own
+storage state, logged in and refreshed by a SessionCache when the account
+has credentials.
+
+    pool = get_fh_account_pool()
+    with pool.lease("gw0") as lease:
+        state = pool.storage_state(lease.account, browser)
+
+Without an accounts file the pool holds the single shared account
+(storage_state/fh_auth.json), which is never locked, as before.
+"""
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+from urllib.parse import urlparse
+from playwright.sync_api import Browser, Playwright
+
+from configs.playwright_config import (
+    FH_BASE_URL,
+    FH_ACCOUNTS_FILE,
+    FH_ACCOUNT_STATE_DIR,
+    FH_ACCOUNT_LEASE_TIMEOUT,
+    FH_ACCOUNT_LEASE_STALE,
+)
+from utils.auth_helper import FourHandsAuth
+from utils.fh_api import FourHandsCartApi
+from utils.file_lock import FileLock, FileLockTimeout
+from utils.session_cache import SessionCache
+
+
+SHARED_STORAGE_STATE = "storage_state/fh_auth.json"
+
+
+@dataclass
+class Account:
+    """
+    One FourHands test account.
+
+    Attributes:
+        name: Short unique name (used for lock, storage state and pool keys)
+        storage_state: Storage state file of this account
+        username: Login email (None for a pre-recorded storage state only)
+        password: Login password
+    """
+    name: str
+    storage_state: Path
+    username: Optional[str] = None
+    password: Optional[str] = field(default=None, repr=False)
+
+    @property
+    def can_login(self) -> bool:
+        """True if the account can log in to create or refresh its session."""
+        return bool(self.username and self.password)
+
+
+class AccountLease:
+    """Exclusive use of an account until release()."""
+
+    def __init__(self, account: Account, lock: Optional[FileLock], owner: str):
+        """
+        Initialize the lease.
+
+        Args:
+            account: Leased account
+            lock: Held lock file (None for the unlocked shared account)
+            owner: Worker/test holding the lease, for messages
+        """
+        self.account = account
+        self.lock = lock
+        self.owner = owner
+
+    def release(self) -> None:
+        """Free the account for other workers."""
+        if self.lock and self.lock.held:
+            self.lock.release()
+            print(f"🔓 {self.owner} released FH account {self.account.name}")
+
+    def __enter__(self) -> "AccountLease":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.release()
+
+
+class AccountPool:
+    """
+    Accounts handed out exclusively across processes.
+
+    Usage:
+        pool = AccountPool(load_accounts("configs/fh_accounts.json"), "storage_state/fh_accounts")
+        lease = pool.lease("gw1")
+        ...
+        lease.release()
+    """
+
+    def __init__(
+        self,
+        accounts: List[Account],
+        lock_dir: Union[str, Path] = FH_ACCOUNT_STATE_DIR,
+        lease_timeout: float = FH_ACCOUNT_LEASE_TIMEOUT,
+        stale_after: float = FH_ACCOUNT_LEASE_STALE,
+        shared: bool = False,
+        poll_interval: float = 0.5
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            accounts: Accounts to lease
+            lock_dir: Directory for the per-account lock files
+            lease_timeout: Maximum seconds to wait for a free account
+            stale_after: Lock files not refreshed for this long are removed
+            shared: Hand out the first account without locking (single shared account)
+            poll_interval: Seconds between attempts while every account is leased
+        """
+        if not accounts:
+            raise ValueError("Account pool needs at least one account")
+        self.accounts = list(accounts)
+        self.lock_dir = Path(lock_dir)
+        self.lease_timeout = lease_timeout
+        self.stale_after = stale_after
+        self.shared = shared
+        self.poll_interval = poll_interval
+        self._sessions: Dict[str, SessionCache] = {}
+
+    def lease(self, owner: str) -> AccountLease:
+        """
+        Lease a free account, waiting while all of them are in use.
+
+        Args:
+            owner: Worker/test id, also used to spread workers over accounts
+
+        Returns:
+            AccountLease: Lease of the account
+
+        Raises:
+            FileLockTimeout: If no account became free within lease_timeout
+        """
+        if self.shared:
+            return AccountLease(self.accounts[0], None, owner)
+
+        deadline = time.monotonic() + self.lease_timeout
+        while True:
+            for account in self._order(owner):
+                # The heartbeat keeps a lease held for a whole worker session fresh,
+                # so only the lease of a crashed worker ever turns stale
+                lock = FileLock(
+                    self.lock_dir / f"{account.name}.lease",
+                    timeout=0,
+                    stale_after=self.stale_after,
+                    heartbeat=max(1.0, self.stale_after / 4)
+                )
+                try:
+                    lock.acquire()
+                except FileLockTimeout:
+                    continue
+                print(f"🔑 {owner} leased FH account {account.name}")
+                return AccountLease(account, lock, owner)
+
+            if time.monotonic() >= deadline:
+                raise FileLockTimeout(
+                    f"No free FH account among {len(self.accounts)} within {self.lease_timeout}s"
+                )
+            time.sleep(self.poll_interval)
+
+    def lease_scope(self, requested: str, workers: int) -> str:
+        """
+        Effective lease scope for a run.
+
+        A lease per worker needs an account for every worker; with more
+        workers than accounts the extra workers would wait for the whole
+        run, so the run falls back to a lease per test.
+
+        Args:
+            requested: 'worker' or 'test' (FH_ACCOUNT_LEASE)
+            workers: Number of xdist workers (1 without xdist)
+
+        Returns:
+            str: 'worker' or 'test'
+        """
+        if requested == "worker" and workers > len(self.accounts):
+            print(
+                f"⚠️ {workers} workers but {len(self.accounts)} FH accounts: "
+                "leasing accounts per test instead of per worker"
+            )
+            return "test"
+        return "test" if requested == "test" else "worker"
+
+    def _order(self, owner: str) -> List[Account]:
+        """Accounts rotated by the worker number, so workers start on different accounts."""
+        digits = re.findall(r"\d+", owner)
+        start = int(digits[0]) % len(self.accounts) if digits else 0
+        return self.accounts[start:] + self.accounts[:start]
+
+    def has_session(self, account: Account) -> bool:
+        """Check if the account has a storage state or can create one (no browser needed)."""
+        return account.storage_state.exists() or account.can_login
+
+    def storage_state(self, account: Account, browser: Browser) -> Optional[str]:
+        """
+        Storage state path of an account, logging in first when needed.
+
+        Args:
+            account: Leased account
+            browser: Browser used for a login
+
+        Returns:
+            Optional[str]: Storage state path, or None if there is no session
+        """
+        if not account.can_login:
+            return str(account.storage_state) if account.storage_state.exists() else None
+
+        session = self._sessions.get(account.name)
+        if session is None:
+            session = SessionCache(
+                account.storage_state,
+                login=lambda page: FourHandsAuth(page).login(account.username, account.password),
+                domains=[urlparse(FH_BASE_URL).hostname or ""]
+            )
+            self._sessions[account.name] = session
+        return session.ensure(browser)
+
+
+def load_accounts(path: Union[str, Path], state_dir: Union[str, Path] = FH_ACCOUNT_STATE_DIR) -> List[Account]:
+    """
+    Read accounts from a JSON list of {name, username, password_env}.
+
+    Passwords come from the environment variable named by password_env, or
+    FH_PASSWORD when it is not given; they are never stored in the file.
+
+    Args:
+        path: Accounts file
+        state_dir: Directory for the per-account storage states
+
+    Returns:
+        List[Account]: Accounts (empty if the file does not exist)
+
+    Raises:
+        ValueError: If an entry has no name or names repeat
+    """
+    path = Path(path)
+    if not path.exists():
+        return []
+
+    accounts = []
+    for entry in json.loads(path.read_text()):
+        name = entry.get("name")
+        if not name:
+            raise ValueError(f"Account without a name in {path}: {entry.get('username')}")
+        password = os.getenv(entry.get("password_env") or "FH_PASSWORD")
+        accounts.append(Account(
+            name=name,
+            storage_state=Path(entry.get("storage_state") or Path(state_dir) / f"{name}.json"),
+            username=entry.get("username"),
+            password=password
+        ))
+
+    names = [account.name for account in accounts]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate account names in {path}: {', '.join(duplicates)}")
+    return accounts
+
+
+def reset_cart(playwright: Playwright, account: Account, base_url: str = FH_BASE_URL) -> bool:
+    """
+    Empty an account's cart and Saved for Later through the storefront API.
+
+    Uses a standalone request context with the account's storage state, so
+    no browser context is needed.
+
+    Args:
+        playwright: Playwright instance
+        account: Account whose cart is reset
+        base_url: Storefront origin
+
+    Returns:
+        bool: True if the cart was reset (False without a session)
+
+    Raises:
+        FourHandsApiError: If a line is left in the cart or Saved for Later
+    """
+    if not account.storage_state.exists():
+        return False
+
+    request_context = playwright.request.new_context(
+        base_url=base_url, storage_state=str(account.storage_state)
+    )
+    try:
+        api = FourHandsCartApi(request_context, base_url=base_url)
+        api.clear_cart()
+        api.clear_saved_for_later()
+    finally:
+        request_context.dispose()
+    return True
+
+
+# Global pool (built on first use)
+_fh_account_pool: Optional[AccountPool] = None
+
+
+def get_fh_account_pool() -> AccountPool:
+    """
+    Get the FourHands account pool.
+
+    Returns:
+        AccountPool: Accounts from FH_ACCOUNTS_FILE, or the shared account
+    """
+    global _fh_account_pool
+    if _fh_account_pool is None:
+        accounts = load_accounts(FH_ACCOUNTS_FILE)
+        if accounts:
+            _fh_account_pool = AccountPool(accounts)
+        else:
+            shared = Account("shared", Path(SHARED_STORAGE_STATE))
+            _fh_account_pool = AccountPool([shared], shared=True)
+    return _fh_account_pool
@@ -0,0 +1,204 @@
+"""
+Background artifact writer for Allure attachments.
+
+Videos are only finalized by Playwright after the page closes, and reading
+them into memory for allure.attach() costs both wall-clock time and RSS.
+The writer reserves the attachment in the Allure result on the test thread
+(cheap, metadata only) and lets a background thread wait for the file to be
+finalized and hardlink/copy it into the results directory.
+
+Reserving uses allure-commons' private reporter API (pinned in
+requirements.txt); if it is unavailable the writer falls back to a plain
+allure.attach.file() on the test thread once the file is finalized.
+"""
+import os
+import queue
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+from uuid import uuid4
+
+import allure
+
+
+class ArtifactWriter:
+    """
+    Streams finished artifacts into the Allure results directory off the test thread.
+
+    Usage:
+        writer = get_artifact_writer()
+        writer.submit_file(config, video_path, "Test Video", allure.attachment_type.WEBM)
+        ...
+        writer.close()  # at session end, waits for pending files
+    """
+
+    def __init__(self, settle_seconds: float = 0.3, finalize_timeout: float = 60):
+        """
+        Initialize the writer.
+
+        Args:
+            settle_seconds: How long the file size must stay unchanged to count as finalized
+            finalize_timeout: Maximum time to wait for a file to be finalized
+        """
+        self.settle_seconds = settle_seconds
+        self.finalize_timeout = finalize_timeout
+        self._queue: "queue.Queue[Optional[Tuple[str, Path]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.written = 0
+        self.failed = 0
+
+    def submit_file(self, config, source: str, name: str, attachment_type) -> bool:
+        """
+        Attach a file to the running test without reading it.
+
+        Must be called from the test thread while the test is active (e.g.
+        from pytest_runtest_makereport), because Allure tracks the current
+        test per thread.
+
+        Args:
+            config: pytest config (used to find the Allure listener)
+            source: Path of the file being written by Playwright
+            name: Attachment name shown in Allure
+            attachment_type: allure.attachment_type value
+
+        Returns:
+            bool: True if the file was queued or attached, False if Allure is
+                not active or the file could not be attached
+        """
+        report_dir = getattr(config.option, "allure_report_dir", None)
+        listener = config.pluginmanager.get_plugin("allure_listener")
+        if not report_dir or listener is None:
+            return False
+
+        reserved = _reserve_attachment(listener, report_dir, name, attachment_type)
+        if reserved is None:
+            return self._attach_now(source, name, attachment_type)
+
+        self._ensure_started()
+        self._queue.put((source, reserved))
+        return True
+
+    def _attach_now(self, source: str, name: str, attachment_type) -> bool:
+        """Fallback: wait for the file on the test thread and attach it through the public API."""
+        if not self._wait_until_finalized(source):
+            print(f"Could not attach {source}: file was not finalized")
+            self.failed += 1
+            return False
+
+        allure.attach.file(source, name=name, attachment_type=attachment_type)
+        self.written += 1
+        return True
+
+    def close(self) -> None:
+        """Wait until every queued artifact has been written and stop the thread."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join()
+
+    def _ensure_started(self) -> None:
+        """Start the worker thread on first use."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="allure-artifact-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        """Worker loop: wait for each file to be finalized, then link/copy it."""
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+
+            source, destination = job
+            try:
+                if self._wait_until_finalized(source):
+                    _link_or_copy(source, destination)
+                    self.written += 1
+                else:
+                    print(f"Could not attach {source}: file was not finalized")
+                    self.failed += 1
+            except Exception as e:
+                print(f"Could not attach {source}: {e}")
+                self.failed += 1
+
+    def _wait_until_finalized(self, path: str) -> bool:
+        """
+        Wait until the file exists and its size stops changing.
+
+        Args:
+            path: File path
+
+        Returns:
+            bool: True if the file looks finalized within the timeout
+        """
+        deadline = time.monotonic() + self.finalize_timeout
+        last_size = -1
+        stable_since = None
+
+        while time.monotonic() < deadline:
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                size = -1
+
+            if size > 0 and size == last_size:
+                stable_since = stable_since or time.monotonic()
+                if time.monotonic() - stable_since >= self.settle_seconds:
+                    return True
+            else:
+                stable_since = None
+                last_size = size
+
+            time.sleep(0.1)
+
+        return False
+
+
+def _reserve_attachment(listener, report_dir: str, name: str, attachment_type) -> Optional[Path]:
+    """
+    Register an attachment in the current Allure test result.
+
+    Returns the destination path the file must be written to, or None when
+    the reporter's private _attach is missing or has changed.
+    """
+    try:
+        file_name = listener.allure_logger._attach(
+            uuid4(), name=name, attachment_type=attachment_type
+        )
+    except (AttributeError, TypeError) as e:
+        print(f"Allure attachment reservation unavailable ({e}), attaching in place")
+        return None
+    if not isinstance(file_name, str):
+        return None
+    return Path(report_dir) / file_name
+
+
+def _link_or_copy(source: str, destination: Path) -> None:
+    """Hardlink the file into place, falling back to a streamed copy."""
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+
+artifact_writer = ArtifactWriter()
+
+
+def get_artifact_writer() -> ArtifactWriter:
+    """
+    Get the global artifact writer instance.
+
+    Returns:
+        ArtifactWriter: The artifact writer
+    """
+    return artifact_writer
@@ -0,0 +1,127 @@
+"""
+Background event loop for the async page objects (pages/aio).
+
+pytest-playwright drives the sync API on the main thread, so async flows
+run on a dedicated thread with its own event loop, async_playwright driver
+and browser. Tests stay synchronous and hand a coroutine function over:
+
+    async def check(browser):
+        context = await browser.new_context(**get_context_options())
+        pages = [AsyncFourHandsProductDetailPage(await context.new_page()) for _ in skus]
+        return await gather_limited(page.navigate_to_product(sku) for page, sku in zip(pages, skus))
+
+    results = async_runner.run(check)
+
+Step timings (utils/timing.py) are not recorded for async calls: the step
+stack is per thread and interleaved coroutines would corrupt it.
+"""
+import asyncio
+import os
+import threading
+from typing import Any, Awaitable, Callable, Iterable, List, Optional
+from playwright.async_api import Browser, async_playwright
+
+from configs.playwright_config import ASYNC_CONCURRENCY, get_browser_launch_options
+from configs.browserstack_config import get_browserstack_cdp_url
+
+
+class AsyncBrowserRunner:
+    """Owns an event loop thread with an async Playwright browser."""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._playwright = None
+        self.browser: Optional[Browser] = None
+
+    @property
+    def started(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> "AsyncBrowserRunner":
+        """Start the loop thread and launch (or connect to) the browser."""
+        if self.started:
+            return self
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="async-playwright", daemon=True
+        )
+        self._thread.start()
+        self._submit(self._launch()).result()
+        return self
+
+    async def _launch(self) -> None:
+        self._playwright = await async_playwright().start()
+        use_bs = os.getenv("USE_BROWSERSTACK", "false").lower()
+        if use_bs == "false" or use_bs == "":
+            self.browser = await self._playwright.chromium.launch(**get_browser_launch_options())
+        else:
+            self.browser = await self._playwright.chromium.connect_over_cdp(get_browserstack_cdp_url())
+        print("🧵 Async browser started")
+
+    def _submit(self, coro: Awaitable) -> "asyncio.Future":
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def run(self, fn: Callable[[Browser], Awaitable[Any]], timeout: Optional[float] = None) -> Any:
+        """
+        Run fn(browser) on the loop thread and wait for its result.
+
+        Args:
+            fn: Coroutine function taking the async Browser
+            timeout: Seconds to wait (default: no limit)
+
+        Returns:
+            Any: Whatever fn returns (exceptions are re-raised here)
+        """
+        self.start()
+        return self._submit(fn(self.browser)).result(timeout)
+
+    def close(self) -> None:
+        """Close the browser, stop the driver and the loop thread."""
+        if not self.started:
+            return
+
+        async def _shutdown():
+            if self.browser:
+                await self.browser.close()
+            if self._playwright:
+                await self._playwright.stop()
+
+        try:
+            self._submit(_shutdown()).result(30)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(5)
+            self._loop.close()
+            self._loop = self._thread = None
+            self._playwright = self.browser = None
+
+
+async def gather_limited(coros: Iterable[Awaitable[Any]], limit: int = ASYNC_CONCURRENCY) -> List[Any]:
+    """
+    asyncio.gather with at most `limit` awaitables running at once.
+
+    Args:
+        coros: Awaitables to run
+        limit: Concurrency limit (default: ASYNC_CONCURRENCY)
+
+    Returns:
+        List[Any]: Results in input order (first exception is raised)
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def _bounded(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(_bounded(coro) for coro in coros))
+
+
+# Global runner (one per process / xdist worker)
+_async_runner = AsyncBrowserRunner()
+
+
+def get_async_runner() -> AsyncBrowserRunner:
+    """Get the global async browser runner (started on first run())."""
+    return _async_runner
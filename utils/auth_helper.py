@@ -4,9 +4,14 @@ D365 Authentication Helper for BrowserStack
 Handles login flow programmatically so tests can run on BrowserStack.
 """
 import os
+from typing import Optional
 from playwright.sync_api import Page
 from pathlib import Path
 
+from configs.playwright_config import D365_SESSION_PATH
+from utils.file_lock import FileLock
+from utils.session_cache import SessionCache, write_storage_state
+
 
 class D365Auth:
     """Handle D365 authentication for both local and BrowserStack."""
@@ -20,9 +25,8 @@ class D365Auth:
         return os.getenv("BROWSERSTACK_USERNAME") is not None
     
     def has_local_storage_state(self) -> bool:
-        """Check if local storage state exists."""
-        storage_path = Path("storage_state/d365_session.json")
-        return storage_path.exists()
+        """Check if a local storage state exists and has not expired."""
+        return get_d365_session_cache().is_valid()
     
     def login(self, username: str = None, password: str = None):
         """
@@ -99,8 +103,23 @@ class D365Auth:
         if "login" in self.page.url.lower() or "microsoft" in self.page.url.lower():
             print("🔓 Not authenticated. Logging in...")
             self.login()
+            self.save_session()
         else:
             print("✅ Already authenticated!")
+    
+    def save_session(self, path: Optional[str] = None) -> None:
+        """
+        Save the current context's storage state so other tests and workers reuse it.
+        
+        Written atomically under the session cache's lock, so workers reading
+        the cache never see a partial file or race a refresh.
+        
+        Args:
+            path: Storage state path (defaults to the D365 session cache)
+        """
+        path = Path(path or D365_SESSION_PATH)
+        with FileLock(f"{path}.lock", timeout=600):
+            write_storage_state(self.page.context, path)
 
 
 class FourHandsAuth:
@@ -194,3 +213,23 @@ class FourHandsAuth:
             self.login()
         else:
             print("✅ Already authenticated!")
+
+
+_d365_session_cache: Optional[SessionCache] = None
+
+
+def get_d365_session_cache() -> SessionCache:
+    """
+    Get the D365 session cache (storage state refreshed by programmatic login).
+    
+    Returns:
+        SessionCache: The D365 session cache
+    """
+    global _d365_session_cache
+    if _d365_session_cache is None:
+        _d365_session_cache = SessionCache(
+            D365_SESSION_PATH,
+            login=lambda page: D365Auth(page).login(),
+            domains=["dynamics.com"]
+        )
+    return _d365_session_cache
@@ -0,0 +1,231 @@
+"""
+Artifact capture policy for screenshots, HTML, video and traces.
+
+Each artifact has its own policy:
+    off         - never captured
+    on-failure  - recorded during the test, kept only when it fails
+    on-retry    - recorded and kept only on rerun attempts (pytest-rerunfailures)
+    always      - recorded and kept for every test
+"""
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+from weakref import WeakSet
+from playwright.sync_api import BrowserContext
+
+from configs.playwright_config import (
+    SCREENSHOT_ON,
+    HTML_ON,
+    VIDEO_ON,
+    TRACE_ON,
+    TRACE_SCREENSHOTS,
+    TRACE_SNAPSHOTS,
+    TRACE_SOURCES,
+    VIEWPORT,
+)
+from utils.timing import timed
+
+
+OFF = "off"
+ON_FAILURE = "on-failure"
+ON_RETRY = "on-retry"
+ALWAYS = "always"
+
+POLICIES = (OFF, ON_FAILURE, ON_RETRY, ALWAYS)
+
+# Playwright-style names accepted for compatibility with VIDEO_ON/TRACE_ON
+_ALIASES = {
+    "retain-on-failure": ON_FAILURE,
+    "only-on-failure": ON_FAILURE,
+    "on-first-retry": ON_RETRY,
+    "retain-on-first-failure": ON_FAILURE,
+    "on": ALWAYS,
+    "true": ALWAYS,
+    "false": OFF,
+}
+
+VIDEO_DIR = "test-results/videos"
+TRACE_DIR = "test-results/traces"
+
+# Contexts with tracing running; pooled contexts keep it across tests
+_traced_contexts = WeakSet()
+
+
+def normalize_policy(value: Optional[str], default: str = ON_FAILURE) -> str:
+    """
+    Normalize a policy string.
+
+    Args:
+        value: Raw policy value (e.g. from environment)
+        default: Policy used when value is empty or unknown
+
+    Returns:
+        str: One of POLICIES
+    """
+    if not value:
+        return default
+    value = value.strip().lower()
+    value = _ALIASES.get(value, value)
+    return value if value in POLICIES else default
+
+
+def is_retry(item) -> bool:
+    """Check if the test item is running a rerun attempt."""
+    return getattr(item, "execution_count", 1) > 1
+
+
+def ensure_tracing(context: BrowserContext) -> None:
+    """
+    Start tracing on a context once, with the configured granularity.
+
+    Tests then record chunks (start_chunk/stop_chunk), so a passing test
+    costs no trace serialization and a pooled context is not restarted.
+
+    Args:
+        context: Context to trace
+    """
+    if context in _traced_contexts:
+        return
+    context.tracing.start(
+        screenshots=TRACE_SCREENSHOTS,
+        snapshots=TRACE_SNAPSHOTS,
+        sources=TRACE_SOURCES
+    )
+    _traced_contexts.add(context)
+
+
+def has_failed(item) -> bool:
+    """Check if setup or call of the test item failed (reports stored by the makereport hook)."""
+    for when in ("setup", "call"):
+        report = getattr(item, f"rep_{when}", None)
+        if report is not None and report.failed:
+            return True
+    return False
+
+
+@dataclass
+class CapturePolicy:
+    """Capture policy per artifact type."""
+    screenshot: str
+    html: str
+    video: str
+    trace: str
+
+    @classmethod
+    def load(cls) -> "CapturePolicy":
+        """
+        Load capture policy from configuration.
+
+        Returns:
+            CapturePolicy: Populated policy
+        """
+        return cls(
+            screenshot=normalize_policy(SCREENSHOT_ON),
+            html=normalize_policy(HTML_ON),
+            video=normalize_policy(VIDEO_ON),
+            trace=normalize_policy(TRACE_ON),
+        )
+
+    def records(self, artifact: str, retrying: bool = False) -> bool:
+        """
+        Check if an artifact must be recorded while the test runs.
+
+        Video and traces have to be recorded up front because the outcome
+        is not known yet.
+
+        Args:
+            artifact: 'screenshot', 'html', 'video' or 'trace'
+            retrying: Whether this is a rerun attempt
+        """
+        policy = getattr(self, artifact)
+        return policy in (ALWAYS, ON_FAILURE) or (policy == ON_RETRY and retrying)
+
+    def keeps(self, artifact: str, failed: bool, retrying: bool = False) -> bool:
+        """
+        Check if an artifact should be captured/kept once the outcome is known.
+
+        Args:
+            artifact: 'screenshot', 'html', 'video' or 'trace'
+            failed: Whether the test failed
+            retrying: Whether this is a rerun attempt
+        """
+        policy = getattr(self, artifact)
+        if policy == ALWAYS:
+            return True
+        if policy == ON_FAILURE:
+            return failed
+        if policy == ON_RETRY:
+            return retrying
+        return False
+
+    def video_options(self, retrying: bool = False) -> dict:
+        """
+        Context options enabling video recording when the policy needs it.
+
+        Args:
+            retrying: Whether this is a rerun attempt
+
+        Returns:
+            dict: record_video_* options, or empty dict
+        """
+        if not self.records("video", retrying):
+            return {}
+        return {
+            "record_video_dir": VIDEO_DIR,
+            "record_video_size": dict(VIEWPORT),
+        }
+
+    def start_trace(self, context: BrowserContext, item) -> bool:
+        """
+        Start a trace chunk for the test if the policy needs it.
+
+        Args:
+            context: Context to trace
+            item: pytest item of the running test
+
+        Returns:
+            bool: True if a chunk was started
+        """
+        if not self.records("trace", is_retry(item)):
+            return False
+        ensure_tracing(context)
+        context.tracing.start_chunk(title=item.nodeid)
+        return True
+
+    @timed("artifact")
+    def finish_trace(self, context: BrowserContext, item, prefix: str = "trace") -> Optional[str]:
+        """
+        Stop the test's trace chunk, writing the zip only when the policy keeps it.
+
+        Args:
+            context: Traced context
+            item: pytest item of the finished test
+            prefix: Trace file name prefix
+
+        Returns:
+            Optional[str]: Trace path if written
+        """
+        if not self.keeps("trace", has_failed(item), is_retry(item)):
+            context.tracing.stop_chunk()
+            return None
+
+        test_name = re.sub(r"[^\w.-]+", "_", item.name)[:80]
+        trace_path = f"{TRACE_DIR}/{prefix}-{test_name}-{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+        Path(TRACE_DIR).mkdir(parents=True, exist_ok=True)
+        context.tracing.stop_chunk(path=trace_path)
+        return trace_path
+
+
+capture_policy = CapturePolicy.load()
+
+
+def get_capture_policy() -> CapturePolicy:
+    """
+    Get the global capture policy instance.
+
+    Returns:
+        CapturePolicy: The capture policy
+    """
+    return capture_policy
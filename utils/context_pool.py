@@ -0,0 +1,260 @@
+"""
+Worker-scoped browser context pool.
+
+Keeps pre-warmed BrowserContexts per pytest (xdist) worker so tests do not
+pay the new_context() cost every time. Contexts are reset between tests
+instead of being closed.
+"""
+import json
+import time
+import contextlib
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+from urllib.parse import urlparse
+from playwright.sync_api import Browser, BrowserContext, Page, Route
+
+
+# Blank document served for storage-reset navigations (never hits the network)
+_BLANK_DOCUMENT = "<!doctype html><title>reset</title>"
+
+# Clears web storage for the current origin and re-seeds saved localStorage
+_RESET_STORAGE_SCRIPT = """
+(items) => {
+    try { window.localStorage.clear(); } catch (e) {}
+    try { window.sessionStorage.clear(); } catch (e) {}
+    for (const item of items) {
+        try { window.localStorage.setItem(item.name, item.value); } catch (e) {}
+    }
+}
+"""
+
+
+class _PooledContext:
+    """Bookkeeping for a single pooled context."""
+
+    def __init__(self, key: str, context: BrowserContext, storage_state: Optional[dict]):
+        self.key = key
+        self.context = context
+        self.storage_state = storage_state
+        self.visited_origins: Set[str] = set()
+        self.in_use = False
+
+        context.on("page", self._watch_page)
+
+    def _watch_page(self, page: Page) -> None:
+        """Remember every origin a page navigates to so it can be reset later."""
+        page.on("framenavigated", lambda frame: self._remember(frame.url))
+
+    def _remember(self, url: str) -> None:
+        parsed = urlparse(url)
+        if parsed.scheme in ("http", "https") and parsed.netloc:
+            self.visited_origins.add(f"{parsed.scheme}://{parsed.netloc}")
+
+
+class ContextPool:
+    """
+    Pool of pre-warmed browser contexts for one worker.
+
+    Contexts are grouped by key (e.g. 'default', 'authenticated', 'fh') because
+    each group is created with different options/storage state.
+
+    Usage:
+        pool = ContextPool(browser, size=2)
+        context = pool.acquire("fh", {"storage_state": "storage_state/fh_auth.json"})
+        ...
+        pool.release(context)
+    """
+
+    def __init__(self, browser: Browser, size: int = 2):
+        """
+        Initialize the context pool.
+
+        Args:
+            browser: Browser the contexts are created from
+            size: Number of contexts to pre-warm per key
+        """
+        self.browser = browser
+        self.size = max(1, size)
+        self._entries: Dict[str, List[_PooledContext]] = {}
+        self._by_context: Dict[int, _PooledContext] = {}
+        self.acquire_timings_ms: List[float] = []
+        self.release_timings_ms: List[float] = []
+
+    def acquire(self, key: str, options: dict) -> BrowserContext:
+        """
+        Hand out a free context for the given key, warming the pool on first use.
+
+        Args:
+            key: Pool group name
+            options: new_context() options used when the group is created
+
+        Returns:
+            BrowserContext: A clean context with storage state loaded
+        """
+        start = time.perf_counter()
+
+        if key not in self._entries:
+            self._entries[key] = [self._create(key, options) for _ in range(self.size)]
+
+        entry = next((e for e in self._entries[key] if not e.in_use), None)
+        if entry is None:
+            # All warm contexts are busy (test uses several) - grow the group
+            entry = self._create(key, options)
+            self._entries[key].append(entry)
+
+        entry.in_use = True
+        self.acquire_timings_ms.append((time.perf_counter() - start) * 1000)
+        return entry.context
+
+    def release(self, context: BrowserContext) -> None:
+        """
+        Reset a context and return it to the pool.
+
+        A context that cannot be reset (e.g. closed by a test) is dropped and
+        replaced lazily on the next acquire.
+
+        Args:
+            context: Context previously returned by acquire()
+        """
+        entry = self._by_context.get(id(context))
+        if entry is None:
+            with contextlib.suppress(Exception):
+                context.close()
+            return
+
+        start = time.perf_counter()
+        try:
+            self._reset(entry)
+            entry.in_use = False
+        except Exception as e:
+            print(f"⚠️  Dropping pooled context '{entry.key}': {e}")
+            self._discard(entry)
+        self.release_timings_ms.append((time.perf_counter() - start) * 1000)
+
+    def owns(self, context: BrowserContext) -> bool:
+        """Check if the context belongs to this pool."""
+        return id(context) in self._by_context
+
+    def close(self) -> None:
+        """Close every pooled context."""
+        for entries in self._entries.values():
+            for entry in entries:
+                with contextlib.suppress(Exception):
+                    entry.context.close()
+        self._entries.clear()
+        self._by_context.clear()
+
+    def _create(self, key: str, options: dict) -> _PooledContext:
+        """Create and register a new context for the group."""
+        context = self.browser.new_context(**options)
+        entry = _PooledContext(key, context, _load_storage_state(options.get("storage_state")))
+        self._by_context[id(context)] = entry
+        return entry
+
+    def _discard(self, entry: _PooledContext) -> None:
+        """Remove a broken context from the pool."""
+        self._by_context.pop(id(entry.context), None)
+        with contextlib.suppress(ValueError):
+            self._entries[entry.key].remove(entry)
+        with contextlib.suppress(Exception):
+            entry.context.close()
+
+    def _reset(self, entry: _PooledContext) -> None:
+        """Clear pages, routes, cookies and web storage, then restore storage state."""
+        context = entry.context
+
+        for page in list(context.pages):
+            page.close()
+
+        context.unroute_all()
+        context.clear_cookies()
+        context.clear_permissions()
+
+        state = entry.storage_state or {}
+        if state.get("cookies"):
+            context.add_cookies(state["cookies"])
+
+        seeded = {o["origin"]: o.get("localStorage", []) for o in state.get("origins", [])}
+        origins = entry.visited_origins | set(seeded)
+        if origins:
+            self._reset_web_storage(context, origins, seeded)
+        entry.visited_origins.clear()
+
+    def _reset_web_storage(
+        self,
+        context: BrowserContext,
+        origins: Set[str],
+        seeded: Dict[str, list]
+    ) -> None:
+        """
+        Clear local/session storage for each origin without hitting the network.
+
+        Every navigation is fulfilled with a blank document through a route, so
+        the reset only costs one in-process round-trip per origin.
+        """
+        def serve_blank(route: Route) -> None:
+            route.fulfill(status=200, content_type="text/html", body=_BLANK_DOCUMENT)
+
+        context.route("**/*", serve_blank)
+        page = context.new_page()
+        try:
+            for origin in sorted(origins):
+                page.goto(f"{origin}/", wait_until="commit")
+                page.evaluate(_RESET_STORAGE_SCRIPT, seeded.get(origin, []))
+        finally:
+            page.close()
+            if page.video:
+                # Reset navigations are bookkeeping, not test evidence
+                with contextlib.suppress(Exception):
+                    page.video.delete()
+            context.unroute("**/*", serve_blank)
+
+
+def open_context(
+    browser: Browser,
+    pool: Optional[ContextPool],
+    key: str,
+    options: dict
+) -> BrowserContext:
+    """
+    Take a context from the pool, or create a fresh one when pooling is off.
+    
+    Args:
+        browser: Browser to create fresh contexts from
+        pool: Worker context pool, or None
+        key: Pool group name
+        options: new_context() options
+        
+    Returns:
+        BrowserContext: Context ready for a test
+    """
+    if pool is not None:
+        return pool.acquire(key, options)
+    return browser.new_context(**options)
+
+
+def close_context(context: BrowserContext, pool: Optional[ContextPool]) -> None:
+    """
+    Return a context to the pool, or close it when pooling is off.
+    
+    Args:
+        context: Context from open_context()
+        pool: Worker context pool, or None
+    """
+    if pool is not None and pool.owns(context):
+        pool.release(context)
+    else:
+        context.close()
+
+
+def _load_storage_state(storage_state) -> Optional[dict]:
+    """Load a storage state given as a path or dict."""
+    if not storage_state:
+        return None
+    if isinstance(storage_state, dict):
+        return storage_state
+    path = Path(storage_state)
+    if not path.exists():
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
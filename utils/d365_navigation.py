@@ -0,0 +1,305 @@
+"""
+Deep-link navigation for D365 menu paths.
+
+D365 opens any form directly from `?cmp=<company>&mi=<menu item>`, which is
+much faster than expanding the navigation pane and clicking through
+Modules → area → group → form. D365Navigator resolves a logical destination
+(e.g. 'all_sales_orders') to its menu item from a JSON cache; on a miss it
+clicks the menu path once, reads the menu item D365 puts into the URL and
+stores it for every later run.
+
+Each destination also remembers how long the click path took, so every
+deep-link navigation reports the time it saved.
+"""
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+from playwright.sync_api import Page
+from playwright.sync_api import Error as PlaywrightError
+
+from configs.playwright_config import D365_BASE_URL, D365_COMPANY, D365_DEEP_LINKS, D365_NAV_CACHE_PATH
+from utils.file_lock import FileLock
+
+
+DEFAULT_D365_URL = "https://fourhands-test.sandbox.operations.dynamics.com"
+
+
+class NavigationCache:
+    """
+    Destination → menu item mapping persisted as JSON.
+
+    Entries look like {"menu_item": "SalesTableListPage", "menu_seconds": 9.4,
+    "learned": "2026-10-17T10:00:00"}; menu_seconds is a moving average of
+    the click path, used to compute time saved.
+    """
+
+    def __init__(self, path: str = D365_NAV_CACHE_PATH):
+        """
+        Initialize the cache.
+
+        Args:
+            path: Cache file
+        """
+        self.path = Path(path)
+        self.entries: Dict[str, dict] = {}
+        self.load()
+
+    def load(self) -> None:
+        """Load the cache file if it exists (a corrupt file starts empty)."""
+        try:
+            data = json.loads(self.path.read_text())
+            self.entries = data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def get(self, destination: str) -> Optional[dict]:
+        return self.entries.get(destination)
+
+    def learn(self, destination: str, menu_item: str, menu_seconds: float) -> None:
+        """Store a resolved menu item and blend in the measured click-path time."""
+        previous = self.entries.get(destination, {}).get("menu_seconds")
+        if previous:
+            menu_seconds = previous + 0.5 * (menu_seconds - previous)
+        self.entries[destination] = {
+            "menu_item": menu_item,
+            "menu_seconds": round(menu_seconds, 3),
+            "learned": datetime.now().isoformat(timespec="seconds"),
+        }
+        self._save({destination: self.entries[destination]})
+
+    def forget(self, destination: str) -> None:
+        """Drop a stale entry (its menu item no longer opens the expected form)."""
+        if self.entries.pop(destination, None) is not None:
+            self._save({destination: None})
+
+    def _save(self, changes: Dict[str, Optional[dict]]) -> None:
+        """Merge changes into the file under a lock (xdist workers share it)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with FileLock(f"{self.path}.lock", timeout=30):
+            try:
+                merged = json.loads(self.path.read_text())
+            except (OSError, ValueError):
+                merged = {}
+            for destination, entry in changes.items():
+                if entry is None:
+                    merged.pop(destination, None)
+                else:
+                    merged[destination] = entry
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(merged, indent=1, sort_keys=True))
+            os.replace(tmp_path, self.path)
+
+
+@dataclass
+class NavigationStats:
+    """Deep-link hits, menu fallbacks and time saved during one test."""
+    deep_links: int = 0
+    menu_clicks: int = 0
+    seconds_saved: float = 0.0
+    events: List[str] = field(default_factory=list)
+
+    def summary(self) -> str:
+        return (f"{self.deep_links} deep link(s), {self.menu_clicks} menu navigation(s), "
+                f"~{self.seconds_saved:.1f}s saved")
+
+
+navigation_cache = NavigationCache()
+navigation_stats = NavigationStats()
+
+
+def get_navigation_cache() -> NavigationCache:
+    """
+    Get the global navigation cache instance.
+
+    Returns:
+        NavigationCache: The navigation cache
+    """
+    return navigation_cache
+
+
+def get_navigation_stats() -> NavigationStats:
+    """
+    Get the navigation stats of the current test.
+
+    Returns:
+        NavigationStats: Counters since the last reset_navigation_stats()
+    """
+    return navigation_stats
+
+
+def reset_navigation_stats() -> NavigationStats:
+    """
+    Start counting for a new test.
+
+    Returns:
+        NavigationStats: The stats of the finished test
+    """
+    global navigation_stats
+    finished, navigation_stats = navigation_stats, NavigationStats()
+    return finished
+
+
+def menu_item_from_url(url: str) -> Optional[str]:
+    """Read the mi= parameter D365 keeps in the URL of an open form."""
+    values = parse_qs(urlparse(url).query).get("mi")
+    return values[0] if values else None
+
+
+class D365Navigator:
+    """
+    Opens D365 destinations by deep link, clicking the menu only on a cache miss.
+
+    Usage:
+        navigator = D365Navigator(page, guard)
+        navigator.go("all_sales_orders", click_path=self._click_to_sales_orders,
+                     is_open=lambda: self.page.get_by_text("All sales orders").first.is_visible())
+    """
+
+    def __init__(self, page: Page, guard, cache: Optional[NavigationCache] = None, company: str = D365_COMPANY):
+        """
+        Initialize the navigator.
+
+        Args:
+            page: D365 page
+            guard: BusyWatcher used to wait after navigation
+            cache: Navigation cache (defaults to the global one)
+            company: Legal entity for the cmp= parameter
+        """
+        self.page = page
+        self.guard = guard
+        self.cache = cache or get_navigation_cache()
+        self.company = company
+
+    def base_url(self) -> str:
+        """D365 origin: configured, else the current page's, else the test environment."""
+        if D365_BASE_URL:
+            return D365_BASE_URL.rstrip("/")
+        parsed = urlparse(self.page.url)
+        if parsed.scheme in ("http", "https") and "dynamics.com" in parsed.netloc:
+            return f"{parsed.scheme}://{parsed.netloc}"
+        return DEFAULT_D365_URL
+
+    def deep_link(self, menu_item: str) -> str:
+        """Direct URL of a menu item."""
+        return f"{self.base_url()}/?cmp={self.company.upper()}&mi={menu_item}"
+
+    def go(
+        self,
+        destination: str,
+        click_path: Callable[[], None],
+        is_open: Optional[Callable[[], bool]] = None
+    ) -> bool:
+        """
+        Open a destination.
+
+        Args:
+            destination: Logical name used as cache key
+            click_path: Menu navigation used on a cache miss
+            is_open: Check that the expected form is showing; a failed check
+                after a deep link drops the cache entry and falls back to the menu
+
+        Returns:
+            bool: True if the destination was opened by deep link
+        """
+        entry = self._cached_entry(destination)
+
+        if entry:
+            start = time.perf_counter()
+            try:
+                self.page.goto(self.deep_link(entry["menu_item"]))
+                self.guard.wait_until_idle()
+                opened = is_open() if is_open else True
+            except (PlaywrightError, TimeoutError) as e:
+                print(f"⚠️ Deep link for {destination} failed: {e}")
+                opened = False
+
+            if self._finish_deep_link(destination, entry, opened, start):
+                return True
+
+        start = time.perf_counter()
+        click_path()
+        self._finish_menu(destination, start)
+        return False
+
+    def _cached_entry(self, destination: str) -> Optional[dict]:
+        """Cache entry to deep-link to, None when deep links are off or nothing is cached."""
+        return self.cache.get(destination) if D365_DEEP_LINKS else None
+
+    def _finish_deep_link(self, destination: str, entry: dict, opened: bool, start: float) -> bool:
+        """Record a deep-link attempt; a failed one drops the stale cache entry."""
+        if not opened:
+            print(f"⚠️ Cached menu item for {destination} is stale, using the menu")
+            self.cache.forget(destination)
+            return False
+
+        stats = get_navigation_stats()
+        elapsed = time.perf_counter() - start
+        saved = max(0.0, entry.get("menu_seconds", 0.0) - elapsed)
+        stats.deep_links += 1
+        stats.seconds_saved += saved
+        stats.events.append(f"{destination}: deep link {elapsed:.1f}s (saved ~{saved:.1f}s)")
+        print(f"⚡ Opened {destination} by deep link (mi={entry['menu_item']}, ~{saved:.1f}s saved)")
+        return True
+
+    def _finish_menu(self, destination: str, start: float) -> None:
+        """Record a menu navigation and learn the menu item D365 put into the URL."""
+        stats = get_navigation_stats()
+        elapsed = time.perf_counter() - start
+        stats.menu_clicks += 1
+        stats.events.append(f"{destination}: menu {elapsed:.1f}s")
+
+        menu_item = menu_item_from_url(self.page.url)
+        if menu_item:
+            self.cache.learn(destination, menu_item, elapsed)
+            print(f"📌 Cached {destination} → mi={menu_item}")
+
+
+class AsyncD365Navigator(D365Navigator):
+    """
+    D365Navigator for playwright.async_api pages (pages/aio).
+
+    Same cache, stats and deep links; click_path and is_open are coroutine
+    functions and guard is an AsyncBusyWatcher.
+    """
+
+    async def go(
+        self,
+        destination: str,
+        click_path: Callable[[], Awaitable[None]],
+        is_open: Optional[Callable[[], Awaitable[bool]]] = None
+    ) -> bool:
+        """
+        Open a destination (see D365Navigator.go).
+
+        Args:
+            destination: Logical name used as cache key
+            click_path: Async menu navigation used on a cache miss
+            is_open: Async check that the expected form is showing
+
+        Returns:
+            bool: True if the destination was opened by deep link
+        """
+        entry = self._cached_entry(destination)
+
+        if entry:
+            start = time.perf_counter()
+            try:
+                await self.page.goto(self.deep_link(entry["menu_item"]))
+                await self.guard.wait_until_idle()
+                opened = await is_open() if is_open else True
+            except (PlaywrightError, TimeoutError) as e:
+                print(f"⚠️ Deep link for {destination} failed: {e}")
+                opened = False
+
+            if self._finish_deep_link(destination, entry, opened, start):
+                return True
+
+        start = time.perf_counter()
+        await click_path()
+        self._finish_menu(destination, start)
+        return False
@@ -0,0 +1,484 @@
+"""
+D365 F&O OData data factory.
+
+Creates and cleans up test data (customers, sales orders) through the
+/data OData entities, so UI tests only exercise the scenario they verify.
+
+Authentication uses a bearer token, taken from (in order):
+    - D365_ACCESS_TOKEN
+    - the MSAL access tokens in the cached D365 storage state
+    - client credentials (D365_TENANT_ID, D365_CLIENT_ID, D365_CLIENT_SECRET)
+
+Usage:
+    client = D365ODataClient.from_env()
+    with D365DataFactory(client) as factory:
+        customer = factory.create_customer()
+        order = factory.create_sales_order(customer["CustomerAccount"], lines=[("000022-", 1)])
+        ...
+    # everything created is deleted on exit
+"""
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import quote, urlparse
+
+import requests
+
+from configs.playwright_config import (
+    D365_ODATA_URL,
+    D365_COMPANY,
+    D365_SESSION_PATH,
+    D365_ODATA_TIMEOUT,
+    D365_CUSTOMER_GROUP,
+)
+
+
+CUSTOMERS = "CustomersV3"
+SALES_ORDER_HEADERS = "SalesOrderHeadersV2"
+SALES_ORDER_LINES = "SalesOrderLines"
+
+# Entity keys (besides dataAreaId)
+ENTITY_KEYS = {
+    CUSTOMERS: ("CustomerAccount",),
+    SALES_ORDER_HEADERS: ("SalesOrderNumber",),
+    SALES_ORDER_LINES: ("SalesOrderNumber", "LineCreationSequenceNumber"),
+}
+
+# Tokens this close to expiry are not used
+_TOKEN_MARGIN = 60
+
+
+class D365ODataError(Exception):
+    """Raised when an OData call fails."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+def access_token_from_state(state: dict, resource: str) -> Optional[str]:
+    """
+    Find a usable MSAL access token for the D365 resource in a storage state.
+
+    Args:
+        state: Parsed storage state
+        resource: D365 origin (only tokens scoped to it are used)
+
+    Returns:
+        Optional[str]: Longest-lived bearer token, or None if no unexpired token was found
+    """
+    host = urlparse(resource).netloc.lower()
+    candidates = []
+    for origin in state.get("origins", []):
+        for item in origin.get("localStorage", []):
+            value = item.get("value", "")
+            if not value.startswith("{"):
+                continue
+            try:
+                entry = json.loads(value)
+            except ValueError:
+                continue
+            if not isinstance(entry, dict) or entry.get("credentialType") != "AccessToken" or not entry.get("secret"):
+                continue
+            try:
+                expires = float(entry.get("expiresOn") or entry.get("extendedExpiresOn") or 0)
+            except (TypeError, ValueError):
+                expires = 0
+            if expires and expires < time.time() + _TOKEN_MARGIN:
+                continue
+            if host and host in entry.get("target", "").lower():
+                candidates.append((expires, entry["secret"]))
+
+    if not candidates:
+        return None
+    return max(candidates)[1]
+
+
+def acquire_client_credentials_token(
+    tenant_id: str,
+    client_id: str,
+    client_secret: str,
+    resource: str,
+    timeout: float = 30
+) -> str:
+    """
+    Get an app-only token from Azure AD for the D365 resource.
+
+    Args:
+        tenant_id: Azure AD tenant
+        client_id: App registration ID (registered in D365 as an AAD application)
+        client_secret: App secret
+        resource: D365 origin
+        timeout: Request timeout in seconds
+
+    Returns:
+        str: Bearer token
+
+    Raises:
+        D365ODataError: If Azure AD rejects the request
+    """
+    response = requests.post(
+        f"https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token",
+        data={
+            "grant_type": "client_credentials",
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "scope": f"{resource.rstrip('/')}/.default",
+        },
+        timeout=timeout
+    )
+    if not response.ok:
+        raise D365ODataError(f"Token request failed: {response.status_code} {response.text[:200]}",
+                             response.status_code)
+    return response.json()["access_token"]
+
+
+def _odata_literal(value: Union[str, int, float]) -> str:
+    """Format a key value as an OData literal."""
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    return str(value)
+
+
+class D365ODataClient:
+    """Thin OData client for D365 F&O data entities."""
+
+    def __init__(
+        self,
+        base_url: str,
+        token: str,
+        company: str = D365_COMPANY,
+        session: Optional[requests.Session] = None,
+        timeout: float = D365_ODATA_TIMEOUT
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            base_url: D365 origin (the /data service lives below it)
+            token: Bearer token
+            company: Legal entity (dataAreaId) records are created in
+            session: HTTP session to reuse
+            timeout: Request timeout in seconds
+        """
+        self.base_url = base_url.rstrip("/")
+        self.company = company.lower()
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self.session.headers.update({
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+            "OData-Version": "4.0",
+        })
+
+    @classmethod
+    def from_env(
+        cls,
+        base_url: str = D365_ODATA_URL,
+        storage_state: Union[str, Path, dict, None] = D365_SESSION_PATH,
+        **kwargs
+    ) -> "D365ODataClient":
+        """
+        Build a client with the first available bearer token.
+
+        Args:
+            base_url: D365 origin
+            storage_state: Storage state path or dict holding MSAL tokens
+            **kwargs: Extra constructor arguments
+
+        Returns:
+            D365ODataClient: Authenticated client
+
+        Raises:
+            D365ODataError: If no token source is available
+        """
+        token = os.getenv("D365_ACCESS_TOKEN")
+
+        if not token and storage_state:
+            state = storage_state
+            if not isinstance(state, dict):
+                try:
+                    state = json.loads(Path(storage_state).read_text())
+                except (OSError, ValueError):
+                    state = {}
+            token = access_token_from_state(state, base_url)
+
+        if not token and all(os.getenv(k) for k in ("D365_TENANT_ID", "D365_CLIENT_ID", "D365_CLIENT_SECRET")):
+            token = acquire_client_credentials_token(
+                os.getenv("D365_TENANT_ID"), os.getenv("D365_CLIENT_ID"), os.getenv("D365_CLIENT_SECRET"), base_url
+            )
+
+        if not token:
+            raise D365ODataError(
+                "No D365 bearer token: set D365_ACCESS_TOKEN, refresh the D365 session, "
+                "or set D365_TENANT_ID/D365_CLIENT_ID/D365_CLIENT_SECRET"
+            )
+        return cls(base_url, token, **kwargs)
+
+    def entity_url(self, entity: str, key: Optional[Dict[str, Union[str, int]]] = None) -> str:
+        """
+        URL of an entity set, or of one record when a key is given.
+
+        Args:
+            entity: Entity set name (e.g. CustomersV3)
+            key: Key fields without dataAreaId
+
+        Returns:
+            str: Absolute URL
+        """
+        url = f"{self.base_url}/data/{entity}"
+        if key is not None:
+            fields = {"dataAreaId": self.company, **key}
+            # Quotes stay literal: (dataAreaId='fh',CustomerAccount='C1')
+            pairs = [k + "=" + quote(_odata_literal(v), safe="'") for k, v in fields.items()]
+            url += "(" + ",".join(pairs) + ")"
+        return url
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request and raise D365ODataError for error statuses."""
+        response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+        if not response.ok:
+            try:
+                message = response.json()["error"]["message"]
+            except Exception:
+                message = response.text[:200]
+            raise D365ODataError(f"{method} {url} failed: {response.status_code} {message}", response.status_code)
+        return response
+
+    def query(
+        self,
+        entity: str,
+        filter: Optional[str] = None,
+        select: Optional[Iterable[str]] = None,
+        top: Optional[int] = None
+    ) -> List[dict]:
+        """
+        Query records of the client's company.
+
+        Args:
+            entity: Entity set name
+            filter: OData $filter expression
+            select: Fields to return
+            top: Maximum number of records
+
+        Returns:
+            List[dict]: Matching records
+        """
+        company_filter = f"dataAreaId eq {_odata_literal(self.company)}"
+        params = {"$filter": f"{company_filter} and ({filter})" if filter else company_filter}
+        if select:
+            params["$select"] = ",".join(select)
+        if top:
+            params["$top"] = str(top)
+        return self._request("GET", self.entity_url(entity), params=params).json().get("value", [])
+
+    def get(self, entity: str, key: Dict[str, Union[str, int]]) -> Optional[dict]:
+        """
+        Read one record.
+
+        Returns:
+            Optional[dict]: The record, or None if it does not exist
+        """
+        try:
+            return self._request("GET", self.entity_url(entity, key)).json()
+        except D365ODataError as e:
+            if e.status == 404:
+                return None
+            raise
+
+    def create(self, entity: str, payload: dict) -> dict:
+        """
+        Create a record in the client's company.
+
+        Returns:
+            dict: The created record (with generated keys such as number sequences)
+        """
+        body = {"dataAreaId": self.company, **payload}
+        return self._request("POST", self.entity_url(entity), json=body,
+                             headers={"Prefer": "return=representation"}).json()
+
+    def update(self, entity: str, key: Dict[str, Union[str, int]], payload: dict) -> None:
+        """Patch fields of a record."""
+        self._request("PATCH", self.entity_url(entity, key), json=payload)
+
+    def delete(self, entity: str, key: Dict[str, Union[str, int]]) -> bool:
+        """
+        Delete a record.
+
+        Returns:
+            bool: False if the record was already gone
+        """
+        try:
+            self._request("DELETE", self.entity_url(entity, key))
+        except D365ODataError as e:
+            if e.status == 404:
+                return False
+            raise
+        return True
+
+
+class D365DataFactory:
+    """
+    Creates D365 test data through OData and deletes it again.
+
+    Records are tracked in creation order and removed in reverse order by
+    cleanup() (also on context manager exit), so lines go before headers
+    and orders before their customer.
+    """
+
+    def __init__(self, client: D365ODataClient, prefix: str = "QA"):
+        """
+        Initialize the factory.
+
+        Args:
+            client: OData client
+            prefix: Prefix for generated names, to recognise leftover test data
+        """
+        self.client = client
+        self.prefix = prefix
+        self.created: List[Tuple[str, Dict[str, Union[str, int]]]] = []
+
+    def __enter__(self) -> "D365DataFactory":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.cleanup()
+
+    def _track(self, entity: str, record: dict) -> dict:
+        """Remember a created record for cleanup."""
+        self.created.append((entity, {k: record[k] for k in ENTITY_KEYS[entity]}))
+        return record
+
+    def unique_name(self, kind: str) -> str:
+        """Readable unique name for generated records."""
+        return f"{self.prefix} {kind} {uuid.uuid4().hex[:8]}"
+
+    def create_customer(self, **fields) -> dict:
+        """
+        Create a customer (CustomersV3).
+
+        Without CustomerAccount, D365 assigns one from the number sequence.
+
+        Args:
+            **fields: Entity fields overriding the defaults
+
+        Returns:
+            dict: Created customer (CustomerAccount, OrganizationName, ...)
+        """
+        payload = {
+            "OrganizationName": self.unique_name("Customer"),
+            "CustomerGroupId": D365_CUSTOMER_GROUP,
+            "SalesCurrencyCode": "USD",
+            "PartyType": "Organization",
+            "LanguageId": "en-us",
+        }
+        payload.update(fields)
+        customer = self._track(CUSTOMERS, self.client.create(CUSTOMERS, payload))
+        print(f"🏭 Created customer {customer['CustomerAccount']} via OData")
+        return customer
+
+    def create_sales_order(
+        self,
+        customer_account: str,
+        lines: Iterable[Tuple[str, float]] = (),
+        delivery_mode: Optional[str] = None,
+        **fields
+    ) -> dict:
+        """
+        Create a sales order header (SalesOrderHeadersV2) with lines (SalesOrderLines).
+
+        Args:
+            customer_account: Ordering customer
+            lines: (item number, quantity) pairs
+            delivery_mode: Mode of delivery code
+            **fields: Header fields overriding the defaults
+
+        Returns:
+            dict: Created header with a 'lines' list of created lines
+        """
+        payload = {
+            "OrderingCustomerAccountNumber": customer_account,
+            "InvoiceCustomerAccountNumber": customer_account,
+            "CurrencyCode": "USD",
+        }
+        if delivery_mode:
+            payload["DeliveryModeCode"] = delivery_mode
+        payload.update(fields)
+
+        header = self._track(SALES_ORDER_HEADERS, self.client.create(SALES_ORDER_HEADERS, payload))
+        order_number = header["SalesOrderNumber"]
+
+        header["lines"] = []
+        for item_number, quantity in lines:
+            line = self.client.create(SALES_ORDER_LINES, {
+                "SalesOrderNumber": order_number,
+                "ItemNumber": item_number,
+                "OrderedSalesQuantity": quantity,
+            })
+            header["lines"].append(self._track(SALES_ORDER_LINES, line))
+
+        print(f"🏭 Created sales order {order_number} ({len(header['lines'])} line(s)) via OData")
+        return header
+
+    def adopt_sales_orders(self, customer_account: str) -> List[str]:
+        """
+        Track sales orders created for a customer elsewhere (e.g. through the UI) for cleanup.
+
+        Args:
+            customer_account: Ordering customer
+
+        Returns:
+            List[str]: Adopted order numbers
+        """
+        known = {key.get("SalesOrderNumber") for entity, key in self.created if entity == SALES_ORDER_HEADERS}
+        orders = self.client.query(
+            SALES_ORDER_HEADERS,
+            filter=f"OrderingCustomerAccountNumber eq {_odata_literal(customer_account)}",
+            select=["SalesOrderNumber"]
+        )
+        adopted = [o["SalesOrderNumber"] for o in orders if o["SalesOrderNumber"] not in known]
+        # Orders must be removed before their customer, so insert right after it
+        position = next((i + 1 for i, (entity, key) in enumerate(self.created)
+                         if entity == CUSTOMERS and key["CustomerAccount"] == customer_account),
+                        len(self.created))
+        for number in adopted:
+            self.created.insert(position, (SALES_ORDER_HEADERS, {"SalesOrderNumber": number}))
+        return adopted
+
+    def cleanup(self, adopt_orders: bool = True) -> Dict[str, int]:
+        """
+        Delete everything this factory created, newest first.
+
+        Failures are reported and do not stop the remaining deletes.
+
+        Args:
+            adopt_orders: Also delete sales orders the test created (e.g. through
+                the UI) for the factory's customers, which would otherwise block
+                deleting those customers
+
+        Returns:
+            Dict[str, int]: deleted and failed counts
+        """
+        if adopt_orders:
+            for account in [key["CustomerAccount"] for entity, key in self.created if entity == CUSTOMERS]:
+                try:
+                    self.adopt_sales_orders(account)
+                except (D365ODataError, requests.RequestException) as e:
+                    print(f"⚠️ Could not look up sales orders of {account}: {e}")
+
+        summary = {"deleted": 0, "failed": 0}
+        while self.created:
+            entity, key = self.created.pop()
+            try:
+                self.client.delete(entity, key)
+                summary["deleted"] += 1
+            except (D365ODataError, requests.RequestException) as e:
+                summary["failed"] += 1
+                print(f"⚠️ Could not delete {entity} {key}: {e}")
+        if summary["deleted"] or summary["failed"]:
+            print(f"🧹 OData cleanup: {summary['deleted']} deleted, {summary['failed']} failed")
+        return summary
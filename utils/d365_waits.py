@@ -2,9 +2,19 @@
 D365 Busy Watcher Utility
 Handles D365-specific loading states and busy indicators.
 """
-from playwright.sync_api import Page
+from playwright.sync_api import Page, Request
+from playwright.sync_api import Error as PlaywrightError
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from typing import Dict, Generator, Iterable, List, Optional
+from weakref import WeakKeyDictionary
+import re
+import json
 import time
 import contextlib
+import asyncio
+
+from configs.playwright_config import D365_BUSY_MODE
+from utils.timing import timed
 
 # D365-specific busy selectors
 BUSY_SELECTORS = [
@@ -17,73 +27,443 @@ BUSY_SELECTORS = [
     ".ms-Dialog-main",  # Modal dialogs
 ]
 
+# Requests that never block D365 idleness: static assets and long-lived channels
+IGNORED_RESOURCE_TYPES = {
+    "image",
+    "font",
+    "media",
+    "texttrack",
+    "manifest",
+    "websocket",
+    "eventsource",
+    "ping",
+}
+
+# Telemetry, long-polling and push channels that stay open or fire constantly
+IGNORED_URL_PATTERNS = [
+    r"/signalr/",
+    r"/negotiate\b",
+    r"dc\.services\.visualstudio\.com",
+    r"\.applicationinsights\.azure\.com",
+    r"browser\.events\.data\.microsoft\.com",
+    r"mobile\.events\.data\.microsoft\.com",
+    r"\.clarity\.ms",
+    r"google-analytics\.com",
+    r"/telemetry",
+]
+
+BINDING_NAME = "__d365BusyChanged"
+
+# Shared in-page detector: evaluates every busy selector in one pass.
+# Defined as a function source so it can be used both standalone (poll mode)
+# and inside the init script (event mode).
+_DETECTOR_SOURCE = """
+(spec) => {
+    const isVisible = (el) => {
+        const style = window.getComputedStyle(el);
+        if (style.visibility === "hidden" || style.display === "none") return false;
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0;
+    };
+    for (const selector of spec.css) {
+        for (const el of document.querySelectorAll(selector)) {
+            if (isVisible(el)) return true;
+        }
+    }
+    for (const text of spec.text) {
+        const regex = new RegExp(text.source, text.flags);
+        const lower = "translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')";
+        const hits = document.evaluate(
+            `//*[text()[contains(${lower}, ${JSON.stringify(text.hint)})]]`,
+            document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+        );
+        for (let i = 0; i < hits.snapshotLength; i++) {
+            const el = hits.snapshotItem(i);
+            if (regex.test(el.textContent || "") && isVisible(el)) return true;
+        }
+    }
+    return false;
+}
+"""
+
+# Event mode: watches DOM mutations, reports busy/idle transitions through
+# the exposed binding and lets Python await idle with a single evaluate().
+_WATCHER_SCRIPT = """
+(spec) => {
+    if (window.__d365Busy) return;
+    const detect = %(detector)s;
+    const state = {
+        busy: false,
+        since: performance.now(),
+        listeners: new Set(),
+        whenIdle(quietMs, timeoutMs) {
+            return new Promise((resolve) => {
+                let timer = null;
+                const done = (value) => {
+                    clearTimeout(timer);
+                    clearTimeout(deadline);
+                    state.listeners.delete(check);
+                    resolve(value);
+                };
+                const check = () => {
+                    clearTimeout(timer);
+                    if (state.busy) return;
+                    const left = quietMs - (performance.now() - state.since);
+                    if (left <= 0) done(true);
+                    else timer = setTimeout(check, left);
+                };
+                const deadline = setTimeout(() => done(false), timeoutMs);
+                state.listeners.add(check);
+                check();
+            });
+        },
+    };
+    window.__d365Busy = state;
+    
+    let scheduled = false;
+    const evaluate = () => {
+        scheduled = false;
+        const busy = detect(spec);
+        if (busy === state.busy) return;
+        state.busy = busy;
+        state.since = performance.now();
+        const notify = window[spec.binding];
+        if (notify) notify(busy).catch(() => {});
+        for (const listener of [...state.listeners]) listener();
+    };
+    const schedule = () => {
+        if (scheduled) return;
+        scheduled = true;
+        setTimeout(evaluate, 0);
+    };
+    const start = () => {
+        new MutationObserver(schedule).observe(document.documentElement, {
+            subtree: true,
+            childList: true,
+            characterData: true,
+            attributes: true,
+            attributeFilter: ["class", "style", "hidden", "aria-busy"],
+        });
+        evaluate();
+    };
+    if (document.documentElement) start();
+    else document.addEventListener("readystatechange", start, { once: true });
+}
+"""
+
+
+def _selector_spec() -> dict:
+    """Split BUSY_SELECTORS into CSS selectors and text regexes for the in-page detector."""
+    css, text = [], []
+    for selector in BUSY_SELECTORS:
+        match = re.match(r"^text=/(.*)/([a-z]*)$", selector)
+        if match:
+            source, flags = match.groups()
+            # Literal prefix used to narrow candidates via XPath before the regex test
+            hint = re.split(r"[.*+?\[\](){}|\\^$]", source)[0].lower()
+            text.append({"source": source, "flags": flags, "hint": hint})
+        else:
+            css.append(selector)
+    return {"css": css, "text": text, "binding": BINDING_NAME}
+
+
+class _BusyBridge:
+    """Per-page in-page watcher installation and the DOM busy state it reports."""
+    
+    def __init__(self, page: Page):
+        self.dom_busy = False
+        self.changed_at = time.monotonic()
+        self.transitions = 0
+        
+        page.expose_binding(BINDING_NAME, self._on_change)
+        script = _WATCHER_SCRIPT % {"detector": _DETECTOR_SOURCE.strip()}
+        spec = _selector_spec()
+        page.add_init_script(script=f"({script.strip()})({json.dumps(spec)})")
+        with contextlib.suppress(PlaywrightError):
+            page.evaluate(script.strip(), spec)
+    
+    def _on_change(self, source, busy: bool) -> None:
+        """Binding callback: record busy/idle transitions reported by the page."""
+        self.dom_busy = bool(busy)
+        self.changed_at = time.monotonic()
+        self.transitions += 1
+
+
+# One bridge per page - expose_binding can only be registered once
+_bridges: "WeakKeyDictionary[Page, _BusyBridge]" = WeakKeyDictionary()
+
 
-class BusyWatcher:
+class _BusyTracking:
+    """
+    Request tracking and idle bookkeeping shared by BusyWatcher and AsyncBusyWatcher.
+    
+    Page event listeners are registered the same way on sync and async
+    pages; only the waits differ, and those live in the two watchers.
+    """
+    
+    def __init__(
+        self,
+        page,
+        quiet_window: float = 0.5,
+        ignore_resource_types: Optional[Iterable[str]] = None,
+        ignore_url_patterns: Optional[Iterable[str]] = None
+    ):
+        """
+        Start tracking the page's requests.
+        
+        Args:
+            page: Playwright Page (sync or async API)
+            quiet_window: Seconds the page must stay idle before it counts as idle
+            ignore_resource_types: Resource types that never block idle
+                (default: IGNORED_RESOURCE_TYPES)
+            ignore_url_patterns: URL regexes that never block idle
+                (default: IGNORED_URL_PATTERNS)
+        """
+        self.page = page
+        self.quiet_window = quiet_window
+        self.ignore_resource_types = set(
+            IGNORED_RESOURCE_TYPES if ignore_resource_types is None else ignore_resource_types
+        )
+        self._ignore_url = re.compile(
+            "|".join(IGNORED_URL_PATTERNS if ignore_url_patterns is None else ignore_url_patterns)
+            or r"(?!)"
+        )
+        self._pending: Dict[Request, float] = {}
+        self._network_changed_at = time.monotonic()
+        self._spec = _selector_spec()
+        
+        # Track network requests by identity
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_request_done)
+        page.on("requestfailed", self._on_request_done)
+    
+    @property
+    def _inflight(self) -> int:
+        """Number of in-flight requests that block idle."""
+        return len(self._pending)
+    
+    def _blocks_idle(self, request: Request) -> bool:
+        """Check if a request should hold the page busy."""
+        if request.resource_type in self.ignore_resource_types:
+            return False
+        return not self._ignore_url.search(request.url)
+    
+    def _on_request(self, request: Request) -> None:
+        """Start tracking a request."""
+        if self._blocks_idle(request):
+            self._pending[request] = time.monotonic()
+            self._network_changed_at = time.monotonic()
+    
+    def _on_request_done(self, request: Request) -> None:
+        """Stop tracking a finished or failed request."""
+        if self._pending.pop(request, None) is not None:
+            self._network_changed_at = time.monotonic()
+    
+    def blocking_requests(self) -> List[Dict]:
+        """
+        Snapshot of the requests currently blocking idle.
+        
+        Returns:
+            List[Dict]: method, resource_type, url and age_ms per pending request
+        """
+        now = time.monotonic()
+        return [
+            {
+                "method": request.method,
+                "resource_type": request.resource_type,
+                "url": request.url,
+                "age_ms": int((now - started) * 1000),
+            }
+            for request, started in sorted(self._pending.items(), key=lambda kv: kv[1])
+        ]
+    
+    def _idle_poll(self, timeout: float) -> Generator[float, bool, None]:
+        """
+        Poll-mode idle wait, shared by the sync and async watchers.
+        
+        Yields the seconds to sleep before the next check; the caller sends
+        back whether the page is busy. Returns once the page stayed idle for
+        the quiet window.
+        
+        Raises:
+            TimeoutError: If D365 stays busy longer than timeout
+        """
+        start = time.time()
+        busy = yield 0
+        
+        while time.time() - start < timeout:
+            if not busy:
+                # Double check it stays idle for the quiet window
+                busy = yield self.quiet_window
+                if not busy:
+                    return
+            
+            # Still busy, wait a bit and check again
+            busy = yield 0.2
+        
+        self._raise_timeout(timeout)
+    
+    def _raise_timeout(self, timeout: float) -> None:
+        """Raise the busy timeout error, naming the requests still blocking idle."""
+        blockers = self.blocking_requests()
+        details = "".join(
+            f"\n  - {b['method']} [{b['resource_type']}] {b['url']} ({b['age_ms']} ms)"
+            for b in blockers[:10]
+        )
+        raise TimeoutError(
+            f"D365 stayed busy for more than {timeout} seconds. "
+            f"Still has {len(blockers)} pending requests.{details}"
+        )
+
+
+class BusyWatcher(_BusyTracking):
     """
     Watches for D365 busy states and waits until page is idle.
     
+    Modes:
+        poll  - checks all busy selectors in one evaluate() per tick
+        event - an injected observer reports busy/idle transitions through
+                expose_binding; wait_until_idle blocks on the in-page idle
+                promise and network events instead of polling
+    
     Usage:
         guard = BusyWatcher(page)
         page.click("button")
         guard.wait_until_idle()  # Waits for D365 to finish loading
     """
     
-    def __init__(self, page: Page):
+    def __init__(
+        self,
+        page: Page,
+        mode: Optional[str] = None,
+        quiet_window: float = 0.5,
+        ignore_resource_types: Optional[Iterable[str]] = None,
+        ignore_url_patterns: Optional[Iterable[str]] = None
+    ):
         """
         Initialize the busy watcher.
         
         Args:
             page: Playwright Page object
+            mode: 'poll' or 'event' (default: D365_BUSY_MODE)
+            quiet_window: Seconds the page must stay idle before it counts as idle
+            ignore_resource_types: Resource types that never block idle
+                (default: IGNORED_RESOURCE_TYPES)
+            ignore_url_patterns: URL regexes that never block idle
+                (default: IGNORED_URL_PATTERNS)
         """
-        self.page = page
-        self._inflight = 0
+        super().__init__(page, quiet_window, ignore_resource_types, ignore_url_patterns)
+        self.mode = (mode or D365_BUSY_MODE).lower()
         
-        # Track network requests
-        page.on("request", lambda _: self._bump(1))
-        page.on("requestfinished", lambda _: self._bump(-1))
-        page.on("requestfailed", lambda _: self._bump(-1))
-    
-    def _bump(self, delta: int):
-        """Update the count of in-flight requests."""
-        self._inflight = max(0, self._inflight + delta)
+        self._bridge: Optional[_BusyBridge] = None
+        if self.mode == "event":
+            self._bridge = _bridges.get(page)
+            if self._bridge is None:
+                self._bridge = _BusyBridge(page)
+                _bridges[page] = self._bridge
     
     def _busy_visible(self) -> bool:
-        """Check if any busy indicators are visible."""
+        """Check if any busy indicators are visible (single round-trip)."""
+        try:
+            return bool(self.page.evaluate(_DETECTOR_SOURCE.strip(), self._spec))
+        except PlaywrightError:
+            # Context destroyed mid-navigation - fall back to per-selector checks
+            return self._busy_visible_per_selector()
+    
+    def _busy_visible_per_selector(self) -> bool:
+        """Check busy indicators one locator at a time."""
         for sel in BUSY_SELECTORS:
             with contextlib.suppress(Exception):
                 if self.page.locator(sel).first.is_visible():
                     return True
         return False
     
+    def is_busy(self) -> bool:
+        """
+        Check if D365 is currently busy.
+        
+        Returns:
+            bool: True if busy indicators are visible or requests are pending
+        """
+        if self._bridge is not None:
+            return self._bridge.dom_busy or self._inflight > 0
+        return self._busy_visible() or self._inflight > 0
+    
+    @timed("wait")
     def wait_until_idle(self, timeout: float = 60):
         """
         Wait until D365 is idle (no busy indicators, no pending requests).
         
         Args:
             timeout: Maximum time to wait in seconds (default: 60)
-            
+        
         Raises:
             TimeoutError: If D365 stays busy longer than timeout
         """
-        start = time.time()
+        if self._bridge is not None:
+            self._wait_until_idle_event(timeout)
+            return
         
-        while time.time() - start < timeout:
-            # Check if page is idle
-            if not self._busy_visible() and self._inflight == 0:
-                # Wait a bit to ensure it stays idle (quiet window)
-                time.sleep(0.5)
-                
-                # Double check it's still idle
-                if not self._busy_visible() and self._inflight == 0:
-                    return
-            
-            # Still busy, wait a bit and check again
-            time.sleep(0.2)
+        steps = self._idle_poll(timeout)
+        delay = next(steps)
+        try:
+            while True:
+                if delay:
+                    time.sleep(delay)
+                delay = steps.send(self._busy_visible() or self._inflight > 0)
+        except StopIteration:
+            return
+    
+    def _wait_until_idle_event(self, timeout: float) -> None:
+        """Event mode: DOM idleness resolves in the page, network via request events."""
+        deadline = time.monotonic() + timeout
+        quiet_ms = self.quiet_window * 1000
         
-        raise TimeoutError(
-            f"D365 stayed busy for more than {timeout} seconds. "
-            f"Still has {self._inflight} pending requests."
-        )
+        evaluate_error: Optional[PlaywrightError] = None
+        
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                if evaluate_error is not None:
+                    # The page never answered (crashed): report that, not "still busy"
+                    raise evaluate_error
+                self._raise_timeout(timeout)
+            
+            try:
+                dom_idle = self.page.evaluate(
+                    "([quiet, limit]) => window.__d365Busy ? window.__d365Busy.whenIdle(quiet, limit) : true",
+                    [quiet_ms, remaining * 1000]
+                )
+                evaluate_error = None
+            except PlaywrightError as e:
+                if self.page.is_closed():
+                    raise
+                # Navigation replaced the document; the init script re-installs
+                # the watcher once the new one is parsed
+                evaluate_error = e
+                with contextlib.suppress(PlaywrightError):
+                    self.page.wait_for_load_state("domcontentloaded", timeout=remaining * 1000)
+                time.sleep(0.1)
+                continue
+            
+            if not dom_idle:
+                continue
+            
+            if self._inflight > 0:
+                # Block until a request completes (failed ones are picked up next window)
+                with contextlib.suppress(PlaywrightTimeoutError):
+                    self.page.wait_for_event(
+                        "requestfinished",
+                        timeout=min(remaining, self.quiet_window) * 1000
+                    )
+                continue
+            
+            network_quiet_for = time.monotonic() - self._network_changed_at
+            if network_quiet_for >= self.quiet_window:
+                return
+            
+            # Dispatches request events while waiting out the network quiet window
+            self.page.wait_for_timeout((self.quiet_window - network_quiet_for) * 1000)
     
     def wait_for_navigation(self, timeout: float = 60):
         """
@@ -94,3 +474,87 @@ class BusyWatcher:
         """
         self.page.wait_for_load_state("networkidle", timeout=timeout * 1000)
         self.wait_until_idle(timeout=timeout)
+
+
+class AsyncBusyWatcher(_BusyTracking):
+    """
+    Busy watcher for playwright.async_api pages (pages/aio).
+    
+    A sibling of BusyWatcher (not a subclass, its checks are coroutines)
+    sharing request tracking and the in-page detector. It always polls:
+    event mode needs a synchronous expose_binding. Waiting yields to the
+    event loop, so other pages keep working meanwhile.
+    
+    Usage:
+        guard = AsyncBusyWatcher(page)
+        await page.click("button")
+        await guard.wait_until_idle()
+    """
+    
+    def __init__(self, page, quiet_window: float = 0.5, **kwargs):
+        """
+        Initialize the async busy watcher.
+        
+        Args:
+            page: playwright.async_api Page
+            quiet_window: Seconds the page must stay idle before it counts as idle
+            **kwargs: ignore_resource_types / ignore_url_patterns as for BusyWatcher
+        """
+        super().__init__(page, quiet_window=quiet_window, **kwargs)
+    
+    async def _busy_visible(self) -> bool:
+        """Check if any busy indicators are visible (single round-trip)."""
+        try:
+            return bool(await self.page.evaluate(_DETECTOR_SOURCE.strip(), self._spec))
+        except PlaywrightError:
+            if self.page.is_closed():
+                raise
+            # Context destroyed mid-navigation - fall back to per-selector checks
+            return await self._busy_visible_per_selector()
+    
+    async def _busy_visible_per_selector(self) -> bool:
+        """Check busy indicators one locator at a time."""
+        for sel in BUSY_SELECTORS:
+            with contextlib.suppress(Exception):
+                if await self.page.locator(sel).first.is_visible():
+                    return True
+        return False
+    
+    async def is_busy(self) -> bool:
+        """
+        Check if D365 is currently busy.
+        
+        Returns:
+            bool: True if busy indicators are visible or requests are pending
+        """
+        return await self._busy_visible() or self._inflight > 0
+    
+    async def wait_until_idle(self, timeout: float = 60):
+        """
+        Wait until D365 is idle (no busy indicators, no pending requests).
+        
+        Args:
+            timeout: Maximum time to wait in seconds (default: 60)
+        
+        Raises:
+            TimeoutError: If D365 stays busy longer than timeout
+        """
+        steps = self._idle_poll(timeout)
+        delay = next(steps)
+        try:
+            while True:
+                if delay:
+                    await asyncio.sleep(delay)
+                delay = steps.send(await self.is_busy())
+        except StopIteration:
+            return
+    
+    async def wait_for_navigation(self, timeout: float = 60):
+        """
+        Wait for navigation to complete (includes waiting until idle).
+        
+        Args:
+            timeout: Maximum time to wait in seconds (default: 60)
+        """
+        await self.page.wait_for_load_state("networkidle", timeout=timeout * 1000)
+        await self.wait_until_idle(timeout=timeout)
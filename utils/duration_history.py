@@ -0,0 +1,153 @@
+"""
+Per-test duration history used to balance pytest-xdist workers.
+
+The history is a small JSON file mapping test node IDs to smoothed
+durations in seconds. It is updated after every run (conftest_durations.py)
+and can be seeded from JUnit reports:
+
+    python -m utils.duration_history reports/junit/*.xml
+"""
+import argparse
+import json
+import os
+import statistics
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+
+DEFAULT_HISTORY_PATH = os.getenv("DURATION_HISTORY", ".pytest_durations.json")
+
+
+class DurationHistory:
+    """
+    Smoothed per-test durations persisted as JSON.
+
+    New measurements are blended with the stored value (exponential moving
+    average), so one slow outlier does not reorder the whole schedule.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_HISTORY_PATH, smoothing: float = 0.5):
+        """
+        Initialize the history.
+
+        Args:
+            path: History file
+            smoothing: Weight of a new measurement (1.0 keeps only the latest)
+        """
+        self.path = Path(path)
+        self.smoothing = smoothing
+        self.durations: Dict[str, float] = {}
+        self.load()
+
+    def load(self) -> None:
+        """Load the history file if it exists (a corrupt file starts an empty history)."""
+        try:
+            data = json.loads(self.path.read_text())
+            self.durations = {k: float(v) for k, v in data.get("durations", {}).items()}
+        except (OSError, ValueError, AttributeError):
+            self.durations = {}
+
+    def save(self) -> None:
+        """Write the history atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps({
+            "updated": datetime.now().isoformat(timespec="seconds"),
+            "durations": dict(sorted(self.durations.items()))
+        }, indent=1))
+        os.replace(tmp_path, self.path)
+
+    def record(self, nodeid: str, duration: float) -> None:
+        """
+        Blend a measured duration into the history.
+
+        Args:
+            nodeid: pytest node ID
+            duration: Seconds spent in setup + call + teardown
+        """
+        previous = self.durations.get(nodeid)
+        if previous is None:
+            self.durations[nodeid] = duration
+        else:
+            self.durations[nodeid] = previous + self.smoothing * (duration - previous)
+
+    def update(self, measurements: Dict[str, float]) -> None:
+        """Record several measurements."""
+        for nodeid, duration in measurements.items():
+            self.record(nodeid, duration)
+
+    def default_estimate(self) -> float:
+        """Estimate for tests without history: median of known durations, or 1s."""
+        return statistics.median(self.durations.values()) if self.durations else 1.0
+
+    def estimate(self, nodeid: str, default: Optional[float] = None) -> float:
+        """
+        Expected duration of a test.
+
+        Parametrized tests without their own history use the mean of their
+        siblings before falling back to the default.
+        """
+        if nodeid in self.durations:
+            return self.durations[nodeid]
+
+        base = nodeid.split("[", 1)[0]
+        siblings = [v for k, v in self.durations.items() if k.split("[", 1)[0] == base]
+        if siblings:
+            return sum(siblings) / len(siblings)
+
+        return self.default_estimate() if default is None else default
+
+    def import_junit(self, junit_file: str, rootdir: Union[str, Path] = ".") -> int:
+        """
+        Record durations from a JUnit XML report.
+
+        Args:
+            junit_file: JUnit XML path
+            rootdir: Project root used to map classnames back to test files
+
+        Returns:
+            int: Number of durations recorded
+        """
+        from utils.jira_integration import iter_junit_results
+
+        count = 0
+        for result in iter_junit_results(junit_file):
+            if result['status'] == 'BLOCKED':
+                continue
+            nodeid = junit_nodeid(result['classname'], result['test_name'], rootdir)
+            self.record(nodeid, result['duration'])
+            count += 1
+        return count
+
+
+def junit_nodeid(classname: str, name: str, rootdir: Union[str, Path] = ".") -> str:
+    """
+    Convert a JUnit classname/name pair back to a pytest node ID.
+
+    'tests.fh.test_fh_cart.TestCart' + 'test_x' becomes
+    'tests/fh/test_fh_cart.py::TestCart::test_x' when that file exists.
+    """
+    parts = classname.split(".") if classname else []
+    for i in range(len(parts), 0, -1):
+        module_path = "/".join(parts[:i]) + ".py"
+        if (Path(rootdir) / module_path).exists():
+            return "::".join([module_path] + parts[i:] + [name])
+    return "::".join(["/".join(parts) + ".py", name]) if parts else name
+
+
+def main():
+    """Seed the history from JUnit reports."""
+    parser = argparse.ArgumentParser(description="Record test durations from JUnit XML reports")
+    parser.add_argument("junit_files", nargs="+", help="JUnit XML files")
+    parser.add_argument("--history", default=DEFAULT_HISTORY_PATH, help="History file")
+    args = parser.parse_args()
+
+    history = DurationHistory(args.history)
+    total = sum(history.import_junit(f) for f in args.junit_files if os.path.exists(f))
+    history.save()
+    print(f"✅ Recorded {total} durations into {history.path} ({len(history.durations)} tests known)")
+
+
+if __name__ == "__main__":
+    main()
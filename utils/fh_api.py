@@ -0,0 +1,298 @@
+"""
+FourHands storefront API helpers.
+
+Uses the APIRequestContext of an authenticated browser context, so calls
+share the session cookies of the test without going through the UI.
+"""
+from typing import Iterable, List, Optional
+from urllib.parse import urlparse
+from playwright.sync_api import APIRequestContext, APIResponse, Page
+
+from configs.playwright_config import (
+    FH_BASE_URL,
+    FH_CART_API_PATH,
+    FH_SAVED_FOR_LATER_API_PATH,
+    FH_ADDRESS_API_PATH,
+)
+
+
+# Keys the cart payload uses for its line collection and line identifiers
+_LINE_COLLECTION_KEYS = ("lineItems", "items", "lines", "cartItems")
+_LINE_ID_KEYS = ("id", "lineItemId", "lineId", "cartItemId")
+
+
+class FourHandsApiError(Exception):
+    """Raised when a storefront API call fails."""
+    pass
+
+
+class FourHandsCartApi:
+    """
+    Cart operations through the storefront's backend endpoints.
+
+    Usage:
+        api = FourHandsCartApi.for_page(page)
+        if api.clear_cart():
+            page.reload()
+
+        api.add_products(["108422-001"])
+    """
+
+    def __init__(
+        self,
+        request_context: APIRequestContext,
+        base_url: str = FH_BASE_URL,
+        cart_path: str = FH_CART_API_PATH,
+        saved_for_later_path: str = FH_SAVED_FOR_LATER_API_PATH,
+        address_path: str = FH_ADDRESS_API_PATH,
+        timeout: int = 15000
+    ):
+        """
+        Initialize the cart API.
+
+        Args:
+            request_context: Request context of an authenticated browser context
+            base_url: Storefront origin
+            cart_path: Cart endpoint path
+            saved_for_later_path: Saved for Later endpoint path
+            address_path: Cart address endpoint path
+            timeout: Per-request timeout in milliseconds
+        """
+        self.request = request_context
+        self.base_url = base_url.rstrip("/")
+        self.cart_path = cart_path
+        self.saved_for_later_path = saved_for_later_path
+        self.address_path = address_path
+        self.timeout = timeout
+
+    @classmethod
+    def for_page(cls, page: Page, **kwargs) -> "FourHandsCartApi":
+        """
+        Build the API for the context of a page, using the page's origin.
+
+        Args:
+            page: Page on the FourHands storefront
+            **kwargs: Extra constructor arguments
+
+        Returns:
+            FourHandsCartApi: API bound to the page's context
+        """
+        parsed = urlparse(page.url)
+        if parsed.scheme in ("http", "https"):
+            kwargs.setdefault("base_url", f"{parsed.scheme}://{parsed.netloc}")
+        return cls(page.context.request, **kwargs)
+
+    # ==================== Cart ====================
+
+    def get_cart_line_ids(self) -> List[str]:
+        """
+        Get line identifiers currently in the cart.
+
+        Returns:
+            List[str]: Cart line IDs
+        """
+        return self._line_ids(self.cart_path)
+
+    def clear_cart(self) -> int:
+        """
+        Remove every cart line.
+
+        Returns:
+            int: Number of lines removed
+
+        Raises:
+            FourHandsApiError: If lines are left in the cart afterwards
+        """
+        return self._clear(self.cart_path)
+
+    def add_to_cart(self, sku: str, quantity: int = 1) -> List[str]:
+        """
+        Add a product to the cart.
+
+        Args:
+            sku: Product SKU
+            quantity: Units to add
+
+        Returns:
+            List[str]: Line IDs the call added (empty when it merged into an existing line)
+
+        Raises:
+            FourHandsApiError: If the storefront rejects the product or the cart
+                reads back unchanged
+        """
+        before = self._get_json(self.cart_path)
+        self._send("POST", f"{self.cart_path}/items", {"sku": sku, "quantity": quantity})
+        after = self._get_json(self.cart_path)
+        if after == before:
+            raise FourHandsApiError(f"Cart unchanged after adding {sku} through {self.cart_path}/items")
+
+        known = set(_extract_line_ids(before))
+        return [line_id for line_id in _extract_line_ids(after) if line_id not in known]
+
+    def add_products(self, skus: Iterable[str], quantity: int = 1) -> List[str]:
+        """
+        Add several products to the cart.
+
+        Args:
+            skus: Product SKUs
+            quantity: Units of each product
+
+        Returns:
+            List[str]: Line IDs added
+
+        Raises:
+            FourHandsApiError: If a product did not reach the cart
+        """
+        line_ids = []
+        for sku in skus:
+            line_ids.extend(self.add_to_cart(sku, quantity))
+        return line_ids
+
+    # ==================== Saved for Later ====================
+
+    def get_saved_for_later_ids(self) -> List[str]:
+        """
+        Get line identifiers currently in Saved for Later.
+
+        Returns:
+            List[str]: Saved line IDs
+        """
+        return self._line_ids(self.saved_for_later_path)
+
+    def clear_saved_for_later(self) -> int:
+        """
+        Remove every Saved for Later line.
+
+        Returns:
+            int: Number of lines removed
+
+        Raises:
+            FourHandsApiError: If lines are left in Saved for Later afterwards
+        """
+        return self._clear(self.saved_for_later_path)
+
+    def save_for_later(self, line_id: str) -> None:
+        """
+        Move a cart line to Saved for Later.
+
+        Args:
+            line_id: Cart line ID
+        """
+        self._send("POST", f"{self.saved_for_later_path}/items", {"lineItemId": line_id})
+
+    def seed_saved_for_later(self, skus: Iterable[str]) -> List[str]:
+        """
+        Put products into Saved for Later (added to the cart, then moved).
+
+        Args:
+            skus: Product SKUs
+
+        Returns:
+            List[str]: Cart line IDs that were moved
+        """
+        line_ids = self.add_products(skus)
+        for line_id in line_ids:
+            self.save_for_later(line_id)
+        return line_ids
+
+    # ==================== Addresses ====================
+
+    def set_address(self, address: dict, address_type: str = "shipping") -> dict:
+        """
+        Set the cart's shipping or billing address.
+
+        Args:
+            address: Address fields (e.g. line1, city, state, postalCode, country)
+            address_type: 'shipping' or 'billing'
+
+        Returns:
+            dict: Address as stored by the storefront (the request body if it returns none)
+        """
+        response = self._send("PUT", f"{self.address_path}/{address_type}", address)
+        try:
+            return response.json()
+        except Exception:
+            return address
+
+    # ==================== Internals ====================
+
+    def _url(self, path: str) -> str:
+        """Build an absolute endpoint URL."""
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def _get_json(self, path: str) -> dict:
+        """GET an endpoint and return its JSON body."""
+        response = self.request.get(self._url(path), timeout=self.timeout)
+        self._raise_for_status(response, "GET", path)
+        try:
+            return response.json()
+        except Exception as e:
+            raise FourHandsApiError(f"GET {path} did not return JSON: {e}") from e
+
+    def _send(self, method: str, path: str, data: dict) -> APIResponse:
+        """Send a JSON body to an endpoint and check the status."""
+        response = self.request.fetch(self._url(path), method=method, data=data, timeout=self.timeout)
+        self._raise_for_status(response, method, path)
+        return response
+
+    def _line_ids(self, path: str) -> List[str]:
+        """Read the line IDs of a cart-like endpoint."""
+        return _extract_line_ids(self._get_json(path))
+
+    def _clear(self, path: str) -> int:
+        """
+        Clear a cart-like collection and verify it reads back empty.
+
+        Tries a single bulk DELETE on the collection first; if the endpoint
+        does not support it, deletes the remaining lines one by one.
+        """
+        removed = line_ids = self._line_ids(path)
+        if not line_ids:
+            return 0
+
+        bulk = self.request.delete(self._url(path), timeout=self.timeout)
+        if bulk.ok:
+            line_ids = self._line_ids(path)
+
+        for line_id in line_ids:
+            response = self.request.delete(self._url(f"{path}/items/{line_id}"), timeout=self.timeout)
+            self._raise_for_status(response, "DELETE", f"{path}/items/{line_id}")
+
+        left = self._line_ids(path)
+        if left:
+            raise FourHandsApiError(f"{len(left)} line(s) left in {path} after clearing")
+        return len(removed)
+
+    @staticmethod
+    def _raise_for_status(response: APIResponse, method: str, path: str) -> None:
+        """Raise FourHandsApiError for non-2xx responses."""
+        if not response.ok:
+            raise FourHandsApiError(f"{method} {path} failed: {response.status} {response.status_text}")
+
+
+def _extract_line_ids(payload) -> List[str]:
+    """
+    Find the line identifiers in a cart payload.
+
+    Accepts either a bare list of lines or an object holding the list under
+    one of the usual collection keys (optionally nested under 'cart').
+    """
+    if isinstance(payload, dict):
+        if isinstance(payload.get("cart"), dict):
+            payload = payload["cart"]
+        lines: Optional[list] = None
+        for key in _LINE_COLLECTION_KEYS:
+            if isinstance(payload.get(key), list):
+                lines = payload[key]
+                break
+        payload = lines or []
+
+    ids = []
+    for line in payload if isinstance(payload, list) else []:
+        if not isinstance(line, dict):
+            continue
+        for key in _LINE_ID_KEYS:
+            if line.get(key) is not None:
+                ids.append(str(line[key]))
+                break
+    return ids
@@ -0,0 +1,180 @@
+"""
+Cross-process file lock used to coordinate pytest-xdist workers.
+
+Uses an exclusively created lock file (O_CREAT | O_EXCL), which works the
+same on Windows, macOS and Linux without platform-specific locking APIs.
+The file holds an owner token, so a lock is only removed by its owner; a
+lock held for long can keep its file fresh with a heartbeat thread, so it
+is never mistaken for one left over by a crashed process.
+"""
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Optional, Union
+
+
+class FileLockTimeout(TimeoutError):
+    """Raised when the lock cannot be acquired in time."""
+    pass
+
+
+class FileLock:
+    """
+    Exclusive lock backed by a lock file.
+
+    Usage:
+        with FileLock("storage_state/d365_session.json.lock", timeout=300):
+            ...  # only one worker at a time
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        timeout: float = 300,
+        poll_interval: float = 0.2,
+        stale_after: float = 600,
+        heartbeat: Optional[float] = None
+    ):
+        """
+        Initialize the lock.
+
+        Args:
+            path: Lock file path
+            timeout: Maximum seconds to wait for the lock
+            poll_interval: Seconds between acquisition attempts
+            stale_after: Lock files older than this are treated as left over
+                by a crashed worker and removed
+            heartbeat: Seconds between touches of the lock file while held
+                (for locks held longer than stale_after); None disables it
+        """
+        self.path = Path(path)
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.heartbeat = heartbeat
+        self._fd = None
+        self._token = f"{os.getpid()}:{uuid.uuid4().hex}"
+        self._stop_heartbeat: Optional[threading.Event] = None
+
+    def acquire(self) -> None:
+        """
+        Acquire the lock, waiting up to the timeout.
+
+        Raises:
+            FileLockTimeout: If another process holds the lock for too long
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        deadline = time.monotonic() + self.timeout
+
+        while True:
+            try:
+                self._fd = os.open(str(self.path), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(self._fd, self._token.encode())
+                self._start_heartbeat()
+                return
+            except FileExistsError:
+                self._remove_if_stale()
+
+            if time.monotonic() >= deadline:
+                raise FileLockTimeout(f"Could not acquire {self.path} within {self.timeout}s")
+            time.sleep(self.poll_interval)
+
+    def release(self) -> None:
+        """Release the lock if held (the file is only removed while it is still ours)."""
+        if self._fd is None:
+            return
+        if self._stop_heartbeat is not None:
+            self._stop_heartbeat.set()
+            self._stop_heartbeat = None
+        os.close(self._fd)
+        self._fd = None
+        if self.owned():
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def refresh(self) -> None:
+        """Mark a long-held lock as alive so it is not taken for stale."""
+        if self._fd is None or not self.owned():
+            return
+        try:
+            os.utime(self.path)
+        except FileNotFoundError:
+            pass
+
+    def owned(self) -> bool:
+        """Check if the lock file on disk still carries this instance's token."""
+        try:
+            return self.path.read_text() == self._token
+        except (FileNotFoundError, OSError):
+            return False
+
+    @property
+    def held(self) -> bool:
+        """True while this instance holds the lock."""
+        return self._fd is not None
+
+    def _start_heartbeat(self) -> None:
+        """Touch the lock file every `heartbeat` seconds until release."""
+        if not self.heartbeat:
+            return
+        stop = threading.Event()
+
+        def beat() -> None:
+            while not stop.wait(self.heartbeat):
+                self.refresh()
+
+        self._stop_heartbeat = stop
+        threading.Thread(target=beat, name=f"lock-heartbeat {self.path.name}", daemon=True).start()
+
+    def _remove_if_stale(self) -> None:
+        """
+        Remove a lock file left behind by a crashed process.
+
+        Unlinking by age alone races: another waiter may remove the stale
+        file and create its own lock between our stat and unlink. The file
+        is therefore renamed to a name only this waiter uses (one waiter
+        wins the rename) and checked again there; a lock that turns out to
+        be fresh or to carry another token is put back instead of deleted.
+        """
+        try:
+            if time.time() - self.path.stat().st_mtime <= self.stale_after:
+                return
+            stale_token = self.path.read_text()
+        except OSError:
+            return
+
+        moved = self.path.with_name(f"{self.path.name}.{uuid.uuid4().hex}.stale")
+        try:
+            os.rename(self.path, moved)
+        except OSError:
+            # Gone already, or still open by its holder (Windows)
+            return
+
+        try:
+            still_stale = (
+                moved.read_text() == stale_token
+                and time.time() - moved.stat().st_mtime > self.stale_after
+            )
+        except OSError:
+            still_stale = False
+        if not still_stale:
+            try:
+                # Link back without overwriting a lock created in the meantime
+                os.link(moved, self.path)
+            except OSError:
+                pass
+        try:
+            moved.unlink()
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.release()
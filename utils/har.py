@@ -0,0 +1,340 @@
+"""
+HAR record/replay for FourHands contexts.
+
+Modes (FH_HAR_MODE):
+    off     - live traffic (default)
+    record  - record each test's traffic into a HAR via route_from_har(update=True)
+    replay  - serve responses from the recorded HAR, no live environment needed
+
+A HAR belongs to a test, or to a page-object flow shared by several tests
+with @pytest.mark.har("flow_name"). Playwright rewrites a HAR instead of
+adding to it, so flow tests record into their own HAR and merge its entries
+into the flow HAR under a file lock (merge_har).
+
+Replay matching (FH_HAR_MATCH) is a comma list of url, query, method, body.
+The full set is Playwright's own matching, served by route_from_har; any
+narrower set uses HarReplayer, which also ignores volatile query parameters
+(FH_HAR_IGNORE_PARAMS) and replays repeated requests in recorded order.
+Requests missing from the HAR are aborted or sent to the network
+(FH_HAR_NOT_FOUND = abort | fallback).
+"""
+import base64
+import json
+import os
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Pattern, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+from playwright.sync_api import BrowserContext, Route
+
+from configs.playwright_config import (
+    FH_HAR_MODE,
+    FH_HAR_DIR,
+    FH_HAR_MATCH,
+    FH_HAR_IGNORE_PARAMS,
+    FH_HAR_NOT_FOUND,
+    FH_HAR_URL_FILTER,
+)
+from utils.file_lock import FileLock
+
+
+OFF = "off"
+RECORD = "record"
+REPLAY = "replay"
+
+MODES = (OFF, RECORD, REPLAY)
+MATCH_FIELDS = frozenset({"url", "query", "method", "body"})
+
+# Headers describing the recorded transfer rather than the decoded body
+_SKIP_RESPONSE_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "set-cookie"}
+
+
+def har_name(item) -> str:
+    """
+    HAR file name for a test item: the flow from @pytest.mark.har, or the node ID.
+
+    Args:
+        item: pytest item
+
+    Returns:
+        str: Relative HAR path, e.g. 'test_fh_cart/test_add_to_cart.har'
+    """
+    marker = item.get_closest_marker("har")
+    if marker and marker.args:
+        return f"flows/{marker.args[0]}.har"
+    return item_har_name(item)
+
+
+def item_har_name(item) -> str:
+    """HAR file name of the test itself (node ID based), ignoring any flow."""
+    module = Path(item.nodeid.split("::", 1)[0]).stem
+    test = re.sub(r"[^\w.-]+", "_", item.nodeid.split("::", 1)[-1]).strip("_")
+    return f"{module}/{test}.har"
+
+
+def merge_har(source: Path, target: Path, owner: str) -> int:
+    """
+    Merge the entries of a recorded HAR into a shared (flow) HAR.
+
+    Entries are tagged with their owner, so re-recording a test replaces its
+    previous entries instead of piling up. The target is rewritten atomically
+    under a file lock, so parallel workers can merge into the same flow.
+
+    Args:
+        source: HAR recorded by one test
+        target: Flow HAR shared by several tests
+        owner: Test node ID the entries belong to
+
+    Returns:
+        int: Number of entries merged
+    """
+    recorded = json.loads(Path(source).read_text(encoding="utf-8"))
+    entries = recorded["log"].get("entries", [])
+    for entry in entries:
+        entry["_owner"] = owner
+
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with FileLock(target.with_name(f"{target.name}.lock"), timeout=120):
+        if target.exists():
+            merged = json.loads(target.read_text(encoding="utf-8"))
+            kept = [e for e in merged["log"].get("entries", []) if e.get("_owner") != owner]
+        else:
+            merged, kept = recorded, []
+        merged["log"]["entries"] = kept + entries
+
+        tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(merged), encoding="utf-8")
+        os.replace(tmp_path, target)
+    return len(entries)
+
+
+@dataclass
+class HarReplayStats:
+    """Replay hits and misses for one context."""
+    hits: int = 0
+    misses: List[str] = field(default_factory=list)
+
+    def summary(self) -> str:
+        return f"{self.hits} responses replayed, {len(self.misses)} not in HAR"
+
+
+class HarReplayer:
+    """
+    Serve a recorded HAR with configurable request matching.
+
+    Entries with the same key are replayed in recorded order (the last one
+    repeats), so polling the same endpoint sees the recorded state changes.
+    """
+
+    def __init__(
+        self,
+        har_path: Path,
+        match: FrozenSet[str] = frozenset({"url", "method"}),
+        ignore_params: FrozenSet[str] = frozenset(),
+        not_found: str = "abort"
+    ):
+        """
+        Load the HAR and index its entries.
+
+        Args:
+            har_path: HAR file recorded with update_content='embed'
+            match: Request parts that must match (url, query, method, body)
+            ignore_params: Query parameters left out of the query match
+            not_found: 'abort' or 'fallback' for requests missing from the HAR
+        """
+        self.har_path = Path(har_path)
+        self.match = match
+        self.ignore_params = ignore_params
+        self.not_found = not_found
+        self.stats = HarReplayStats()
+        self._entries: Dict[Tuple, List[dict]] = defaultdict(list)
+        self._served: Dict[Tuple, int] = defaultdict(int)
+
+        log = json.loads(self.har_path.read_text(encoding="utf-8"))["log"]
+        for entry in log.get("entries", []):
+            request = entry["request"]
+            body = (request.get("postData") or {}).get("text")
+            self._entries[self.key(request["method"], request["url"], body)].append(entry["response"])
+
+    def key(self, method: str, url: str, body: Optional[str]) -> Tuple:
+        """Matching key of a request under the configured match fields."""
+        parts = urlsplit(url)
+        key = []
+        if "url" in self.match:
+            key.append(f"{parts.scheme}://{parts.netloc}{parts.path}")
+        if "query" in self.match:
+            params = sorted(p for p in parse_qsl(parts.query, keep_blank_values=True)
+                            if p[0] not in self.ignore_params)
+            key.append(urlencode(params))
+        if "method" in self.match:
+            key.append(method.upper())
+        if "body" in self.match:
+            key.append(body or "")
+        return tuple(key)
+
+    def lookup(self, method: str, url: str, body: Optional[str]) -> Optional[dict]:
+        """Next recorded response for a request, or None."""
+        key = self.key(method, url, body)
+        responses = self._entries.get(key)
+        if not responses:
+            return None
+        index = min(self._served[key], len(responses) - 1)
+        self._served[key] += 1
+        return responses[index]
+
+    def handle(self, route: Route):
+        """
+        Route handler: fulfill from the HAR or apply the not-found policy.
+
+        Returns the route call, so it also serves async contexts (Playwright
+        awaits a coroutine returned by a handler).
+        """
+        request = route.request
+        response = self.lookup(request.method, request.url, request.post_data)
+        if response is None:
+            self.stats.misses.append(f"{request.method} {request.url}")
+            if self.not_found == "fallback":
+                return route.fallback()
+            return route.abort()
+
+        self.stats.hits += 1
+        content = response.get("content", {})
+        text = content.get("text", "")
+        body = base64.b64decode(text) if content.get("encoding") == "base64" else text.encode("utf-8")
+        headers = {h["name"]: h["value"] for h in response.get("headers", [])
+                   if h["name"].lower() not in _SKIP_RESPONSE_HEADERS}
+        return route.fulfill(status=response.get("status", 200), headers=headers, body=body)
+
+
+@dataclass
+class HarPolicy:
+    """Record/replay settings for FH contexts."""
+    mode: str = OFF
+    directory: Path = Path("tests/fh/har")
+    match: FrozenSet[str] = MATCH_FIELDS
+    ignore_params: FrozenSet[str] = frozenset()
+    not_found: str = "abort"
+    # Regex limiting which requests are recorded/replayed (None = all)
+    url_filter: Optional[Pattern] = None
+
+    @classmethod
+    def from_env(cls) -> "HarPolicy":
+        """Build the policy from FH_HAR_* settings."""
+        mode = FH_HAR_MODE if FH_HAR_MODE in MODES else OFF
+        match = frozenset(f.strip() for f in FH_HAR_MATCH.lower().split(",") if f.strip()) & MATCH_FIELDS
+        ignore_params = frozenset(p.strip() for p in FH_HAR_IGNORE_PARAMS.split(",") if p.strip())
+        not_found = FH_HAR_NOT_FOUND if FH_HAR_NOT_FOUND in ("abort", "fallback") else "abort"
+        return cls(
+            mode=mode,
+            directory=Path(FH_HAR_DIR),
+            match=match or MATCH_FIELDS,
+            ignore_params=ignore_params,
+            not_found=not_found,
+            url_filter=re.compile(FH_HAR_URL_FILTER) if FH_HAR_URL_FILTER else None,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != OFF
+
+    @property
+    def native_matching(self) -> bool:
+        """Whether Playwright's own HAR matching covers the configured match."""
+        return self.match == MATCH_FIELDS and not self.ignore_params
+
+    def har_path(self, item) -> Path:
+        return self.directory / har_name(item)
+
+    def recording_path(self, item) -> Path:
+        """Where a test records: always its own HAR, flows are merged afterwards."""
+        return self.directory / item_har_name(item)
+
+    def attach(self, context: BrowserContext, item) -> Optional[HarReplayer]:
+        """
+        Start recording or replaying on a context.
+
+        Recording writes the HAR when the context closes, so record mode
+        needs a fresh (non-pooled) context, and finish() must run after
+        the context is closed.
+
+        Args:
+            context: Browser context
+            item: pytest item owning the HAR
+
+        Returns:
+            HarReplayer: When replaying with custom matching (for stats), else None
+
+        Raises:
+            FileNotFoundError: In replay mode when no HAR was recorded for the item
+        """
+        har_args, replayer = self._routes(item)
+        if har_args:
+            context.route_from_har(**har_args)
+        if replayer:
+            context.route(self.url_filter or "**/*", replayer.handle)
+        return replayer
+
+    async def attach_async(self, context, item) -> Optional[HarReplayer]:
+        """attach() for a playwright.async_api context (pages/aio flows)."""
+        har_args, replayer = self._routes(item)
+        if har_args:
+            await context.route_from_har(**har_args)
+        if replayer:
+            await context.route(self.url_filter or "**/*", replayer.handle)
+        return replayer
+
+    def _routes(self, item) -> Tuple[Optional[dict], Optional[HarReplayer]]:
+        """route_from_har arguments, or the custom-matching replayer, for the item's HAR."""
+        path = self.har_path(item)
+
+        if self.mode == RECORD:
+            path = self.recording_path(item)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            return dict(
+                har=path,
+                url=self.url_filter,
+                update=True,
+                update_content="embed",
+                update_mode="minimal",
+            ), None
+
+        if self.mode == REPLAY:
+            if not path.exists():
+                raise FileNotFoundError(f"No HAR recorded at {path}. Run with FH_HAR_MODE=record")
+            if self.native_matching:
+                return dict(har=path, url=self.url_filter, not_found=self.not_found), None
+            return None, HarReplayer(path, self.match, self.ignore_params, self.not_found)
+
+        return None, None
+
+    def finish(self, item) -> None:
+        """
+        Merge a recorded flow test's HAR into its flow HAR (after the context closed).
+
+        Args:
+            item: pytest item owning the HAR
+        """
+        if self.mode != RECORD:
+            return
+        recorded, flow = self.recording_path(item), self.har_path(item)
+        if recorded == flow or not recorded.exists():
+            return
+        count = merge_har(recorded, flow, item.nodeid)
+        recorded.unlink()
+        print(f"📼 Merged {count} recorded entries into {flow}")
+
+
+har_policy = HarPolicy.from_env()
+
+
+def get_har_policy() -> HarPolicy:
+    """
+    Get the global HAR policy instance.
+
+    Returns:
+        HarPolicy: The HAR policy
+    """
+    return har_policy
@@ -6,17 +6,700 @@ Handles test cycle creation, test execution updates, and defect creation
 import os
 import sys
 import json
+import re
+import time
+import hashlib
+import random
 import argparse
+import gzip
+import threading
 import requests
-from datetime import datetime
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, Iterator, List, Optional
 import xml.etree.ElementTree as ET
 from urllib.parse import urljoin
+from dataclasses import dataclass
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Map parsed JUnit status to Zephyr values
+ZEPHYR_STATUS = {
+    'PASS': 'Pass',
+    'FAIL': 'Fail',
+    'BLOCKED': 'Blocked'
+}
+
+# Rate limiting and transient server errors are retried
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Responses meaning the bulk endpoint is not available on this deployment
+BULK_UNSUPPORTED_CODES = (404, 405, 501)
+
+
+@dataclass
+class TransportConfig:
+    """HTTP transport settings for Jira and Zephyr sessions"""
+    pool_size: int = 10
+    connect_timeout: float = 10
+    read_timeout: float = 60
+    max_retries: int = 3
+    backoff_factor: float = 0.5
+    retry_statuses: tuple = RETRY_STATUS_CODES
+    gzip_requests: bool = False
+    gzip_min_bytes: int = 1024
+    
+    @classmethod
+    def from_env(cls) -> "TransportConfig":
+        """Load transport settings from environment variables"""
+        return cls(
+            pool_size=int(os.getenv('JIRA_POOL_SIZE', '10')),
+            connect_timeout=float(os.getenv('JIRA_CONNECT_TIMEOUT', '10')),
+            read_timeout=float(os.getenv('JIRA_READ_TIMEOUT', '60')),
+            max_retries=int(os.getenv('JIRA_MAX_RETRIES', '3')),
+            backoff_factor=float(os.getenv('JIRA_BACKOFF_FACTOR', '0.5')),
+            gzip_requests=os.getenv('JIRA_GZIP_REQUESTS', 'false').lower() == 'true'
+        )
+    
+    @property
+    def timeout(self) -> tuple:
+        """(connect, read) timeout passed to requests"""
+        return (self.connect_timeout, self.read_timeout)
+
+
+class TransportRetry(Retry):
+    """
+    urllib3 Retry that also replays non-idempotent requests answered with 429
+    
+    A rate-limited request was never processed, so replaying a POST is safe;
+    other statuses are only retried for idempotent methods.
+    """
+    
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if status_code == 429:
+            method = 'GET'
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+class TransportAdapter(HTTPAdapter):
+    """HTTPAdapter applying a default timeout and optional gzip request bodies"""
+    
+    def __init__(self, config: TransportConfig, retry: bool = True):
+        self.transport = config
+        max_retries = TransportRetry(
+            total=config.max_retries,
+            connect=config.max_retries,
+            read=config.max_retries,
+            status=config.max_retries,
+            backoff_factor=config.backoff_factor,
+            status_forcelist=config.retry_statuses,
+            respect_retry_after_header=True,
+            raise_on_status=False
+        ) if retry else Retry(total=0, connect=0, read=False, redirect=False, raise_on_status=False)
+        super().__init__(
+            pool_connections=config.pool_size,
+            pool_maxsize=config.pool_size,
+            max_retries=max_retries
+        )
+    
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.transport.timeout
+        
+        body = request.body
+        if (self.transport.gzip_requests and body and len(body) >= self.transport.gzip_min_bytes
+                and 'Content-Encoding' not in request.headers):
+            if isinstance(body, str):
+                body = body.encode('utf-8')
+            if isinstance(body, bytes):
+                request.body = gzip.compress(body)
+                request.headers['Content-Encoding'] = 'gzip'
+                request.headers['Content-Length'] = str(len(request.body))
+        
+        return super().send(request, **kwargs)
+
+
+def create_session(config: TransportConfig, headers: Dict, auth=None,
+                   retry: bool = True) -> requests.Session:
+    """
+    Create a pooled session with timeouts and retries
+    
+    Args:
+        config: Transport settings
+        headers: Default headers
+        auth: Optional requests auth
+        retry: Mount urllib3 retries (disable when the caller retries itself)
+    """
+    session = requests.Session()
+    session.auth = auth
+    session.headers.update(headers)
+    adapter = TransportAdapter(config, retry=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def build_test_result(status: str, duration: float, comment: str = "") -> Dict:
+    """Build a Zephyr test result payload"""
+    payload = {
+        "status": ZEPHYR_STATUS.get(status, 'Fail'),
+        "executionTime": int(duration * 1000),  # Convert to milliseconds
+    }
+    
+    if comment:
+        payload["comment"] = comment[:500]  # Limit comment length
+    
+    return payload
+
+
+class ZephyrResultUploader:
+    """
+    Concurrent Zephyr result uploader
+    
+    Sends results in batches to the bulk testresults endpoint through a
+    bounded thread pool. Falls back to one POST per test when the bulk
+    endpoint is not available (or rejects a batch). 429/5xx responses and
+    connection errors are retried with backoff, honouring Retry-After.
+    
+    The uploader owns retries for its requests, so give it a session built
+    with create_session(..., retry=False) and a pool of at least max_workers.
+    """
+    
+    BULK_ENDPOINT = "/rest/atm/1.0/testrun/{cycle_key}/testresults"
+    SINGLE_ENDPOINT = "/rest/atm/1.0/testrun/{cycle_key}/testcase/{test_key}/testresult"
+    
+    def __init__(self, session: requests.Session, base_url: str, max_workers: int = 8,
+                 batch_size: int = 50, max_retries: int = 5, backoff_factor: float = 0.5,
+                 max_backoff: float = 60, timeout: Optional[float] = None):
+        """
+        Args:
+            session: Authenticated session (shared by all worker threads)
+            base_url: Jira base URL
+            max_workers: Concurrent requests
+            batch_size: Results per bulk request (1 disables bulk uploads)
+            max_retries: Retries per request for 429/5xx/connection errors
+            backoff_factor: Base delay for exponential backoff in seconds
+            max_backoff: Upper bound for a single retry delay in seconds
+            timeout: Per-request timeout in seconds (None uses the session's default)
+        """
+        self.session = session
+        self.base_url = base_url
+        self.max_workers = max(1, max_workers)
+        self.batch_size = max(1, batch_size)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        
+        self._lock = threading.Lock()
+        self.requests_sent = 0
+        self.retries = 0
+    
+    def upload(self, cycle_key: str, results: Iterable[Dict]) -> Dict:
+        """
+        Upload results to a test cycle
+        
+        Args:
+            cycle_key: Test cycle key
+            results: Parsed results with a jira_key
+        
+        Returns:
+            Summary dict: uploaded, failed, mode, requests, retries, elapsed
+        """
+        results = [r for r in results if r.get('jira_key')]
+        start = time.perf_counter()
+        uploaded = 0
+        mode = 'single'
+        
+        if results and self.batch_size > 1:
+            batches = [results[i:i + self.batch_size] for i in range(0, len(results), self.batch_size)]
+            
+            # Probe the bulk endpoint with the first batch
+            first = self._upload_batch(cycle_key, batches[0])
+            if first is not None:
+                mode = 'bulk'
+                uploaded = first
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    uploaded += sum(
+                        count or 0 for count in executor.map(
+                            lambda batch: self._upload_batch(cycle_key, batch), batches[1:]
+                        )
+                    )
+        
+        if mode == 'single' and results:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                uploaded = sum(executor.map(lambda result: self._upload_single(cycle_key, result), results))
+        
+        return {
+            'uploaded': uploaded,
+            'failed': len(results) - uploaded,
+            'mode': mode,
+            'requests': self.requests_sent,
+            'retries': self.retries,
+            'elapsed': time.perf_counter() - start
+        }
+    
+    def _upload_batch(self, cycle_key: str, batch: List[Dict]) -> Optional[int]:
+        """
+        Upload a batch through the bulk endpoint
+        
+        Returns:
+            Number of results uploaded, or None if the bulk endpoint is unavailable
+        """
+        payload = []
+        for result in batch:
+            item = build_test_result(result['status'], result['duration'], result.get('message', ''))
+            item["testCaseKey"] = result['jira_key']
+            payload.append(item)
+        
+        endpoint = self.BULK_ENDPOINT.format(cycle_key=cycle_key)
+        response = self._send('POST', endpoint, json=payload)
+        
+        if response is not None and response.status_code in BULK_UNSUPPORTED_CODES:
+            return None
+        
+        if response is not None and response.ok:
+            print(f"  ✓ Uploaded batch of {len(batch)} results")
+            return len(batch)
+        
+        # Rejected batch (e.g. one unknown key): keep the valid results
+        print(f"  ⚠ Batch of {len(batch)} rejected, uploading individually")
+        return sum(self._upload_single(cycle_key, result) for result in batch)
+    
+    def _upload_single(self, cycle_key: str, result: Dict) -> bool:
+        """Upload one result through the per-test endpoint"""
+        test_key = result['jira_key']
+        endpoint = self.SINGLE_ENDPOINT.format(cycle_key=cycle_key, test_key=test_key)
+        payload = build_test_result(result['status'], result['duration'], result.get('message', ''))
+        
+        response = self._send('POST', endpoint, json=payload)
+        if response is not None and response.ok:
+            return True
+        
+        detail = f"{response.status_code} {response.text[:200]}" if response is not None else "no response"
+        print(f"  ✗ Failed to update {test_key}: {detail}")
+        return False
+    
+    def _send(self, method: str, endpoint: str, **kwargs) -> Optional[requests.Response]:
+        """
+        Send a request, retrying 429/5xx and connection errors
+        
+        Returns:
+            Last response, or None if the request never got one
+        """
+        url = urljoin(self.base_url, endpoint)
+        response = None
+        
+        for attempt in range(self.max_retries + 1):
+            with self._lock:
+                self.requests_sent += 1
+            
+            try:
+                response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                response = None
+                error = e
+            else:
+                if response.status_code not in RETRY_STATUS_CODES:
+                    return response
+            
+            if attempt == self.max_retries:
+                break
+            
+            with self._lock:
+                self.retries += 1
+            time.sleep(self._retry_delay(response, attempt))
+        
+        if response is None:
+            print(f"  ✗ {method} {url} failed: {error}")
+        return response
+    
+    def _retry_delay(self, response: Optional[requests.Response], attempt: int) -> float:
+        """Delay before the next attempt: Retry-After if given, else jittered exponential backoff"""
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                try:
+                    delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+                except (TypeError, ValueError):
+                    delay = None
+            if delay is not None:
+                return min(max(delay, 0), self.max_backoff)
+        
+        delay = self.backoff_factor * (2 ** attempt)
+        return min(delay * (0.5 + random.random() / 2), self.max_backoff)
+
+
+# Volatile parts of failure messages that differ between runs of the same defect
+_SIGNATURE_SUBSTITUTIONS = [
+    (re.compile(r'0x[0-9a-fA-F]+'), '<addr>'),
+    (re.compile(r'\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b'), '<uuid>'),
+    (re.compile(r'https?://\S+'), '<url>'),
+    (re.compile(r'\d+(\.\d+)?'), '<n>'),
+    (re.compile(r'\s+'), ' '),
+]
+
+# Label prefix identifying the defect opened for an error signature
+DEFECT_LABEL_PREFIX = 'auto-defect-'
+
+
+def normalize_error_signature(message: str) -> str:
+    """
+    Reduce a failure message to a signature shared by repeats of the same defect
+    
+    Keeps the first line and masks numbers, addresses, UUIDs and URLs, so
+    'Timeout 30000ms exceeded' and 'Timeout 15000ms exceeded' group together.
+    """
+    first_line = (message or '').strip().splitlines()[0] if (message or '').strip() else ''
+    signature = first_line
+    for pattern, replacement in _SIGNATURE_SUBSTITUTIONS:
+        signature = pattern.sub(replacement, signature)
+    return signature.strip().lower()[:200]
+
+
+def signature_label(signature: str) -> str:
+    """Jira label for an error signature"""
+    return DEFECT_LABEL_PREFIX + hashlib.sha1(signature.encode('utf-8')).hexdigest()[:12]
+
+
+class DefectEngine:
+    """
+    Creates Jira defects for failed tests without duplicating open issues
+    
+    Failures are grouped by normalized error signature (one defect per
+    signature, labelled with its hash). Open issues carrying those labels
+    are found with one JQL search per batch and get a comment; the rest are
+    created through the bulk create endpoint.
+    """
+    
+    SEARCH_ENDPOINT = "/rest/api/2/search"
+    BULK_CREATE_ENDPOINT = "/rest/api/2/issue/bulk"
+    CREATE_ENDPOINT = "/rest/api/2/issue"
+    COMMENT_ENDPOINT = "/rest/api/2/issue/{issue_key}/comment"
+    
+    def __init__(self, session: requests.Session, base_url: str, project_key: str,
+                 batch_size: int = 50, max_workers: int = 8):
+        """
+        Args:
+            session: Authenticated Jira session
+            base_url: Jira base URL
+            project_key: Project the defects are created in
+            batch_size: Labels per JQL search and issues per bulk create (Jira allows 50)
+            max_workers: Concurrent comment requests
+        """
+        self.session = session
+        self.base_url = base_url
+        self.project_key = project_key
+        self.batch_size = max(1, min(batch_size, 50))
+        self.max_workers = max(1, max_workers)
+    
+    def process(self, failures: Iterable[Dict], cycle_key: str, build_number: str) -> Dict:
+        """
+        Create or update defects for failed test results
+        
+        Args:
+            failures: Parsed results with status FAIL
+            cycle_key: Test cycle key
+            build_number: Build number
+        
+        Returns:
+            Summary dict: failures, signatures, created, commented, errors
+        """
+        groups = self.group_failures(failures)
+        labels = list(groups)
+        
+        existing = self.find_open_defects(labels)
+        new_labels = [label for label in labels if label not in existing]
+        
+        created = self.create_defects([groups[label] for label in new_labels], cycle_key, build_number)
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            commented = sum(executor.map(
+                lambda label: self.comment_on_defect(existing[label], groups[label], cycle_key, build_number),
+                list(existing)
+            ))
+        
+        return {
+            'failures': sum(len(group['tests']) for group in groups.values()),
+            'signatures': len(groups),
+            'created': len(created),
+            'commented': commented,
+            'errors': len(new_labels) - len(created) + len(existing) - commented
+        }
+    
+    def group_failures(self, failures: Iterable[Dict]) -> Dict[str, Dict]:
+        """
+        Group failures by error signature
+        
+        Returns:
+            Dict of label -> {'signature', 'message', 'tests'}
+        """
+        groups: Dict[str, Dict] = {}
+        for result in failures:
+            signature = normalize_error_signature(result.get('message', ''))
+            label = signature_label(signature)
+            group = groups.setdefault(label, {
+                'label': label,
+                'signature': signature,
+                'message': result.get('message', ''),
+                'tests': []
+            })
+            group['tests'].append(result['test_name'])
+        return groups
+    
+    def find_open_defects(self, labels: List[str]) -> Dict[str, str]:
+        """
+        Find unresolved issues carrying signature labels, one JQL search per batch
+        
+        Returns:
+            Dict of label -> issue key
+        """
+        found: Dict[str, str] = {}
+        for i in range(0, len(labels), self.batch_size):
+            batch = labels[i:i + self.batch_size]
+            jql = (
+                f'project = "{self.project_key}" AND labels in ({", ".join(batch)}) '
+                f'AND statusCategory != Done ORDER BY created ASC'
+            )
+            try:
+                response = self.session.post(
+                    urljoin(self.base_url, self.SEARCH_ENDPOINT),
+                    json={'jql': jql, 'fields': ['labels'], 'maxResults': len(batch) * 5}
+                )
+                if not response.ok:
+                    print(f"  ⚠ Defect search failed ({response.status_code}), treating batch as new")
+                    continue
+                issues = response.json().get('issues', [])
+            except (requests.RequestException, ValueError) as e:
+                print(f"  ⚠ Defect search failed ({e}), treating batch as new")
+                continue
+            
+            for issue in issues:
+                for label in issue.get('fields', {}).get('labels', []):
+                    if label in batch:
+                        found.setdefault(label, issue['key'])
+        return found
+    
+    def create_defects(self, groups: List[Dict], cycle_key: str, build_number: str) -> Dict[str, str]:
+        """
+        Create one defect per signature group through the bulk create endpoint
+        
+        Returns:
+            Dict of label -> created issue key
+        """
+        created: Dict[str, str] = {}
+        for i in range(0, len(groups), self.batch_size):
+            batch = groups[i:i + self.batch_size]
+            issue_updates = [{'fields': self._fields(group, cycle_key, build_number)} for group in batch]
+            try:
+                response = self.session.post(
+                    urljoin(self.base_url, self.BULK_CREATE_ENDPOINT),
+                    json={'issueUpdates': issue_updates}
+                )
+                
+                if response.status_code in BULK_UNSUPPORTED_CODES:
+                    created.update(self._create_individually(batch, issue_updates))
+                    continue
+                
+                data = response.json() if response.content else {}
+            except (requests.RequestException, ValueError) as e:
+                # Counted as errors by the caller; the remaining batches still run
+                print(f"  ✗ Failed to create {len(batch)} defect(s): {e}")
+                continue
+            
+            failed = {error.get('failedElementNumber') for error in data.get('errors', [])}
+            issues = iter(data.get('issues', []))
+            for index, group in enumerate(batch):
+                if index in failed:
+                    print(f"  ✗ Failed to create defect for: {group['signature'][:80]}")
+                    continue
+                issue = next(issues, None)
+                if issue:
+                    created[group['label']] = issue['key']
+                    print(f"✓ Created defect: {issue['key']} ({len(group['tests'])} tests)")
+        return created
+    
+    def comment_on_defect(self, issue_key: str, group: Dict, cycle_key: str, build_number: str) -> bool:
+        """Add a recurrence comment to an existing defect"""
+        tests = '\n'.join(f"* {name}" for name in group['tests'][:50])
+        body = (
+            f"Failure seen again in build {build_number} (cycle {cycle_key}) "
+            f"by {len(group['tests'])} test(s):\n{tests}"
+        )
+        try:
+            response = self.session.post(
+                urljoin(self.base_url, self.COMMENT_ENDPOINT.format(issue_key=issue_key)),
+                json={'body': body}
+            )
+        except requests.RequestException as e:
+            print(f"  ✗ Failed to comment on {issue_key}: {e}")
+            return False
+        if response.ok:
+            print(f"✓ Commented on existing defect: {issue_key}")
+            return True
+        print(f"  ✗ Failed to comment on {issue_key}: {response.status_code}")
+        return False
+    
+    def _create_individually(self, batch: List[Dict], issue_updates: List[Dict]) -> Dict[str, str]:
+        """Fallback for Jira instances without bulk create"""
+        created = {}
+        for group, update in zip(batch, issue_updates):
+            try:
+                response = self.session.post(urljoin(self.base_url, self.CREATE_ENDPOINT), json=update)
+                if response.ok:
+                    created[group['label']] = response.json()['key']
+                    print(f"✓ Created defect: {created[group['label']]}")
+                else:
+                    print(f"  ✗ Failed to create defect: {response.status_code}")
+            except (requests.RequestException, ValueError, KeyError) as e:
+                print(f"  ✗ Failed to create defect: {e}")
+        return created
+    
+    def _fields(self, group: Dict, cycle_key: str, build_number: str) -> Dict:
+        """Issue fields for a signature group"""
+        tests = group['tests']
+        if len(tests) == 1:
+            summary = f"[Automated] Test Failure: {tests[0]}"
+        else:
+            summary = f"[Automated] {len(tests)} tests failing: {group['signature'][:120]}"
+        
+        return defect_fields(
+            self.project_key,
+            summary[:250],
+            defect_description(tests, group['message'], cycle_key, build_number),
+            [group['label'], f"build-{build_number}"]
+        )
+
+
+def defect_description(test_names: List[str], error_message: str, cycle_key: str, build_number: str) -> str:
+    """Jira wiki-markup description for a failure defect"""
+    tests = '\n'.join(f"* {name}" for name in test_names[:50])
+    return f"""
+h3. Test Failure Details
+
+*Failing Tests:*
+{tests}
+
+*Test Cycle:* {cycle_key}
+*Build Number:* {build_number}
+*Detected:* {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+
+h3. Error Message
+{{code}}
+{error_message[:1000]}
+{{code}}
+
+h3. Investigation Required
+This defect was automatically created from a failed automated test execution.
+        """
+
+
+def defect_fields(project_key: str, summary: str, description: str, labels: List[str]) -> Dict:
+    """Jira issue fields for an automated defect"""
+    return {
+        "project": {
+            "key": project_key
+        },
+        "summary": summary,
+        "description": description,
+        "issuetype": {
+            "name": "Bug"
+        },
+        "priority": {
+            "name": "Medium"
+        },
+        "labels": [
+            "automated-test",
+            "test-failure",
+            *labels
+        ]
+    }
+
+
+def iter_junit_results(junit_file: str) -> Iterator[Dict]:
+    """
+    Stream test results from a JUnit XML file
+    
+    Uses iterparse and discards each testcase once read, so memory stays
+    flat for large (merged xdist) reports. Every testcase is yielded
+    exactly once, however deeply its testsuite is nested.
+    
+    Args:
+        junit_file: Path to JUnit XML file
+    
+    Yields:
+        Test result dicts (same shape as parse_junit_results)
+    """
+    parents = []
+    
+    for event, elem in ET.iterparse(junit_file, events=('start', 'end')):
+        if event == 'start':
+            parents.append(elem)
+            continue
+        
+        parents.pop()
+        if elem.tag != 'testcase':
+            continue
+        
+        test_name = elem.get('name')
+        classname = elem.get('classname', '')
+        
+        # Determine test status
+        status, message = 'PASS', ''
+        for child in elem:
+            if child.tag in ('failure', 'error'):
+                status, message = 'FAIL', child.get('message', '')
+                break
+            if child.tag == 'skipped':
+                status, message = 'BLOCKED', 'Test skipped'
+        
+        # Jira keys written by conftest_jira.py as testcase properties
+        properties = {
+            prop.get('name'): prop.get('value')
+            for prop in elem.iterfind('properties/property')
+        }
+        jira_key = properties.get('jira_test_case') or extract_jira_key(test_name, classname)
+        
+        yield {
+            'test_name': test_name,
+            'classname': classname,
+            'status': status,
+            'duration': float(elem.get('time', 0) or 0),
+            'message': message,
+            'jira_key': jira_key,
+            'jira_issue': properties.get('jira_issue')
+        }
+        
+        # Drop the processed testcase so the tree never grows
+        elem.clear()
+        if parents:
+            parents[-1].remove(elem)
+
+
+def extract_jira_key(test_name: str, classname: str) -> Optional[str]:
+    """Extract Jira test case key from test metadata"""
+    # Look for pattern like TEST-123, PROJ-456, etc.
+    pattern = r'([A-Z]+-\d+)'
+    
+    # Check test name
+    match = re.search(pattern, test_name)
+    if match:
+        return match.group(1)
+    
+    # Check classname
+    match = re.search(pattern, classname)
+    if match:
+        return match.group(1)
+    
+    return None
+
 
 class JiraZephyrIntegration:
     """Integration class for Jira and Zephyr Scale API interactions"""
@@ -30,18 +713,29 @@ class JiraZephyrIntegration:
         # Zephyr Scale Cloud API endpoints
         self.zephyr_api_base = "https://api.zephyrscale.smartbear.com/v2"
         
-        self.session = requests.Session()
-        self.session.auth = (self.email, self.api_token)
-        self.session.headers.update({
+        # Concurrent result upload settings
+        self.upload_workers = int(os.getenv('ZEPHYR_UPLOAD_WORKERS', '8'))
+        self.upload_batch_size = int(os.getenv('ZEPHYR_BATCH_SIZE', '50'))
+        self.upload_max_retries = int(os.getenv('ZEPHYR_MAX_RETRIES', '5'))
+        
+        # Pooled sessions with timeouts and retries; the pool must fit the upload workers
+        self.transport = TransportConfig.from_env()
+        self.transport.pool_size = max(self.transport.pool_size, self.upload_workers)
+        
+        json_headers = {
             'Accept': 'application/json',
             'Content-Type': 'application/json'
-        })
+        }
+        self.session = create_session(self.transport, json_headers, auth=(self.email, self.api_token))
+        
+        # Result uploads retry in ZephyrResultUploader, so no transport retries here
+        self.upload_session = create_session(
+            self.transport, json_headers, auth=(self.email, self.api_token), retry=False
+        )
         
         # Zephyr Scale uses bearer token auth
-        self.zephyr_session = requests.Session()
-        self.zephyr_session.headers.update({
-            'Accept': 'application/json',
-            'Content-Type': 'application/json',
+        self.zephyr_session = create_session(self.transport, {
+            **json_headers,
             'Authorization': f'Bearer {self.api_token}'
         })
     
@@ -67,7 +761,7 @@ class JiraZephyrIntegration:
             name: Name of the test cycle
             project_key: Jira project key
             version: Optional version/release name
-            
+        
         Returns:
             Test cycle key
         """
@@ -114,72 +808,15 @@ class JiraZephyrIntegration:
         
         Args:
             junit_file: Path to JUnit XML file
-            
+        
         Returns:
             List of test results
         """
-        tree = ET.parse(junit_file)
-        root = tree.getroot()
-        
-        results = []
-        
-        for testsuite in root.findall('.//testsuite'):
-            for testcase in testsuite.findall('.//testcase'):
-                test_name = testcase.get('name')
-                classname = testcase.get('classname')
-                time = float(testcase.get('time', 0))
-                
-                # Determine test status
-                failure = testcase.find('failure')
-                error = testcase.find('error')
-                skipped = testcase.find('skipped')
-                
-                if failure is not None:
-                    status = 'FAIL'
-                    message = failure.get('message', '')
-                elif error is not None:
-                    status = 'FAIL'
-                    message = error.get('message', '')
-                elif skipped is not None:
-                    status = 'BLOCKED'
-                    message = 'Test skipped'
-                else:
-                    status = 'PASS'
-                    message = ''
-                
-                # Try to extract Jira test case key from test name or docstring
-                # Expected format: test_name (TEST-123) or @pytest.mark.jira('TEST-123')
-                jira_key = self._extract_jira_key(test_name, classname)
-                
-                results.append({
-                    'test_name': test_name,
-                    'classname': classname,
-                    'status': status,
-                    'duration': time,
-                    'message': message,
-                    'jira_key': jira_key
-                })
-        
-        return results
+        return list(self.iter_junit_results(junit_file))
     
-    def _extract_jira_key(self, test_name: str, classname: str) -> Optional[str]:
-        """Extract Jira test case key from test metadata"""
-        import re
-        
-        # Look for pattern like TEST-123, PROJ-456, etc.
-        pattern = r'([A-Z]+-\d+)'
-        
-        # Check test name
-        match = re.search(pattern, test_name)
-        if match:
-            return match.group(1)
-        
-        # Check classname
-        match = re.search(pattern, classname)
-        if match:
-            return match.group(1)
-        
-        return None
+    def iter_junit_results(self, junit_file: str) -> Iterator[Dict]:
+        """Stream test results from a JUnit XML file (see iter_junit_results)"""
+        return iter_junit_results(junit_file)
     
     def update_test_results(self, cycle_key: str, junit_file: str, test_type: str = ""):
         """
@@ -198,18 +835,15 @@ class JiraZephyrIntegration:
             print(f"✗ Results file not found: {junit_file}")
             return
         
-        results = self.parse_junit_results(junit_file)
-        
-        print(f"\nProcessing {len(results)} test results...")
+        print(f"\nProcessing test results...")
         
         success_count = 0
         fail_count = 0
         skip_count = 0
+        keyed_results = []
         
-        for result in results:
+        for result in self.iter_junit_results(junit_file):
             status = result['status']
-            test_name = result['test_name']
-            jira_key = result['jira_key']
             
             if status == 'PASS':
                 success_count += 1
@@ -218,49 +852,30 @@ class JiraZephyrIntegration:
             else:
                 skip_count += 1
             
-            # If test has associated Jira key, update it
-            if jira_key:
-                self._update_test_execution(
-                    cycle_key=cycle_key,
-                    test_key=jira_key,
-                    status=status,
-                    duration=result['duration'],
-                    comment=result['message']
-                )
+            # Only tests with an associated Jira key are uploaded
+            if result['jira_key']:
+                keyed_results.append(result)
             else:
-                print(f"  ⚠ No Jira key found for: {test_name}")
+                print(f"  ⚠ No Jira key found for: {result['test_name']}")
+        
+        uploader = ZephyrResultUploader(
+            self.upload_session,
+            self.base_url,
+            max_workers=self.upload_workers,
+            batch_size=self.upload_batch_size,
+            max_retries=self.upload_max_retries
+        )
+        upload = uploader.upload(cycle_key, keyed_results)
         
         print(f"\n✓ Test results updated:")
         print(f"  Passed: {success_count}")
         print(f"  Failed: {fail_count}")
         print(f"  Skipped: {skip_count}")
-        print(f"  Total: {len(results)}")
-    
-    def _update_test_execution(self, cycle_key: str, test_key: str, 
-                              status: str, duration: float, comment: str = ""):
-        """Update a single test execution in Zephyr"""
-        endpoint = f"/rest/atm/1.0/testrun/{cycle_key}/testcase/{test_key}/testresult"
-        
-        # Map status to Zephyr values
-        status_map = {
-            'PASS': 'Pass',
-            'FAIL': 'Fail',
-            'BLOCKED': 'Blocked'
-        }
-        
-        payload = {
-            "status": status_map.get(status, 'Fail'),
-            "executionTime": int(duration * 1000),  # Convert to milliseconds
-        }
-        
-        if comment:
-            payload["comment"] = comment[:500]  # Limit comment length
-        
-        try:
-            self._make_request('POST', endpoint, json=payload)
-            print(f"  ✓ Updated {test_key}: {status}")
-        except Exception as e:
-            print(f"  ✗ Failed to update {test_key}: {e}")
+        print(f"  Total: {success_count + fail_count + skip_count}")
+        print(f"  Uploaded: {upload['uploaded']} ({upload['mode']}, {upload['requests']} requests, "
+              f"{upload['retries']} retries, {upload['elapsed']:.1f}s)")
+        if upload['failed']:
+            print(f"  Upload failures: {upload['failed']}")
     
     def finalize_test_cycle(self, cycle_key: str, build_number: str, build_url: str):
         """
@@ -304,50 +919,22 @@ class JiraZephyrIntegration:
             error_message: Error/failure message
             cycle_key: Test cycle key
             build_number: Build number
-            
+        
         Returns:
             Defect key if created successfully
         """
         endpoint = "/rest/api/2/issue"
         
         summary = f"[Automated] Test Failure: {test_name}"
-        
-        description = f"""
-h3. Test Failure Details
-
-*Test Name:* {test_name}
-*Test Cycle:* {cycle_key}
-*Build Number:* {build_number}
-*Detected:* {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-h3. Error Message
-{{code}}
-{error_message[:1000]}
-{{code}}
-
-h3. Investigation Required
-This defect was automatically created from a failed automated test execution.
-        """
+        description = defect_description([test_name], error_message, cycle_key, build_number)
         
         payload = {
-            "fields": {
-                "project": {
-                    "key": self.project_key
-                },
-                "summary": summary,
-                "description": description,
-                "issuetype": {
-                    "name": "Bug"
-                },
-                "priority": {
-                    "name": "Medium"
-                },
-                "labels": [
-                    "automated-test",
-                    "test-failure",
-                    f"build-{build_number}"
-                ]
-            }
+            "fields": defect_fields(
+                self.project_key,
+                summary,
+                description,
+                [f"build-{build_number}", signature_label(normalize_error_signature(error_message))]
+            )
         }
         
         try:
@@ -364,7 +951,12 @@ This defect was automatically created from a failed automated test execution.
             return None
     
     def create_defects_from_failures(self, cycle_key: str, build_number: str):
-        """Create defects for all failed tests in a cycle"""
+        """
+        Create defects for all failed tests in a cycle
+        
+        Failures sharing an error signature become one defect; open defects
+        for a signature get a comment instead of a duplicate issue.
+        """
         print(f"\nChecking for test failures to create defects...")
         
         # In a real scenario, you would query Zephyr API for failed tests
@@ -375,24 +967,23 @@ This defect was automatically created from a failed automated test execution.
                 if file.endswith('.xml'):
                     junit_files.append(os.path.join(root, file))
         
-        total_defects = 0
+        failures = [
+            result
+            for junit_file in junit_files
+            for result in self.iter_junit_results(junit_file)
+            if result['status'] == 'FAIL'
+        ]
         
-        for junit_file in junit_files:
-            if os.path.exists(junit_file):
-                results = self.parse_junit_results(junit_file)
-                
-                for result in results:
-                    if result['status'] == 'FAIL':
-                        defect_key = self.create_defect(
-                            test_name=result['test_name'],
-                            error_message=result['message'],
-                            cycle_key=cycle_key,
-                            build_number=build_number
-                        )
-                        if defect_key:
-                            total_defects += 1
+        engine = DefectEngine(self.session, self.base_url, self.project_key,
+                              max_workers=self.upload_workers)
+        summary = engine.process(failures, cycle_key, build_number)
         
-        print(f"\n✓ Created {total_defects} defects for failed tests")
+        print(f"\n✓ Defects for {summary['failures']} failed tests "
+              f"({summary['signatures']} distinct errors):")
+        print(f"  Created: {summary['created']}")
+        print(f"  Commented on existing: {summary['commented']}")
+        if summary['errors']:
+            print(f"  Errors: {summary['errors']}")
 
 
 def main():
@@ -463,7 +1054,7 @@ def main():
         
         print("\n✓ Command completed successfully")
         sys.exit(0)
-        
+    
     except Exception as e:
         print(f"\n✗ Error: {e}")
         import traceback
@@ -0,0 +1,81 @@
+"""
+Lazy proxies for browser fixtures.
+
+A LazyProxy stands in for a Page or BrowserContext and creates it on the
+first attribute access. Tests that request a page but never touch it
+(migration stubs, file-only checks) open no context, start no trace and
+record no video.
+
+    with ExitStack() as teardown:
+        yield LazyProxy(lambda: open_page(teardown), "fh_authenticated_page")
+
+isinstance(proxy, Page) resolves the proxy (so expect(page) works), while
+is_pending(proxy) lets hooks check for an untouched fixture without
+creating it.
+"""
+from typing import Any, Callable
+
+from utils.timing import get_step_timer
+
+
+_PENDING = object()
+
+
+class LazyProxy:
+    """Creates its target on first use and forwards everything to it."""
+
+    __slots__ = ("_lazy_factory", "_lazy_name", "_lazy_target")
+
+    def __init__(self, factory: Callable[[], Any], name: str = "resource"):
+        """
+        Initialize the proxy.
+
+        Args:
+            factory: Creates the target (may call pytest.skip)
+            name: Fixture name for timing and repr
+        """
+        object.__setattr__(self, "_lazy_factory", factory)
+        object.__setattr__(self, "_lazy_name", name)
+        object.__setattr__(self, "_lazy_target", _PENDING)
+
+    def _resolve(self) -> Any:
+        target = object.__getattribute__(self, "_lazy_target")
+        if target is _PENDING:
+            name = object.__getattribute__(self, "_lazy_name")
+            with get_step_timer().measure("fixture", f"{name} setup", "lazy"):
+                target = object.__getattribute__(self, "_lazy_factory")()
+            object.__setattr__(self, "_lazy_target", target)
+        return target
+
+    @property
+    def __class__(self):
+        return type(self._resolve())
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._resolve(), name, value)
+
+    def __dir__(self):
+        return dir(self._resolve())
+
+    def __repr__(self) -> str:
+        target = object.__getattribute__(self, "_lazy_target")
+        if target is _PENDING:
+            return f"<LazyProxy {object.__getattribute__(self, '_lazy_name')} (not created)>"
+        return repr(target)
+
+
+def is_pending(obj: Any) -> bool:
+    """
+    Check if obj is a lazy proxy whose target was never created (never resolves it).
+
+    Args:
+        obj: Fixture value
+
+    Returns:
+        bool: True for an untouched LazyProxy
+    """
+    return type(obj) is LazyProxy and object.__getattribute__(obj, "_lazy_target") is _PENDING
+
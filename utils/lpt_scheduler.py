@@ -0,0 +1,80 @@
+"""
+Longest-processing-time-first scheduler for pytest-xdist.
+
+Pending tests are ordered by their expected duration (from the duration
+history) and handed out greedily: every worker holds at most two tests,
+and whichever worker frees up first takes the next-longest test. Long D365
+e2e tests therefore start immediately instead of landing at the end of one
+worker's queue, keeping total wall time close to the critical path.
+"""
+from xdist.scheduler import LoadScheduling
+
+from utils.duration_history import DurationHistory
+
+
+class LPTScheduling(LoadScheduling):
+    """LoadScheduling variant that dispatches longest tests first."""
+
+    # A worker only runs a test once it knows the next one (for teardown),
+    # so two tests in flight keep it busy without queueing work on it
+    IN_FLIGHT = 2
+
+    def __init__(self, config, log=None, history: DurationHistory = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            config: pytest config
+            log: xdist log producer
+            history: Duration history used for estimates
+        """
+        super().__init__(config, log)
+        self.history = history or DurationHistory()
+
+    def schedule(self) -> None:
+        """Order the collection by expected duration and start distribution."""
+        assert self.collection_is_completed
+
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = list(next(iter(self.node2collection.values())))
+        if not self.collection:
+            return
+
+        default = self.history.default_estimate()
+        estimates = [self.history.estimate(nodeid, default) for nodeid in self.collection]
+        self.pending[:] = sorted(range(len(self.collection)), key=lambda i: estimates[i], reverse=True)
+
+        known = sum(1 for nodeid in self.collection if nodeid in self.history.durations)
+        self.log(f"LPT: {known}/{len(self.collection)} tests with history, "
+                 f"expected total {sum(estimates):.1f}s")
+
+        # Deal round-robin so the longest tests start on different workers
+        for _ in range(self.IN_FLIGHT):
+            for node in self.nodes:
+                self._send_tests(node, 1)
+
+        if not self.pending:
+            for node in self.nodes:
+                node.shutdown()
+
+    def check_schedule(self, node, duration: float = 0) -> None:
+        """Top the node up to IN_FLIGHT tests, or shut it down when nothing is left."""
+        if node.shutting_down:
+            return
+
+        if self.pending:
+            missing = self.IN_FLIGHT - len(self.node2pending[node])
+            if missing > 0:
+                self._send_tests(node, missing)
+        else:
+            node.shutdown()
+
+        self.log("num items waiting for node:", len(self.pending))
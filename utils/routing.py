@@ -0,0 +1,345 @@
+"""
+Request routing profiles for FourHands contexts.
+
+Most cart and checkout assertions do not need analytics, chat widgets,
+product imagery or web fonts. A routing profile blocks trackers and stubs
+heavy assets with context.route(); first-party pages and APIs are never
+routed through Python, so they keep full speed.
+
+Profiles:
+    off       - no routing (full storefront)
+    trackers  - block analytics, tag managers and chat widgets
+    lean      - trackers + 1x1 placeholder images + no fonts/media
+"""
+import base64
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Pattern, Tuple
+from playwright.sync_api import BrowserContext, Route, Response
+
+from configs.playwright_config import FH_ROUTING_PROFILE
+from utils.file_lock import FileLock
+
+
+# 1x1 transparent PNG served instead of product imagery
+PLACEHOLDER_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+)
+
+# Third-party analytics, tag managers, session replay and chat widgets
+TRACKER_PATTERN = re.compile(
+    r"^https?://([^/]*\.)?("
+    r"google-analytics\.com|googletagmanager\.com|doubleclick\.net|googleadservices\.com|"
+    r"facebook\.net|facebook\.com/tr|connect\.facebook\.net|hotjar\.com|hotjar\.io|"
+    r"clarity\.ms|segment\.(com|io)|mixpanel\.com|amplitude\.com|fullstory\.com|"
+    r"intercom\.io|intercomcdn\.com|zendesk\.com|zdassets\.com|driftt?\.com|livechatinc\.com|"
+    r"tiktok\.com|analytics\.tiktok\.com|pinterest\.com/ct|ct\.pinterest\.com|bat\.bing\.com|"
+    r"klaviyo\.com|newrelic\.com|nr-data\.net|onetrust\.com|cookielaw\.org"
+    r")(/|$)",
+    re.IGNORECASE
+)
+
+IMAGE_PATTERN = re.compile(r"(\.(png|jpe?g|gif|webp|avif|svg|ico)(\?|$))|cloudfront\.net/image/", re.IGNORECASE)
+FONT_PATTERN = re.compile(r"\.(woff2?|ttf|otf|eot)(\?|$)|fonts\.(googleapis|gstatic)\.com", re.IGNORECASE)
+MEDIA_PATTERN = re.compile(r"\.(mp4|webm|m4v|mov|mp3)(\?|$)", re.IGNORECASE)
+
+# First-party endpoints that must always load, whatever the patterns above match
+KEEP_PATTERN = re.compile(r"/api/", re.IGNORECASE)
+
+SIZE_CACHE_PATH = "test-results/routing_sizes.json"
+
+# Typical transfer size per category, used for routed requests whose size was
+# never learned (with 'trackers' as the default profile, most never load unrouted)
+ESTIMATED_SIZES = {
+    "trackers": 40 * 1024,
+    "images": 80 * 1024,
+    "fonts": 30 * 1024,
+    "media": 500 * 1024,
+}
+
+
+@dataclass
+class RoutingProfile:
+    """Which request categories a profile blocks or stubs."""
+    name: str
+    block_trackers: bool = False
+    stub_images: bool = False
+    block_fonts: bool = False
+    block_media: bool = False
+
+    @property
+    def active(self) -> bool:
+        """Whether the profile routes anything."""
+        return self.block_trackers or self.stub_images or self.block_fonts or self.block_media
+
+
+PROFILES = {
+    "off": RoutingProfile("off"),
+    "trackers": RoutingProfile("trackers", block_trackers=True),
+    "lean": RoutingProfile("lean", block_trackers=True, stub_images=True, block_fonts=True, block_media=True),
+}
+
+
+def get_routing_profile(name: Optional[str] = None) -> RoutingProfile:
+    """
+    Get a routing profile by name.
+
+    Args:
+        name: Profile name (defaults to FH_ROUTING_PROFILE)
+
+    Returns:
+        RoutingProfile: The profile
+
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    name = (name or FH_ROUTING_PROFILE).lower()
+    if name not in PROFILES:
+        raise ValueError(f"Unknown routing profile '{name}'. Available: {', '.join(PROFILES)}")
+    return PROFILES[name]
+
+
+def get_item_routing_profile(item) -> RoutingProfile:
+    """
+    Routing profile of a test: its @pytest.mark.routing profile, else FH_ROUTING_PROFILE.
+
+    Args:
+        item: pytest item
+
+    Returns:
+        RoutingProfile: The profile
+    """
+    marker = item.get_closest_marker("routing")
+    return get_routing_profile(marker.args[0] if marker and marker.args else None)
+
+
+@dataclass
+class RouteStats:
+    """
+    Requests and bytes a profile saved in one context.
+
+    bytes_saved counts sizes learned from unrouted runs; requests of unknown
+    size add their category's ESTIMATED_SIZES to bytes_estimated instead.
+    """
+    profile: str
+    blocked: int = 0
+    stubbed: int = 0
+    bytes_saved: int = 0
+    bytes_estimated: int = 0
+    unknown_sizes: int = 0
+    by_category: Dict[str, int] = field(default_factory=dict)
+    # (route pattern or event name, handler) pairs installed on the context
+    handlers: List[Tuple[object, Callable]] = field(default_factory=list, repr=False)
+
+    @property
+    def requests_saved(self) -> int:
+        return self.blocked + self.stubbed
+
+    def add(self, category: str, size: Optional[int], stubbed: bool = False) -> None:
+        """Count one routed request."""
+        if stubbed:
+            self.stubbed += 1
+        else:
+            self.blocked += 1
+        self.by_category[category] = self.by_category.get(category, 0) + 1
+        if size is None:
+            self.unknown_sizes += 1
+            self.bytes_estimated += ESTIMATED_SIZES.get(category, 0)
+        else:
+            self.bytes_saved += size
+
+    def summary(self) -> str:
+        """One-line human readable summary."""
+        categories = ", ".join(f"{k}={v}" for k, v in sorted(self.by_category.items()))
+        unknown = (f" + ~{self.bytes_estimated / 1024:.0f} KB estimated for {self.unknown_sizes} "
+                   f"of unknown size") if self.unknown_sizes else ""
+        return (f"profile={self.profile}: {self.requests_saved} requests saved [{categories}], "
+                f"{self.bytes_saved / 1024:.0f} KB measured{unknown}")
+
+
+class RouteSizeCache:
+    """
+    Known transfer sizes of routable assets, learned from unrouted runs.
+
+    Blocked requests never download, so their size comes from previous
+    runs where the asset did load (profile 'off' or opted-out tests).
+    """
+
+    def __init__(self, path: str = SIZE_CACHE_PATH):
+        self.path = Path(path)
+        self.sizes: Dict[str, int] = {}
+        self._learned: Dict[str, int] = {}
+        try:
+            self.sizes = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            self.sizes = {}
+
+    @staticmethod
+    def key(url: str) -> str:
+        """Cache key: URL without query string or fragment."""
+        return re.split(r"[?#]", url, maxsplit=1)[0]
+
+    def lookup(self, url: str) -> Optional[int]:
+        return self.sizes.get(self.key(url))
+
+    def learn(self, url: str, size: int) -> None:
+        key = self.key(url)
+        self.sizes[key] = size
+        self._learned[key] = size
+
+    def save(self) -> None:
+        """Merge learned sizes into the file (xdist workers share it)."""
+        if not self._learned:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with FileLock(f"{self.path}.lock", timeout=30):
+            try:
+                merged = json.loads(self.path.read_text())
+            except (OSError, ValueError):
+                merged = {}
+            merged.update(self._learned)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(merged))
+            os.replace(tmp_path, self.path)
+        self._learned.clear()
+
+
+route_size_cache = RouteSizeCache()
+
+
+def get_route_size_cache() -> RouteSizeCache:
+    """
+    Get the global route size cache instance.
+
+    Returns:
+        RouteSizeCache: The size cache
+    """
+    return route_size_cache
+
+
+def _categorize(url: str) -> Optional[str]:
+    """Category of a URL, or None for requests no profile touches."""
+    if KEEP_PATTERN.search(url):
+        return None
+    if TRACKER_PATTERN.search(url):
+        return "trackers"
+    if IMAGE_PATTERN.search(url):
+        return "images"
+    if FONT_PATTERN.search(url):
+        return "fonts"
+    if MEDIA_PATTERN.search(url):
+        return "media"
+    return None
+
+
+def _profile_routes(profile: RoutingProfile, stats: RouteStats) -> Dict[Pattern, Callable]:
+    """
+    Route handlers of a profile, keyed by URL pattern.
+
+    Handlers return the route call, so they work on sync contexts and on
+    async ones (Playwright awaits a coroutine returned by a handler).
+    """
+    sizes = get_route_size_cache()
+
+    def abort(category: str):
+        def handler(route: Route):
+            url = route.request.url
+            if KEEP_PATTERN.search(url):
+                return route.fallback()
+            stats.add(category, sizes.lookup(url))
+            return route.abort("blockedbyclient")
+        return handler
+
+    def stub_image(route: Route):
+        url = route.request.url
+        if KEEP_PATTERN.search(url) or route.request.resource_type != "image":
+            return route.fallback()
+        stats.add("images", sizes.lookup(url), stubbed=True)
+        return route.fulfill(status=200, content_type="image/png", body=PLACEHOLDER_PNG)
+
+    routes: Dict[Pattern, Callable] = {}
+    if profile.block_trackers:
+        routes[TRACKER_PATTERN] = abort("trackers")
+    if profile.stub_images:
+        routes[IMAGE_PATTERN] = stub_image
+    if profile.block_fonts:
+        routes[FONT_PATTERN] = abort("fonts")
+    if profile.block_media:
+        routes[MEDIA_PATTERN] = abort("media")
+    return routes
+
+
+def apply_routing(context: BrowserContext, profile: RoutingProfile) -> RouteStats:
+    """
+    Install a routing profile on a context.
+
+    Each category is routed with its own URL pattern, so requests no
+    profile touches are never intercepted.
+
+    Args:
+        context: Browser context
+        profile: Routing profile
+
+    Returns:
+        RouteStats: Live counters for the context
+    """
+    stats = RouteStats(profile.name)
+    if not profile.active:
+        stats.handlers.append(("response", _learn_sizes(context, get_route_size_cache())))
+        return stats
+
+    for pattern, handler in _profile_routes(profile, stats).items():
+        context.route(pattern, handler)
+        stats.handlers.append((pattern, handler))
+    return stats
+
+
+async def apply_routing_async(context, profile: RoutingProfile) -> RouteStats:
+    """apply_routing for a playwright.async_api context (pages/aio flows)."""
+    stats = RouteStats(profile.name)
+    if not profile.active:
+        stats.handlers.append(("response", _learn_sizes(context, get_route_size_cache())))
+        return stats
+
+    for pattern, handler in _profile_routes(profile, stats).items():
+        await context.route(pattern, handler)
+        stats.handlers.append((pattern, handler))
+    return stats
+
+
+def remove_routing(context: BrowserContext, stats: RouteStats) -> None:
+    """
+    Remove the routes and listeners apply_routing installed.
+
+    Pooled contexts are reused, so nothing may outlive the test.
+
+    Args:
+        context: Browser context
+        stats: Stats returned by apply_routing
+    """
+    for target, handler in stats.handlers:
+        try:
+            if target == "response":
+                context.remove_listener("response", handler)
+            else:
+                context.unroute(target, handler)
+        except Exception:
+            pass
+    stats.handlers.clear()
+
+
+def _learn_sizes(context: BrowserContext, sizes: RouteSizeCache) -> Callable:
+    """Record sizes of routable assets while they load unrouted."""
+    def on_response(response: Response) -> None:
+        url = response.url
+        if _categorize(url) is None:
+            return
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            sizes.learn(url, int(length))
+
+    context.on("response", on_response)
+    return on_response
@@ -0,0 +1,215 @@
+"""
+Authenticated session cache shared by all pytest-xdist workers.
+
+The storage state file is the cache. Before handing it out, its expiry is
+read from the cookies and MSAL tokens it contains; when it is missing or
+about to expire, one worker logs in under a file lock and rewrites it while
+the others wait and then reuse the fresh file.
+"""
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Tuple, Union
+from playwright.sync_api import Browser, BrowserContext, Page
+
+from configs.playwright_config import SESSION_REFRESH_MARGIN, SESSION_MAX_AGE
+from utils.file_lock import FileLock
+
+
+# Analytics cookies with short lifetimes that say nothing about the login
+IGNORED_COOKIES = ("ai_session", "ai_user", "_ga", "_gid", "_gat", "MUID")
+
+# MSAL/ADAL token cache fields holding the expiry as epoch seconds
+_TOKEN_EXPIRY_KEYS = ("expiresOn", "expires_on")
+
+
+def write_storage_state(context: BrowserContext, path: Union[str, Path]) -> None:
+    """
+    Write a context's storage state atomically (temp file + os.replace).
+
+    Readers in other workers never see a half-written file. Callers that
+    may race with a SessionCache refresh hold the cache's lock file.
+
+    Args:
+        context: Browser context to save
+        path: Storage state path
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    context.storage_state(path=str(tmp_path))
+    os.replace(tmp_path, path)
+
+
+def cookie_expiry(
+    state: dict,
+    domains: Optional[Iterable[str]] = None
+) -> Optional[float]:
+    """
+    Earliest expiry of the persistent cookies in a storage state.
+
+    Args:
+        state: Parsed storage state
+        domains: Only consider cookies whose domain ends with one of these
+
+    Returns:
+        Optional[float]: Epoch seconds, or None if no cookie has an expiry
+    """
+    domains = tuple(d.lstrip(".") for d in domains or ())
+    expiries = []
+    for cookie in state.get("cookies", []):
+        expires = cookie.get("expires", -1)
+        if not expires or expires <= 0 or cookie.get("name") in IGNORED_COOKIES:
+            continue
+        domain = cookie.get("domain", "").lstrip(".")
+        if domains and not any(domain == d or domain.endswith("." + d) for d in domains):
+            continue
+        expiries.append(float(expires))
+    return min(expiries) if expiries else None
+
+
+def token_expiry(state: dict) -> Optional[float]:
+    """
+    Earliest expiry of the MSAL access tokens kept in localStorage.
+
+    Args:
+        state: Parsed storage state
+
+    Returns:
+        Optional[float]: Epoch seconds, or None if no token was found
+    """
+    expiries = []
+    for origin in state.get("origins", []):
+        for item in origin.get("localStorage", []):
+            value = item.get("value", "")
+            if not value.startswith("{"):
+                continue
+            try:
+                entry = json.loads(value)
+            except ValueError:
+                continue
+            if not isinstance(entry, dict) or entry.get("credentialType", "AccessToken") != "AccessToken":
+                continue
+            for key in _TOKEN_EXPIRY_KEYS:
+                if entry.get(key):
+                    try:
+                        expiries.append(float(entry[key]))
+                    except (TypeError, ValueError):
+                        pass
+                    break
+    return min(expiries) if expiries else None
+
+
+class SessionCache:
+    """
+    Storage state file that is refreshed before it expires.
+
+    Usage:
+        cache = SessionCache("storage_state/d365_session.json",
+                             login=lambda page: D365Auth(page).login(),
+                             domains=["dynamics.com"])
+        state_path = cache.ensure(browser)
+        context = browser.new_context(storage_state=state_path)
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        login: Callable[[Page], None],
+        domains: Optional[Iterable[str]] = None,
+        refresh_margin: float = SESSION_REFRESH_MARGIN,
+        max_age: float = SESSION_MAX_AGE,
+        lock_timeout: float = 600
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            path: Storage state file
+            login: Callable that logs in on the given page
+            domains: Cookie domains that carry the application session
+            refresh_margin: Refresh when fewer seconds than this remain
+            max_age: Maximum age of the file when no expiry can be read
+            lock_timeout: Maximum seconds to wait for another worker's login
+        """
+        self.path = Path(path)
+        self.login = login
+        self.domains = list(domains or [])
+        self.refresh_margin = refresh_margin
+        self.max_age = max_age
+        self.lock_timeout = lock_timeout
+        self._parsed: Optional[Tuple[float, Optional[float]]] = None
+        self.refreshes = 0
+
+    def expires_at(self) -> Optional[float]:
+        """
+        Expiry of the cached session (epoch seconds), None if there is no file.
+
+        The parsed value is cached until the file changes.
+        """
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+        if self._parsed and self._parsed[0] == mtime:
+            return self._parsed[1]
+
+        try:
+            state = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            expiry = None
+        else:
+            candidates = [
+                e for e in (cookie_expiry(state, self.domains), token_expiry(state)) if e is not None
+            ]
+            expiry = min(candidates + [mtime + self.max_age])
+
+        self._parsed = (mtime, expiry)
+        return expiry
+
+    def is_valid(self) -> bool:
+        """Check if the cached session remains usable for at least the refresh margin."""
+        expiry = self.expires_at()
+        return expiry is not None and expiry - time.time() > self.refresh_margin
+
+    def ensure(self, browser: Browser, **context_options) -> Optional[str]:
+        """
+        Return a valid storage state path, logging in once if needed.
+
+        Args:
+            browser: Browser used for the login context
+            **context_options: Extra options for the login context
+
+        Returns:
+            Optional[str]: Storage state path, or None if no session is available
+        """
+        if self.is_valid():
+            return str(self.path)
+
+        with FileLock(f"{self.path}.lock", timeout=self.lock_timeout):
+            # Another worker may have refreshed while we waited for the lock
+            if not self.is_valid():
+                try:
+                    self._refresh(browser, context_options)
+                except Exception as e:
+                    print(f"⚠️  Session refresh failed: {e}")
+
+        return str(self.path) if self.path.exists() else None
+
+    def _refresh(self, browser: Browser, context_options: dict) -> None:
+        """Log in on a scratch context and atomically replace the storage state."""
+        print(f"\n🔐 Refreshing session cache {self.path}")
+        context = browser.new_context(**context_options)
+        try:
+            page = context.new_page()
+            self.login(page)
+            write_storage_state(context, self.path)
+        finally:
+            context.close()
+
+        self.refreshes += 1
+        expiry = self.expires_at()
+        if expiry:
+            print(f"✅ Session cached, valid for {int((expiry - time.time()) / 60)} min")
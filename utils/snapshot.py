@@ -0,0 +1,141 @@
+"""
+Single-roundtrip DOM snapshots for page objects.
+
+A page object declares a schema of named fields (selector + extractor) and
+BasePage.snapshot() reads all of them with one page.evaluate, instead of a
+locator round-trip per getter:
+
+    schema = {
+        "item_count": Field("//img[contains(@src,'/image/')]", "count"),
+        "subtotal": Field("//div[@class='subtotal']", convert=parse_price),
+        "lines": Field("//div[@class='line']", many=True, fields={
+            "sku": Field(".//span[@class='sku']"),
+            "qty": Field(".//input", "value", convert=int),
+        }),
+    }
+
+Selectors are XPath (starting with '//', './/' or '(') or CSS; Playwright
+selector engines (text=, >>, :has-text) are not available in the page.
+Nested fields are evaluated relative to each matched element, so nested
+XPath should start with './/'. A snapshot does not wait: take it once the
+page has settled (assert_loaded, a wait condition or an action's own wait).
+"""
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+
+EXTRACTORS = ("text", "value", "visible", "count", "exists", "html")
+
+# Evaluated with the schema spec; returns {field: value}
+SNAPSHOT_JS = """
+(spec) => {
+    const isXPath = (selector) => /^(\\.?\\/\\/|\\(|\\.\\/)/.test(selector);
+    const find = (root, selector) => {
+        if (isXPath(selector)) {
+            const result = document.evaluate(
+                selector, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            const nodes = [];
+            for (let i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+            return nodes;
+        }
+        return Array.from(root.querySelectorAll(selector));
+    };
+    const visible = (el) => {
+        if (!el) return false;
+        const style = getComputedStyle(el);
+        return style.visibility !== 'hidden' && el.getClientRects().length > 0;
+    };
+    const extract = (el, how) => {
+        if (how === 'text') return (el.innerText ?? el.textContent ?? '').trim();
+        if (how === 'value') return el.value ?? null;
+        if (how === 'visible') return visible(el);
+        if (how === 'html') return el.outerHTML;
+        if (how.startsWith('attr:')) return el.getAttribute(how.slice(5));
+        return null;
+    };
+    const read = (root, fields) => {
+        const out = {};
+        for (const [name, field] of Object.entries(fields)) {
+            const nodes = find(root, field.selector);
+            const value = (el) => field.fields ? read(el, field.fields) : extract(el, field.extract);
+            if (field.extract === 'count') out[name] = nodes.length;
+            else if (field.extract === 'exists') out[name] = nodes.length > 0;
+            else if (field.many) out[name] = nodes.map(value);
+            else if (field.extract === 'visible') out[name] = visible(nodes[0]);
+            else out[name] = nodes.length ? value(nodes[0]) : null;
+        }
+        return out;
+    };
+    return read(document, spec);
+}
+"""
+
+
+@dataclass(frozen=True)
+class Field:
+    """
+    One snapshot field.
+
+    Attributes:
+        selector: XPath or CSS selector
+        extract: text | value | visible | count | exists | html | attr:<name>
+        many: Return a list with one value per matched element
+        fields: Nested schema read relative to each matched element
+        convert: Applied in Python to each extracted value (None stays None)
+    """
+    selector: str
+    extract: str = "text"
+    many: bool = False
+    fields: Optional[Dict[str, "Field"]] = None
+    convert: Optional[Callable[[Any], Any]] = None
+
+    def __post_init__(self):
+        if self.extract not in EXTRACTORS and not self.extract.startswith("attr:"):
+            raise ValueError(f"Unknown extractor '{self.extract}' for {self.selector}")
+        if self.selector.startswith(("text=", "role=", "internal:")) or ">>" in self.selector:
+            raise ValueError(f"Playwright-only selector cannot be snapshotted: {self.selector}")
+
+    def spec(self) -> dict:
+        """JSON-serializable form passed to SNAPSHOT_JS."""
+        spec = {"selector": self.selector, "extract": self.extract, "many": self.many}
+        if self.fields:
+            spec["fields"] = schema_spec(self.fields)
+        return spec
+
+    def finish(self, raw: Any) -> Any:
+        """Apply nested schemas and convert to an extracted value."""
+        if self.many and isinstance(raw, list):
+            return [self._finish_one(value) for value in raw]
+        return self._finish_one(raw)
+
+    def _finish_one(self, raw: Any) -> Any:
+        if self.fields and isinstance(raw, dict):
+            raw = finish_snapshot(self.fields, raw)
+        if raw is None or self.convert is None:
+            return raw
+        return self.convert(raw)
+
+
+def schema_spec(schema: Dict[str, Field]) -> dict:
+    """Spec of a whole schema for SNAPSHOT_JS."""
+    return {name: field.spec() for name, field in schema.items()}
+
+
+def finish_snapshot(schema: Dict[str, Field], raw: dict) -> dict:
+    """Run the Python-side conversions of a schema over an evaluated snapshot."""
+    return {name: field.finish(raw.get(name)) for name, field in schema.items()}
+
+
+def parse_price(text: str) -> Optional[float]:
+    """
+    Parse a displayed amount such as '$1,234.50' (None when there is no number).
+
+    Args:
+        text: Displayed price text
+
+    Returns:
+        Optional[float]: Amount
+    """
+    match = re.search(r"-?\d[\d,]*(?:\.\d+)?", text or "")
+    return float(match.group().replace(",", "")) if match else None
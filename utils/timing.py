@@ -0,0 +1,258 @@
+"""
+Step timing for page actions, waits, fixtures and artifact capture.
+
+Instrumented code reports operations to the global StepTimer:
+
+    @timed("page")
+    def click_element(self, selector, ...): ...
+
+    with get_step_timer().measure("artifact", "screenshot"):
+        page.screenshot(full_page=True)
+
+Operations nest (click_element waits for the loading mask), so every record
+keeps its total and its self time; category breakdowns add up self time and
+never count a second twice. conftest_timings.py opens a TestTimings per test,
+attaches the breakdown to Allure and writes TIMINGS_PATH with the slowest
+operations of the run.
+"""
+import functools
+import json
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from configs.playwright_config import TIMINGS
+
+
+@dataclass
+class StepRecord:
+    """One timed operation."""
+    category: str
+    name: str
+    seconds: float
+    self_seconds: float
+    offset: float
+    detail: str = ""
+    failed: bool = False
+
+
+@dataclass
+class TestTimings:
+    """Timed operations of one test (setup, call and teardown)."""
+    __test__ = False  # not a pytest test class
+
+    nodeid: str
+    started: float = field(default_factory=time.perf_counter)
+    duration: float = 0.0
+    records: List[StepRecord] = field(default_factory=list)
+
+    def breakdown(self) -> Dict[str, float]:
+        """Self time per category, slowest first."""
+        totals: Dict[str, float] = {}
+        for record in self.records:
+            totals[record.category] = totals.get(record.category, 0.0) + record.self_seconds
+        return dict(sorted(totals.items(), key=lambda kv: -kv[1]))
+
+    def report(self, top: int = 10) -> str:
+        """Human-readable breakdown for the Allure attachment."""
+        breakdown = self.breakdown()
+        other = max(0.0, self.duration - sum(breakdown.values()))
+        lines = [f"{self.nodeid}: {self.duration:.2f}s", ""]
+        for category, seconds in list(breakdown.items()) + [("other", other)]:
+            share = 100 * seconds / self.duration if self.duration else 0
+            lines.append(f"  {category:<10} {seconds:8.2f}s  {share:5.1f}%")
+
+        lines += ["", "Slowest steps (self time):"]
+        for record in sorted(self.records, key=lambda r: -r.self_seconds)[:top]:
+            failed = " [failed]" if record.failed else ""
+            detail = f"  {record.detail}" if record.detail else ""
+            lines.append(f"  {record.self_seconds:8.2f}s  {record.category}/{record.name}{detail}{failed}")
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict:
+        return {
+            "nodeid": self.nodeid,
+            "duration": round(self.duration, 4),
+            "breakdown": {k: round(v, 4) for k, v in self.breakdown().items()},
+            "steps": [step_dict(r) for r in self.records],
+        }
+
+
+def step_dict(record: StepRecord) -> dict:
+    """JSON-ready record with rounded times."""
+    data = asdict(record)
+    for key in ("seconds", "self_seconds", "offset"):
+        data[key] = round(data[key], 4)
+    return data
+
+
+class StepTimer:
+    """
+    Collects timed operations for the running test.
+
+    Measurements are taken on the test thread; operations outside any test
+    (e.g. session fixture teardown) are kept in session_records.
+    """
+
+    def __init__(self, enabled: bool = TIMINGS):
+        """
+        Initialize the timer.
+
+        Args:
+            enabled: Record anything at all (TIMINGS env)
+        """
+        self.enabled = enabled
+        self.current: Optional[TestTimings] = None
+        self.finished: List[TestTimings] = []
+        self.session_records: List[StepRecord] = []
+        self._children: List[float] = []
+
+    def start_test(self, nodeid: str) -> None:
+        self.current = TestTimings(nodeid)
+        self._children = []
+
+    def finish_test(self) -> Optional[TestTimings]:
+        """Close the running test and keep it for the session summary."""
+        timings, self.current = self.current, None
+        if timings is not None:
+            timings.duration = time.perf_counter() - timings.started
+            self.finished.append(timings)
+        return timings
+
+    def begin(self) -> float:
+        """Open an operation; pair with end()."""
+        self._children.append(0.0)
+        return time.perf_counter()
+
+    def end(
+        self,
+        start: float,
+        category: str,
+        name: str,
+        detail: str = "",
+        failed: bool = False,
+        min_seconds: float = 0.0
+    ) -> None:
+        """
+        Close the innermost operation opened by begin().
+
+        Args:
+            start: Value returned by begin()
+            category: Breakdown bucket (page, wait, fixture, artifact, ...)
+            name: Operation name
+            detail: Selector, URL or fixture scope
+            failed: The operation raised
+            min_seconds: Drop the record (not its time) when faster than this
+        """
+        seconds = time.perf_counter() - start
+        children = self._children.pop() if self._children else 0.0
+        if self._children:
+            self._children[-1] += seconds
+        if seconds < min_seconds:
+            return
+
+        target = self.current
+        offset = start - target.started if target else 0.0
+        record = StepRecord(category, name, seconds, max(0.0, seconds - children), offset, detail, failed)
+        (target.records if target else self.session_records).append(record)
+
+    @contextmanager
+    def measure(self, category: str, name: str, detail: str = ""):
+        """Time the enclosed block."""
+        if not self.enabled:
+            yield
+            return
+
+        start = self.begin()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.end(start, category, name, detail, failed)
+
+
+step_timer = StepTimer()
+
+
+def get_step_timer() -> StepTimer:
+    """
+    Get the global step timer instance.
+
+    Returns:
+        StepTimer: The step timer
+    """
+    return step_timer
+
+
+def timed(category: str) -> Callable:
+    """
+    Time a method as '<Class>.<method>'; a leading string argument
+    (selector, URL) becomes the detail. Fill values are never recorded.
+
+    Args:
+        category: Breakdown bucket
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if not step_timer.enabled:
+                return func(self, *args, **kwargs)
+            detail = args[0][:120] if args and isinstance(args[0], str) else ""
+            with step_timer.measure(category, f"{type(self).__name__}.{func.__name__}", detail):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def aggregate(tests: Iterable[dict], session_steps: Iterable[dict] = ()) -> List[dict]:
+    """
+    Aggregate steps by operation across tests.
+
+    Args:
+        tests: TestTimings.to_dict() entries (possibly from several workers)
+        session_steps: Steps recorded outside tests
+
+    Returns:
+        list: {"category", "name", "count", "total", "mean", "max"} by total self time
+    """
+    operations: Dict[tuple, dict] = {}
+    steps = [s for t in tests for s in t["steps"]] + list(session_steps)
+    for step in steps:
+        key = (step["category"], step["name"])
+        op = operations.setdefault(key, {"category": key[0], "name": key[1], "count": 0, "total": 0.0, "max": 0.0})
+        op["count"] += 1
+        op["total"] += step["self_seconds"]
+        op["max"] = max(op["max"], step["self_seconds"])
+
+    result = sorted(operations.values(), key=lambda op: -op["total"])
+    for op in result:
+        op["mean"] = round(op["total"] / op["count"], 4)
+        op["total"] = round(op["total"], 4)
+    return result
+
+
+def write_timings(path: Path, tests: List[dict], session_steps: List[dict]) -> dict:
+    """
+    Write the machine-readable timings file atomically.
+
+    Returns:
+        dict: The written payload
+    """
+    payload = {
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "tests": sorted(tests, key=lambda t: -t["duration"]),
+        "session_steps": session_steps,
+        "operations": aggregate(tests, session_steps),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(payload, indent=1))
+    os.replace(tmp_path, path)
+    return payload
@@ -2,10 +2,71 @@
 Condition-based wait utilities for D365 F&O automation.
 Provides resilient waiting mechanisms without using sleep.
 """
-from typing import Callable, Optional, Any
+from typing import Callable, Optional, Any, Union
 from playwright.sync_api import Page, FrameLocator, expect
+from playwright.sync_api import Error as PlaywrightError
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 import time
 
+from utils.timing import timed
+
+
+# Resolves once the element's box and size (and, with watchContent, its
+# subtree) have been quiet for stableMs. Runs entirely in the page so the
+# wait costs one round-trip.
+_ELEMENT_STABLE_SCRIPT = """
+(el, [stableMs, timeoutMs, watchContent]) => new Promise((resolve, reject) => {
+    const start = performance.now();
+    let lastChange = start;
+    let last = el.getBoundingClientRect();
+    const changed = () => { lastChange = performance.now(); };
+    
+    const resizeObserver = new ResizeObserver(changed);
+    resizeObserver.observe(el);
+    // Content changes (ticking text, class toggles) only count when asked for
+    const mutationObserver = watchContent ? new MutationObserver(changed) : null;
+    if (mutationObserver) {
+        mutationObserver.observe(el, {
+            attributes: true, childList: true, subtree: true, characterData: true
+        });
+    }
+    const cleanup = () => {
+        resizeObserver.disconnect();
+        if (mutationObserver) mutationObserver.disconnect();
+    };
+    
+    // Position changes (transforms, scrolling, layout shifts above the
+    // element) are not reported by the observers, so compare the box per frame
+    const schedule = () => document.hidden ? setTimeout(tick, 50) : requestAnimationFrame(tick);
+    const tick = () => {
+        const now = performance.now();
+        if (!el.isConnected) {
+            cleanup();
+            reject(new Error("Element was detached while waiting for it to be stable"));
+            return;
+        }
+        const box = el.getBoundingClientRect();
+        if (box.x !== last.x || box.y !== last.y ||
+            box.width !== last.width || box.height !== last.height) {
+            last = box;
+            lastChange = now;
+        }
+        if (now - lastChange >= stableMs) {
+            cleanup();
+            resolve(true);
+            return;
+        }
+        if (now - start >= timeoutMs) {
+            cleanup();
+            reject(new Error(`Element not stable within ${timeoutMs}ms`));
+            return;
+        }
+        schedule();
+    };
+    schedule();
+})
+"""
+
 
 class WaitConditions:
     """Collection of reusable wait conditions for D365."""
@@ -29,6 +90,7 @@ class WaitConditions:
         self.page = page
         self.timeout = timeout
     
+    @timed("wait")
     def wait_for_no_loading_mask(self, frame: Optional[FrameLocator] = None) -> None:
         """
         Wait until loading masks/overlays are gone.
@@ -47,6 +109,7 @@ class WaitConditions:
             # If mask never appears, that's fine
             pass
     
+    @timed("wait")
     def wait_for_no_spinner(self, frame: Optional[FrameLocator] = None) -> None:
         """
         Wait until loading spinners are gone.
@@ -63,6 +126,7 @@ class WaitConditions:
         except Exception:
             pass
     
+    @timed("wait")
     def wait_for_grid_ready(self, frame: Optional[FrameLocator] = None) -> None:
         """
         Wait until grid is loaded and ready.
@@ -90,13 +154,14 @@ class WaitConditions:
         self.wait_for_no_loading_mask(frame)
         self.wait_for_no_spinner(frame)
     
+    @timed("wait")
     def wait_for_toast_message(self, frame: Optional[FrameLocator] = None) -> str:
         """
         Wait for toast notification and return its text.
         
         Args:
             frame: Optional frame to search in
-            
+        
         Returns:
             str: Toast message text
         """
@@ -114,6 +179,7 @@ class WaitConditions:
         
         return text
     
+    @timed("wait")
     def wait_for_url_contains(self, text: str, timeout: Optional[int] = None) -> None:
         """
         Wait until URL contains specific text.
@@ -125,24 +191,46 @@ class WaitConditions:
         timeout = timeout or self.timeout
         self.page.wait_for_url(f"**/*{text}*", timeout=timeout)
     
-    def wait_for_url_stable(self, stable_duration_ms: int = 1000) -> None:
+    @timed("wait")
+    def wait_for_url_stable(
+        self,
+        stable_duration_ms: int = 1000,
+        timeout: Optional[int] = None
+    ) -> None:
         """
         Wait until URL hasn't changed for specified duration.
         
+        Blocks on 'framenavigated' events (including same-document history
+        changes) instead of polling page.url.
+        
         Args:
             stable_duration_ms: Duration in ms that URL must remain stable
+            timeout: Optional overall timeout override in ms
+        
+        Raises:
+            TimeoutError: If the URL keeps changing for longer than timeout
         """
-        last_url = self.page.url
-        start_time = time.time() * 1000
+        timeout = timeout or self.timeout
+        deadline = time.monotonic() + timeout / 1000
+        main_frame = self.page.main_frame
         
-        while (time.time() * 1000 - start_time) < stable_duration_ms:
-            current_url = self.page.url
-            if current_url != last_url:
-                # URL changed, reset timer
-                last_url = current_url
-                start_time = time.time() * 1000
-            time.sleep(0.1)
+        while True:
+            remaining_ms = (deadline - time.monotonic()) * 1000
+            if remaining_ms <= 0:
+                raise TimeoutError(f"URL did not stabilize within {timeout}ms")
+            
+            try:
+                # Any main-frame navigation inside the window resets the timer
+                self.page.wait_for_event(
+                    "framenavigated",
+                    predicate=lambda frame: frame == main_frame,
+                    timeout=min(stable_duration_ms, remaining_ms)
+                )
+            except PlaywrightTimeoutError:
+                if remaining_ms >= stable_duration_ms:
+                    return
     
+    @timed("wait")
     def wait_for_network_idle(self, timeout: Optional[int] = None) -> None:
         """
         Wait for network to be idle (no pending requests).
@@ -153,20 +241,30 @@ class WaitConditions:
         timeout = timeout or self.timeout
         self.page.wait_for_load_state("networkidle", timeout=timeout)
     
+    @timed("wait")
     def wait_for_element_stable(
         self, 
         selector: str, 
         frame: Optional[FrameLocator] = None,
-        stable_duration_ms: int = 500
+        stable_duration_ms: int = 500,
+        watch_content: bool = False
     ) -> None:
         """
         Wait until element position hasn't changed for specified duration.
         Useful for waiting for animations/transitions to complete.
         
+        Stability is tracked in the page (ResizeObserver and a per-frame box
+        check), so the wait costs one round-trip.
+        
         Args:
             selector: Element selector
             frame: Optional frame to search in
             stable_duration_ms: Duration element must remain stable
+            watch_content: Also require attributes, text and children to stay
+                unchanged (never settles on elements with ticking content)
+        
+        Raises:
+            TimeoutError: If element does not settle within the default timeout
         """
         context = frame if frame else self.page
         element = context.locator(selector).first
@@ -174,36 +272,41 @@ class WaitConditions:
         # First ensure element is visible
         element.wait_for(state="visible", timeout=self.timeout)
         
-        # Then wait for stability
-        last_box = element.bounding_box()
-        start_time = time.time() * 1000
-        
-        while (time.time() * 1000 - start_time) < stable_duration_ms:
-            current_box = element.bounding_box()
-            if current_box != last_box:
-                # Position changed, reset timer
-                last_box = current_box
-                start_time = time.time() * 1000
-            time.sleep(0.05)
+        # Then wait for stability inside the browser
+        try:
+            element.evaluate(_ELEMENT_STABLE_SCRIPT, [stable_duration_ms, self.timeout, watch_content])
+        except PlaywrightError as e:
+            if "not stable within" in str(e):
+                raise TimeoutError(f"Element '{selector}' not stable within {self.timeout}ms") from e
+            raise
     
+    @timed("wait")
     def wait_for_condition(
         self, 
-        condition: Callable[[], bool], 
+        condition: Union[Callable[[], bool], str], 
         timeout: Optional[int] = None,
         poll_interval_ms: int = 100
     ) -> None:
         """
         Wait until custom condition returns True.
         
+        A JavaScript expression/function string is evaluated in the page and
+        resolves in a single round-trip; a Python callable is polled.
+        
         Args:
-            condition: Callable that returns bool
+            condition: Callable that returns bool, or JS predicate string
             timeout: Optional timeout override in ms
-            poll_interval_ms: Polling interval in ms
-            
+            poll_interval_ms: Polling interval in ms (Python callables only)
+        
         Raises:
             TimeoutError: If condition not met within timeout
         """
         timeout = timeout or self.timeout
+        
+        if isinstance(condition, str):
+            self.wait_for_js_condition(condition, timeout=timeout)
+            return
+        
         start_time = time.time() * 1000
         
         while (time.time() * 1000 - start_time) < timeout:
@@ -213,6 +316,130 @@ class WaitConditions:
         
         raise TimeoutError(f"Condition not met within {timeout}ms")
     
+    @timed("wait")
+    def wait_for_js_condition(
+        self,
+        expression: str,
+        arg: Any = None,
+        timeout: Optional[int] = None
+    ) -> Any:
+        """
+        Wait until a JavaScript predicate is truthy, evaluated inside the page.
+        
+        Args:
+            expression: JS expression or function, e.g. "() => document.readyState === 'complete'"
+            arg: Optional argument passed to the function
+            timeout: Optional timeout override in ms
+        
+        Returns:
+            Any: The truthy value returned by the predicate
+        
+        Raises:
+            TimeoutError: If condition not met within timeout
+        """
+        timeout = timeout or self.timeout
+        try:
+            handle = self.page.wait_for_function(
+                expression, arg=arg, timeout=timeout, polling="raf"
+            )
+            return handle.json_value()
+        except PlaywrightTimeoutError as e:
+            raise TimeoutError(f"Condition not met within {timeout}ms") from e
+    
+    @timed("wait")
+    def wait_for_count_change(
+        self,
+        selector: str,
+        previous: int,
+        frame: Optional[FrameLocator] = None,
+        timeout: Optional[int] = None
+    ) -> int:
+        """
+        Wait until the number of elements matching selector differs from previous.
+        
+        Retries run in the Playwright driver (expect), not in Python.
+        
+        Args:
+            selector: Element selector
+            previous: Count observed before the action
+            frame: Optional frame to search in
+            timeout: Optional timeout override in ms
+        
+        Returns:
+            int: New element count
+        
+        Raises:
+            TimeoutError: If count doesn't change within timeout
+        """
+        timeout = timeout or self.timeout
+        context = frame if frame else self.page
+        locator = context.locator(selector)
+        try:
+            expect(locator).not_to_have_count(previous, timeout=timeout)
+        except AssertionError as e:
+            raise TimeoutError(f"Count of '{selector}' stayed {previous} for {timeout}ms") from e
+        return locator.count()
+    
+    @timed("wait")
+    def wait_for_count(
+        self,
+        selector: str,
+        expected: int,
+        frame: Optional[FrameLocator] = None,
+        timeout: Optional[int] = None
+    ) -> None:
+        """
+        Wait until exactly `expected` elements match selector.
+        
+        Args:
+            selector: Element selector
+            expected: Expected element count
+            frame: Optional frame to search in
+            timeout: Optional timeout override in ms
+        
+        Raises:
+            TimeoutError: If count isn't reached within timeout
+        """
+        timeout = timeout or self.timeout
+        context = frame if frame else self.page
+        try:
+            expect(context.locator(selector)).to_have_count(expected, timeout=timeout)
+        except AssertionError as e:
+            raise TimeoutError(f"Count of '{selector}' did not reach {expected} in {timeout}ms") from e
+    
+    @timed("wait")
+    def wait_for_value_change(
+        self,
+        selector: str,
+        previous: str,
+        frame: Optional[FrameLocator] = None,
+        timeout: Optional[int] = None
+    ) -> str:
+        """
+        Wait until an input's value differs from previous.
+        
+        Args:
+            selector: Input selector
+            previous: Value observed before the action
+            frame: Optional frame to search in
+            timeout: Optional timeout override in ms
+        
+        Returns:
+            str: New input value
+        
+        Raises:
+            TimeoutError: If value doesn't change within timeout
+        """
+        timeout = timeout or self.timeout
+        context = frame if frame else self.page
+        element = context.locator(selector).first
+        try:
+            expect(element).not_to_have_value(previous, timeout=timeout)
+        except AssertionError as e:
+            raise TimeoutError(f"Value of '{selector}' stayed '{previous}' for {timeout}ms") from e
+        return element.input_value()
+    
+    @timed("wait")
     def wait_for_dialog(self, frame: Optional[FrameLocator] = None) -> None:
         """
         Wait for dialog/modal to appear.